@@ -0,0 +1,80 @@
+"""
+JWT authentication that trusts the claims carried in the access token.
+
+Tokens issued by the login endpoint carry ``user_type``, ``is_active`` and
+``is_staff``. For those tokens the request user is built from the claims without
+touching the database; the rest of the row is loaded in one query the first time
+a view reads any other field. Changing a user's type or active flag, or
+deleting the user, records a marker in the cache, and tokens issued before it
+fall back to a full user fetch. The marker must reach every worker, so claims
+are only trusted when the default cache is shared between processes.
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from api.cache import cache_is_shared
+
+User = get_user_model()
+
+CLAIM_FIELDS = ("user_type", "is_active", "is_staff")
+def claims_changed_key(user_id):
+    return f"auth:claims-changed:{user_id}"
+
+
+def add_user_claims(token, user):
+    """Copy the fields permission checks need into ``token``."""
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    return token
+
+
+def claims_cache_shared():
+    # A revocation marker set in a process-local cache never reaches other workers
+    return cache_is_shared("default")
+
+
+def revoke_user_claims(*user_ids):
+    """Stop trusting claims in tokens issued to ``user_ids`` before now."""
+    now = int(time.time())
+    cache.set_many(
+        {claims_changed_key(user_id): now for user_id in user_ids},
+        int(settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds()),
+    )
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that skips the user row fetch for tokens with claims."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        if not self.claims_trusted(user_id, validated_token):
+            return super().get_user(validated_token)
+
+        if not validated_token["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        return User.from_claims(
+            user_id, {field: validated_token[field] for field in CLAIM_FIELDS}
+        )
+
+    def claims_trusted(self, user_id, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Password-change revocation needs the stored password hash
+            return False
+        if not claims_cache_shared():
+            return False
+        if any(field not in validated_token for field in CLAIM_FIELDS):
+            return False
+        changed_at = cache.get(claims_changed_key(user_id))
+        return changed_at is None or validated_token.get("iat", 0) > changed_at
@@ -0,0 +1,96 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from api.benchmark import summarize
+
+User = get_user_model()
+
+PASSWORD = "Benchmark-Passw0rd!"
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile password hasher cost and measure login throughput through the "
+        "login endpoint. Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Logins per configuration."
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            nargs="*",
+            default=[],
+            help="Additional PBKDF2 iteration counts to compare with the current profile.",
+        )
+
+    def handle(self, *args, **options):
+        profiles = [{}] + [
+            {"PASSWORD_HASHER": "pbkdf2", "PBKDF2_ITERATIONS": iterations}
+            for iterations in options["iterations"]
+        ]
+
+        setup_test_environment()
+        try:
+            results = [self.run_profile(profile, options["requests"]) for profile in profiles]
+        finally:
+            teardown_test_environment()
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run_profile(self, profile, requests):
+        overrides = {"DEBUG": False}
+        if profile:
+            overrides["PBKDF2_ITERATIONS"] = profile["PBKDF2_ITERATIONS"]
+            overrides["PASSWORD_HASHERS"] = [
+                settings.PASSWORD_HASHER_PROFILES["pbkdf2"],
+                *settings.PASSWORD_HASHERS,
+            ]
+
+        with override_settings(**overrides), transaction.atomic():
+            hasher = get_hasher()
+            iterations = getattr(hasher, "iterations", None)
+            encoded = make_password(PASSWORD)
+            verify = []
+            for _ in range(max(1, requests // 5)):
+                started = time.perf_counter()
+                hasher.verify(PASSWORD, encoded)
+                verify.append(time.perf_counter() - started)
+
+            User.objects.create_user(
+                email="login-benchmark@example.com",
+                password=PASSWORD,
+                user_type="job_seeker",
+                is_verified=True,
+            )
+            client = Client()
+            logins = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = client.post(
+                    "/api/v1/accounts/login/",
+                    {"email": "login-benchmark@example.com", "password": PASSWORD},
+                )
+                logins.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f"Login failed: {response.content!r}")
+
+            transaction.set_rollback(True)
+
+        return {
+            "hasher": hasher.algorithm,
+            "iterations": iterations,
+            "verify_ms": round(statistics.median(verify) * 1000, 2),
+            "login": summarize(logins),
+        }
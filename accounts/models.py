@@ -1,10 +1,23 @@
-from django.db import models
+from django.db import models, router
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils.translation import gettext_lazy as _
 import uuid
 
 
-class UserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        from .authentication import CLAIM_FIELDS, revoke_user_claims
+
+        if not set(kwargs) & set(CLAIM_FIELDS):
+            return super().update(**kwargs)
+        # Bulk updates send no pre_save signal; revoke the token claims here
+        user_ids = list(self.values_list("pk", flat=True))
+        updated = super().update(**kwargs)
+        revoke_user_claims(*user_ids)
+        return updated
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     """Custom user manager for email-based authentication."""
 
     def create_user(self, email, password=None, **extra_fields):
@@ -57,6 +70,35 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
 
+    @classmethod
+    def from_claims(cls, user_id, claims):
+        """
+        Build a user from JWT claims without a query. Every field that is not
+        in ``claims`` is deferred until first access.
+        """
+        values = {"id": user_id, **claims}
+        # from_db expects values in concrete field order
+        field_names = [
+            field.attname
+            for field in cls._meta.concrete_fields
+            if field.attname in values
+        ]
+        user = cls.from_db(
+            router.db_for_read(cls),
+            field_names,
+            [values[name] for name in field_names],
+        )
+        user._from_claims = True
+        return user
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # A claims-backed user loads the rest of its row in one query, rather
+        # than one query per deferred field the view happens to read.
+        if fields is not None and getattr(self, "_from_claims", False):
+            fields = list(self.get_deferred_fields() | set(fields))
+            self._from_claims = False
+        super().refresh_from_db(using, fields, from_queryset)
+
     class Meta:
         verbose_name = _("user")
         verbose_name_plural = _("users")
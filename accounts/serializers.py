@@ -1,9 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
 from django.conf import settings
+from django.db import transaction
 from django.urls import reverse
 from djoser.serializers import UserCreateSerializer as BaseUserCreateSerializer
+from jobs.ratings import rating_data
+from notifications.outbox import queue_email
 
 User = get_user_model()
 
@@ -82,12 +84,13 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop("password2")
         password = validated_data.pop("password")
-        user = User.objects.create(**validated_data)
-        user.set_password(password)
-        user.save()
+        with transaction.atomic():
+            user = User(**validated_data)
+            user.set_password(password)
+            user.save()
 
-        # Send verification email
-        self.send_verification_email(user)
+            # Queue verification email alongside the user row
+            self.send_verification_email(user)
 
         return user
 
@@ -110,16 +113,12 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         CareerConnect Team
         """
 
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            fail_silently=False,
-        )
+        queue_email(subject, message, user.email)
 
 
 class UserSerializer(serializers.ModelSerializer):
+    rating = serializers.SerializerMethodField()
+
     class Meta:
         model = User
         fields = (
@@ -135,9 +134,13 @@ class UserSerializer(serializers.ModelSerializer):
             "is_staff",
             "is_superuser",
             "date_joined",
+            "rating",
         )
         read_only_fields = ("id", "email", "is_verified", "is_staff", "is_superuser", "date_joined")
 
+    def get_rating(self, obj):
+        return rating_data(obj) if obj.user_type == "employer" else None
+
 
 class EmailVerificationSerializer(serializers.Serializer):
     token = serializers.UUIDField()
@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+
+from .authentication import CLAIM_FIELDS, revoke_user_claims
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=User)
+def revoke_changed_claims(sender, instance, update_fields=None, **kwargs):
+    """Invalidate token claims when a user's type, active or staff flag changes."""
+    if instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(CLAIM_FIELDS):
+        return
+
+    stored = sender._base_manager.filter(pk=instance.pk).values(*CLAIM_FIELDS).first()
+    if stored and any(stored[field] != getattr(instance, field) for field in CLAIM_FIELDS):
+        revoke_user_claims(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_claims(sender, instance, **kwargs):
+    """A deleted user's tokens must not build a user from their claims."""
+    revoke_user_claims(instance.pk)
@@ -1,2 +1,165 @@
-from django.test import TestCase
-# Create your tests here.
\ No newline at end of file
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, identify_hasher, make_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from accounts.views import CustomTokenObtainPairSerializer
+
+
+class ClaimsAuthenticationTests(TestCase):
+    """Token claims stop being trusted once the user they describe changes."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.shared_cache = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": cls.cache_dir,
+                }
+            }
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="seeker@example.com",
+            password="pass",
+            user_type="job_seeker",
+            is_verified=True,
+        )
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"JWT {token}")
+
+    def saved_searches_status(self):
+        # IsJobSeeker only reads the user_type claim
+        return self.client.get("/api/v1/saved-searches/").status_code
+
+    def test_shared_cache_trusts_claims_until_they_change(self):
+        with self.shared_cache:
+            cache.clear()
+            with self.assertNumQueries(1):
+                # Only the (empty) saved search COUNT; no user fetch
+                self.assertEqual(self.saved_searches_status(), 200)
+
+            self.user.user_type = "employer"
+            self.user.save()
+            self.assertEqual(self.saved_searches_status(), 403)
+
+    def test_bulk_deactivation_revokes_claims(self):
+        with self.shared_cache:
+            cache.clear()
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            self.assertEqual(self.saved_searches_status(), 401)
+
+    def test_deleted_user_is_rejected(self):
+        with self.shared_cache:
+            cache.clear()
+            self.user.delete()
+            self.assertEqual(self.saved_searches_status(), 401)
+            self.assertEqual(
+                self.client.get("/api/v1/accounts/profile/").status_code, 401
+            )
+
+    def test_process_local_cache_always_loads_the_user(self):
+        # A change made by another worker leaves no marker in this process
+        User.objects.filter(pk=self.user.pk).update(user_type="employer")
+        cache.clear()
+        self.assertEqual(self.saved_searches_status(), 403)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        cache.clear()
+        self.assertEqual(self.saved_searches_status(), 401)
+
+
+def hashers_for(profile):
+    """``PASSWORD_HASHERS`` as settings.py builds it for ``profile``."""
+    profiles = settings.PASSWORD_HASHER_PROFILES
+    return (
+        [profiles[profile]]
+        + [hasher for name, hasher in profiles.items() if name != profile]
+        + settings.LEGACY_PASSWORD_HASHERS
+    )
+
+
+@override_settings(PBKDF2_ITERATIONS=1000)
+class PasswordHasherProfileTests(TestCase):
+    """Login works under every hasher profile, and moves hashes to its hasher."""
+
+    def login(self, password="s3cret-pass"):
+        return APIClient().post(
+            "/api/v1/accounts/login/",
+            {"email": "seeker@example.com", "password": password},
+            format="json",
+        )
+
+    def create_user(self):
+        return User.objects.create_user(
+            email="seeker@example.com",
+            password="s3cret-pass",
+            user_type="job_seeker",
+            is_verified=True,
+        )
+
+    def available_profiles(self):
+        for profile in settings.PASSWORD_HASHER_PROFILES:
+            with self.settings(PASSWORD_HASHERS=hashers_for(profile)):
+                try:
+                    get_hasher()._load_library()
+                except ValueError:
+                    # argon2-cffi or bcrypt is not installed
+                    continue
+            yield profile
+
+    def test_login_under_each_profile(self):
+        for profile in self.available_profiles():
+            with self.subTest(profile=profile), self.settings(
+                PASSWORD_HASHERS=hashers_for(profile)
+            ):
+                user = self.create_user()
+                self.assertEqual(
+                    identify_hasher(user.password).algorithm, get_hasher().algorithm
+                )
+                response = self.login()
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("access", response.data)
+                self.assertEqual(self.login("wrong-pass").status_code, 401)
+                user.delete()
+
+    def test_login_rehashes_to_the_current_profile(self):
+        with self.settings(PASSWORD_HASHERS=hashers_for("pbkdf2")):
+            user = self.create_user()
+        with self.settings(PASSWORD_HASHERS=hashers_for("scrypt")):
+            self.assertEqual(self.login().status_code, 200)
+            user.refresh_from_db()
+            self.assertEqual(identify_hasher(user.password).algorithm, "scrypt")
+
+    def test_login_accepts_legacy_hashes(self):
+        with self.settings(PASSWORD_HASHERS=hashers_for("pbkdf2")):
+            user = self.create_user()
+            user.password = make_password("s3cret-pass", hasher="pbkdf2_sha1")
+            user.save(update_fields=["password"])
+            self.assertEqual(self.login().status_code, 200)
+            user.refresh_from_db()
+            self.assertEqual(identify_hasher(user.password).algorithm, "pbkdf2_sha256")
+
+    def test_login_rehashes_to_the_configured_iterations(self):
+        with self.settings(PASSWORD_HASHERS=hashers_for("pbkdf2")):
+            user = self.create_user()
+            self.assertTrue(user.password.startswith("pbkdf2_sha256$1000$"))
+            with self.settings(PBKDF2_ITERATIONS=2000):
+                self.assertEqual(self.login().status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$2000$"))
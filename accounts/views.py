@@ -5,6 +5,7 @@ from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
+from .authentication import add_user_claims
 from .serializers import (
     UserRegistrationSerializer,
     UserSerializer,
@@ -15,18 +16,22 @@ User = get_user_model()
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # Refresh tokens pass their claims on to every access token they mint
+        return add_user_claims(super().get_token(user), user)
+
     def validate(self, attrs):
+        # authenticate() in super().validate is the only user lookup; it also
+        # re-hashes the password if the hasher profile has changed.
+        data = super().validate(attrs)
+
         # Check if user is verified
-        try:
-            user = User.objects.get(email=attrs["email"])
-            if not user.is_verified:
-                raise serializers.ValidationError(
-                    "Email not verified. Please check your email for verification link."
-                )
-        except User.DoesNotExist:
-            pass
+        if not self.user.is_verified:
+            raise serializers.ValidationError(
+                "Email not verified. Please check your email for verification link."
+            )
 
-        data = super().validate(attrs)
         data["user_type"] = self.user.user_type
         data["email"] = self.user.email
         data["first_name"] = self.user.first_name
@@ -108,7 +113,9 @@ class UserProfileViewSet(viewsets.ReadOnlyModelViewSet):
         # Allow users to only see their own profile or public employer profiles
         if self.request.user.user_type == "job_seeker":
             return User.objects.filter(id=self.request.user.id)
-        return User.objects.filter(is_active=True, is_verified=True)
+        return User.objects.filter(is_active=True, is_verified=True).select_related(
+            "rating_summary"
+        )
 
 
 class LogoutView(APIView):
@@ -1,3 +1,9 @@
 from django.contrib import admin
+from .models import StoredFile
 
-# Register your models here.
+
+@admin.register(StoredFile)
+class StoredFileAdmin(admin.ModelAdmin):
+    list_display = ("name", "size", "ref_count", "created_at")
+    search_fields = ("name", "content_hash")
+    readonly_fields = ("content_hash", "name", "size", "ref_count", "created_at")
@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        if settings.METRICS_ENABLED:
+            from django.db.backends.signals import connection_created
+
+            from .metrics import install_query_timer, instrument_serializers
+
+            instrument_serializers()
+            connection_created.connect(install_query_timer)
@@ -0,0 +1,150 @@
+"""
+Native async versions of DRF read endpoints, for ASGI deployments.
+
+``async_read_view`` answers JSON GET requests with a coroutine that does its
+I/O through Django's async ORM and cache APIs, so an ASGI worker keeps serving
+other requests while a query is in flight instead of holding a thread for the
+whole view. Negotiation, permissions, filtering, serialization and exception
+handling reuse the DRF view's own machinery, which does no I/O of its own.
+Every other method, and the browsable API, is handed to the synchronous view.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.response import Response
+
+from .cache import CachedResponseMixin
+from .pagination import apaginate_queryset
+
+# The actions DefaultRouter maps onto a viewset's list and detail routes
+LIST_ACTIONS = {"get": "list", "post": "create"}
+DETAIL_ACTIONS = {
+    "get": "retrieve",
+    "put": "update",
+    "patch": "partial_update",
+    "delete": "destroy",
+}
+
+
+def async_read_view(view_class, handler, actions=None, **initkwargs):
+    """
+    Return an async Django view serving GET with ``handler(view)``.
+
+    ``handler`` is a coroutine function that receives the initialized DRF view
+    and returns a Response. ``actions`` is the router's method -> action map
+    when ``view_class`` is a viewset.
+    """
+    if actions is None:
+        sync_view = view_class.as_view(**initkwargs)
+    else:
+        actions = {
+            method: action
+            for method, action in actions.items()
+            if hasattr(view_class, action)
+        }
+        sync_view = view_class.as_view(actions, **initkwargs)
+    fallback = sync_to_async(sync_view)
+
+    @csrf_exempt
+    async def view(request, *args, **kwargs):
+        if request.method != "GET":
+            return await fallback(request, *args, **kwargs)
+
+        instance = view_class(**initkwargs)
+        if actions is not None:
+            instance.action_map = actions
+        instance.args, instance.kwargs = args, kwargs
+        drf_request = instance.initialize_request(request, *args, **kwargs)
+        instance.request = drf_request
+        instance.headers = instance.default_response_headers
+
+        try:
+            instance.format_kwarg = instance.get_format_suffix(**kwargs)
+            renderer, _ = instance.perform_content_negotiation(drf_request)
+            if renderer.format != "json":
+                return await fallback(request, *args, **kwargs)
+            if request.headers.get("Authorization"):
+                # Authentication may have to load the user row
+                await sync_to_async(instance.initial)(drf_request)
+            else:
+                instance.initial(drf_request)
+            response = await handler(instance)
+        except Exception as exc:
+            response = instance.handle_exception(exc)
+
+        # Render here: Django would otherwise render the response in a thread
+        response = instance.finalize_response(drf_request, response)
+        response.render()
+        return HttpResponse(
+            response.content, status=response.status_code, headers=response.headers
+        )
+
+    view.view_class = view_class
+    view.actions = actions
+    return view
+
+
+async def cached(view, handler):
+    """Run ``handler(view)`` through the view's response cache, if it has one."""
+    if not isinstance(view, CachedResponseMixin):
+        return await handler(view)
+    return await view.acached_response(lambda request: handler(view), view.request)
+
+
+async def filter_queryset(view, queryset):
+    """
+    ``view.filter_queryset`` for async views. Filters normally only build the
+    query, but those driven by the view's ``sync_filter_params`` run queries of
+    their own and are applied in a thread.
+    """
+    params = getattr(view, "sync_filter_params", ())
+    if any(param in view.request.query_params for param in params):
+        return await sync_to_async(view.filter_queryset)(queryset)
+    return view.filter_queryset(queryset)
+
+
+async def list_objects(view):
+    """Async ``ListModelMixin.list``."""
+    queryset = await filter_queryset(view, view.get_queryset())
+    page = await apaginate_queryset(view.paginator, queryset, view.request, view)
+    if page is not None:
+        serializer = view.get_serializer(page, many=True)
+        return view.get_paginated_response(serializer.data)
+    serializer = view.get_serializer([obj async for obj in queryset], many=True)
+    return Response(serializer.data)
+
+
+async def retrieve_object(view):
+    """Async ``RetrieveModelMixin.retrieve``."""
+    queryset = await filter_queryset(view, view.get_queryset())
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    try:
+        obj = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+    except queryset.model.DoesNotExist:
+        raise Http404(
+            f"No {queryset.model._meta.object_name} matches the given query."
+        )
+    except (TypeError, ValueError, ValidationError):
+        raise Http404
+    view.check_object_permissions(view.request, obj)
+    return Response(view.get_serializer(obj).data)
+
+
+def async_list_view(viewset, basename):
+    async def handler(view):
+        return await cached(view, list_objects)
+
+    return async_read_view(
+        viewset, handler, LIST_ACTIONS, basename=basename, detail=False
+    )
+
+
+def async_detail_view(viewset, basename):
+    async def handler(view):
+        return await cached(view, retrieve_object)
+
+    return async_read_view(
+        viewset, handler, DETAIL_ACTIONS, basename=basename, detail=True
+    )
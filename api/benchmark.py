@@ -0,0 +1,38 @@
+"""Helpers shared by the benchmark management commands."""
+
+import math
+
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile: the smallest sample with ``fraction`` at or below it."""
+    ordered = sorted(samples)
+    # Rounded first, so float noise such as 0.07 * 100 == 7.000000000000001 stays 7
+    rank = math.ceil(round(fraction * len(ordered), 9))
+    return ordered[max(0, rank - 1)]
+
+
+def summarize(samples):
+    return {
+        "requests": len(samples),
+        "per_second": round(len(samples) / sum(samples), 2),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+    }
+
+
+def route_names(urlconf="api.urls"):
+    """Return the sorted names of every named route in ``urlconf``."""
+    names = set()
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                names.add(pattern.name)
+
+    walk(get_resolver(urlconf).url_patterns)
+    return sorted(names)
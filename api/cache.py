@@ -0,0 +1,152 @@
+"""
+Versioned response cache for public read endpoints.
+
+Every cached response is keyed by the request's normalized URL and the current
+version of each model the response is built from. Signals bump a model's version
+when one of its rows changes, which retires every response that depends on it
+without having to find and delete those entries.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+
+# Backends whose entries live inside one process, so a version bumped by one
+# worker or management command is invisible to the others
+PROCESS_LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def cache_is_shared(alias=None):
+    """Whether every process sees the same entries in cache ``alias``."""
+    alias = alias or settings.RESPONSE_CACHE_ALIAS
+    return settings.CACHES[alias]["BACKEND"] not in PROCESS_LOCAL_BACKENDS
+
+
+def version_key(label):
+    return f"version:{label}"
+
+
+def get_versions(labels):
+    """Return the current version of each model label, initialising missing ones."""
+    cache = get_cache()
+    keys = [version_key(label) for label in labels]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Start from the clock, so an evicted counter never reuses old versions
+            cache.add(key, int(time.time() * 1000), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(labels):
+    """Async counterpart of ``get_versions``."""
+    cache = get_cache()
+    keys = [version_key(label) for label in labels]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, int(time.time() * 1000), None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(label):
+    """Invalidate every cached response that depends on ``label``."""
+    cache = get_cache()
+    try:
+        cache.incr(version_key(label))
+    except ValueError:
+        cache.add(version_key(label), int(time.time() * 1000), None)
+
+
+def normalized_query(request):
+    """Query parameters in a canonical order, so equivalent URLs share a key."""
+    params = request.query_params
+    return "&".join(
+        f"{key}={value}"
+        for key in sorted(params)
+        for value in sorted(params.getlist(key))
+    )
+
+
+class CachedResponseMixin:
+    """
+    Serve ``list`` and ``retrieve`` from the response cache.
+
+    ``cache_models`` lists the model labels (``app_label.model_name``) whose
+    data appears in the response.
+    """
+
+    cache_models = ()
+    cache_actions = ("list", "retrieve")
+
+    def get_response_cache_key(self, request):
+        return self.build_response_cache_key(request, get_versions(self.cache_models))
+
+    async def aget_response_cache_key(self, request):
+        return self.build_response_cache_key(
+            request, await aget_versions(self.cache_models)
+        )
+
+    def build_response_cache_key(self, request, versions):
+        url = f"{request.scheme}://{request.get_host()}{request.path}"
+        digest = hashlib.sha1(f"{url}?{normalized_query(request)}".encode()).hexdigest()
+        return "response:{}:{}:{}".format(
+            self.basename, ".".join(str(version) for version in versions), digest
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not settings.RESPONSE_CACHE_TIMEOUT or self.action not in self.cache_actions:
+            return handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        """``cached_response`` for async views; ``handler`` is a coroutine function."""
+        if not settings.RESPONSE_CACHE_TIMEOUT or self.action not in self.cache_actions:
+            return await handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = await self.aget_response_cache_key(request)
+        data = await cache.aget(key)
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            await cache.aset(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,250 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from accounts.views import CustomTokenObtainPairSerializer
+from api.benchmark import route_names, summarize
+from api.metrics import RequestMetrics
+from jobs.models import JobCategory, JobListing, JobApplication, Resume, EmployerReview
+
+PASSWORD = "Benchmark-Passw0rd!"
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the routes in api/urls.py through the test client against the "
+        "current database (see generate_data) and report p50/p95/p99 latency and "
+        "query counts per route as JSON. Writes made by the run are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=20, help="Measured requests per route."
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=2, help="Unmeasured requests per route."
+        )
+        parser.add_argument(
+            "--route",
+            action="append",
+            default=[],
+            help="Only run routes whose label starts with this (repeatable).",
+        )
+        parser.add_argument(
+            "--cache",
+            action="store_true",
+            help="Keep the response and dashboard caches enabled.",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        overrides = {"DEBUG": False}
+        if not options["cache"]:
+            overrides.update(RESPONSE_CACHE_TIMEOUT=0, DASHBOARD_CACHE_TIMEOUT=0)
+
+        setup_test_environment()
+        try:
+            with override_settings(**overrides), transaction.atomic():
+                specs = self.route_specs(self.fixtures())
+                if options["route"]:
+                    specs = [
+                        spec
+                        for spec in specs
+                        if spec["label"].startswith(tuple(options["route"]))
+                    ]
+                results = [
+                    self.run_route(spec, options["requests"], options["warmup"])
+                    for spec in specs
+                ]
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+
+        covered = {spec["name"] for spec in specs}
+        report = {
+            "started_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "cache": options["cache"],
+            "dataset": {
+                model._meta.label: model.objects.count()
+                for model in (User, JobCategory, JobListing, JobApplication, Resume, EmployerReview)
+            },
+            "routes": results,
+            "not_benchmarked": [name for name in route_names() if name not in covered],
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        self.stdout.write(output)
+
+    def fixtures(self):
+        """Pick the busiest listing and the users and rows around it."""
+        job = (
+            JobListing.objects.filter(is_active=True, applications__isnull=False)
+            .select_related("employer", "category")
+            .order_by("-application_count")
+            .first()
+        )
+        if job is None:
+            raise CommandError(
+                "No active listing with applications; run `manage.py generate_data` first."
+            )
+        application = job.applications.select_related("applicant").first()
+        employer, seeker = job.employer, application.applicant
+
+        # Known passwords for the login routes; rolled back with everything else
+        for user in (employer, seeker):
+            user.set_password(PASSWORD)
+            user.save(update_fields=["password"])
+
+        return {
+            "job": job,
+            "category": job.category,
+            "employer": employer,
+            "seeker": seeker,
+            "application": application,
+            "resume": Resume.objects.filter(user=seeker).first(),
+            "review": EmployerReview.objects.filter(employer=employer).first(),
+        }
+
+    def route_specs(self, fixtures):
+        job, employer, seeker = fixtures["job"], fixtures["employer"], fixtures["seeker"]
+        refresh = CustomTokenObtainPairSerializer.get_token(seeker)
+
+        def spec(label, name, user=None, kwargs=None, method="get", data=None):
+            return {
+                "label": label,
+                "name": name,
+                "method": method,
+                "user": user,
+                "url": reverse(name, kwargs=kwargs),
+                "data": data,
+            }
+
+        specs = [
+            spec("api-root", "api-root"),
+            spec("jobs-list", "jobs-list"),
+            spec("jobs-list full-text", "jobs-list", data={"q": "developer"}),
+            spec(
+                "jobs-list category", "jobs-list", data={"category": fixtures["category"].pk}
+            ),
+            spec("jobs-list cursor", "jobs-list", data={"pagination": "cursor"}),
+            spec("jobs-detail", "jobs-detail", kwargs={"pk": job.pk}),
+            spec("jobs-my-listings", "jobs-my-listings", employer),
+            spec("jobs-applications", "jobs-applications", employer, {"pk": job.pk}),
+            spec("jobs-export", "jobs-export", employer),
+            spec("categories-list", "categories-list"),
+            spec(
+                "categories-detail", "categories-detail", kwargs={"pk": fixtures["category"].pk}
+            ),
+            spec("applications-list employer", "applications-list", employer),
+            spec("applications-list seeker", "applications-list", seeker),
+            spec(
+                "applications-detail",
+                "applications-detail",
+                seeker,
+                {"pk": fixtures["application"].pk},
+            ),
+            spec("applications-my-applications", "applications-my-applications", seeker),
+            spec(
+                "applications-update-status",
+                "applications-update-status",
+                employer,
+                {"pk": fixtures["application"].pk},
+                "patch",
+                {"status": "reviewed"},
+            ),
+            spec("resumes-list", "resumes-list", seeker),
+            spec("reviews-list", "reviews-list"),
+            spec("reviews-list employer", "reviews-list", data={"employer": employer.pk}),
+            spec("job-reviews-list", "job-reviews-list", kwargs={"job_pk": job.pk}),
+            spec("profiles-list", "profiles-list", employer),
+            spec("profiles-detail", "profiles-detail", employer, {"pk": employer.pk}),
+            spec("dashboard employer", "dashboard", employer),
+            spec("dashboard seeker", "dashboard", seeker),
+            spec("user-profile", "user-profile", seeker),
+            spec("user-me", "user-me", seeker),
+            spec(
+                "token-obtain",
+                "token-obtain",
+                method="post",
+                data={"email": seeker.email, "password": PASSWORD},
+            ),
+            spec(
+                "token-refresh",
+                "token-refresh",
+                method="post",
+                data={"refresh": str(refresh)},
+            ),
+            spec(
+                "jwt-verify",
+                "jwt-verify",
+                method="post",
+                data={"token": str(refresh.access_token)},
+            ),
+        ]
+        if fixtures["resume"]:
+            resume = {"pk": fixtures["resume"].pk}
+            specs += [
+                spec("resumes-detail", "resumes-detail", seeker, resume),
+                spec("resumes-set-primary", "resumes-set-primary", seeker, resume, "post"),
+            ]
+        if fixtures["review"]:
+            review = fixtures["review"].pk
+            specs += [
+                spec("reviews-detail", "reviews-detail", kwargs={"pk": review}),
+                spec(
+                    "job-reviews-detail",
+                    "job-reviews-detail",
+                    kwargs={"job_pk": job.pk, "pk": review},
+                ),
+            ]
+        return specs
+
+    def run_route(self, spec, requests, warmup):
+        client = APIClient()
+        if spec["user"] is not None:
+            token = CustomTokenObtainPairSerializer.get_token(spec["user"]).access_token
+            client.credentials(HTTP_AUTHORIZATION=f"JWT {token}")
+        send = getattr(client, spec["method"])
+        options = {} if spec["method"] == "get" else {"format": "json"}
+
+        samples, queries, db_time = [], [], []
+        for number in range(warmup + requests):
+            metrics = RequestMetrics()
+            started = time.perf_counter()
+            with connection.execute_wrapper(metrics):
+                response = send(spec["url"], spec["data"], **options)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            elapsed = time.perf_counter() - started
+            if response.status_code >= 400:
+                raise CommandError(
+                    f"{spec['label']}: {spec['method'].upper()} {spec['url']} "
+                    f"returned {response.status_code}"
+                )
+            if number >= warmup:
+                samples.append(elapsed)
+                queries.append(metrics.db_queries)
+                db_time.append(metrics.db_time)
+
+        return {
+            "route": spec["label"],
+            "name": spec["name"],
+            "method": spec["method"].upper(),
+            "url": spec["url"],
+            **summarize(samples),
+            "queries_p50": statistics.median(queries),
+            "queries_max": max(queries),
+            "db_p50_ms": round(statistics.median(db_time) * 1000, 2),
+        }
@@ -0,0 +1,241 @@
+import asyncio
+import io
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.views import CustomTokenObtainPairSerializer
+from api.benchmark import percentile
+from jobs.models import JobListing
+
+HOST = "localhost"
+
+# URLconf each server mode runs with; see career_connect/asgi.py
+URLCONFS = {
+    "wsgi": "career_connect.urls",
+    "asgi": "career_connect.async_urls",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the read endpoints served by native async views under ASGI with "
+        "the same routes served by the sync views under WSGI: both handlers run "
+        "in-process against the current database (see generate_data) with the "
+        "given number of requests in flight, and throughput and latency "
+        "percentiles per route are reported as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Measured requests per route."
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=16,
+            help="Requests in flight: WSGI threads, or concurrent ASGI requests.",
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=5, help="Unmeasured requests per route."
+        )
+        parser.add_argument(
+            "--route",
+            action="append",
+            default=[],
+            help="Only run routes whose label starts with this (repeatable).",
+        )
+        parser.add_argument(
+            "--cache",
+            action="store_true",
+            help="Keep the response and dashboard caches enabled.",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        # A sync-only middleware would put every ASGI request through a thread
+        overrides = {
+            "DEBUG": False,
+            "ALLOWED_HOSTS": [HOST],
+            "MIDDLEWARE": [
+                name
+                for name in settings.MIDDLEWARE
+                if not name.startswith("debug_toolbar.")
+            ],
+        }
+        if not options["cache"]:
+            overrides.update(RESPONSE_CACHE_TIMEOUT=0, DASHBOARD_CACHE_TIMEOUT=0)
+
+        with override_settings(**overrides):
+            specs = self.route_specs()
+            if options["route"]:
+                specs = [
+                    spec
+                    for spec in specs
+                    if spec["label"].startswith(tuple(options["route"]))
+                ]
+            handlers = {"wsgi": WSGIHandler(), "asgi": ASGIHandler()}
+            results = []
+            for spec in specs:
+                result = {"label": spec["label"], "url": spec["url"]}
+                for mode, handler in handlers.items():
+                    with override_settings(ROOT_URLCONF=URLCONFS[mode]):
+                        run = self.run_wsgi if mode == "wsgi" else self.run_asgi
+                        if options["warmup"]:
+                            run(handler, spec, options["warmup"], options["concurrency"])
+                        result[mode] = run(
+                            handler, spec, options["requests"], options["concurrency"]
+                        )
+                result["speedup"] = round(
+                    result["asgi"]["per_second"] / result["wsgi"]["per_second"], 2
+                )
+                results.append(result)
+
+        report = {
+            "started_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "cache": options["cache"],
+            "concurrency": options["concurrency"],
+            "routes": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        self.stdout.write(output)
+
+    def route_specs(self):
+        job = (
+            JobListing.objects.filter(is_active=True)
+            .select_related("employer", "category")
+            .order_by("-application_count")
+            .first()
+        )
+        if job is None:
+            raise CommandError(
+                "No active listing; run `manage.py generate_data` first."
+            )
+        token = CustomTokenObtainPairSerializer.get_token(job.employer).access_token
+
+        def spec(label, name, kwargs=None, query=None, authenticated=False):
+            return {
+                "label": label,
+                "url": reverse(name, kwargs=kwargs),
+                "query": urlencode(query or {}),
+                "authorization": f"JWT {token}" if authenticated else None,
+            }
+
+        return [
+            spec("jobs-list", "jobs-list"),
+            spec(
+                "jobs-list filtered",
+                "jobs-list",
+                query={"category": job.category_id, "ordering": "-salary_min"},
+            ),
+            spec("jobs-list cursor", "jobs-list", query={"pagination": "cursor"}),
+            spec("jobs-detail", "jobs-detail", kwargs={"pk": job.pk}),
+            spec("categories-list", "categories-list"),
+            spec("categories-detail", "categories-detail", kwargs={"pk": job.category_id}),
+            spec("dashboard", "dashboard", authenticated=True),
+        ]
+
+    def run_wsgi(self, handler, spec, requests, concurrency):
+        def send(_):
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "SCRIPT_NAME": "",
+                "PATH_INFO": spec["url"],
+                "QUERY_STRING": spec["query"],
+                "SERVER_NAME": HOST,
+                "SERVER_PORT": "80",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "HTTP_HOST": HOST,
+                "wsgi.version": (1, 0),
+                "wsgi.url_scheme": "http",
+                "wsgi.input": io.BytesIO(),
+                "wsgi.errors": sys.stderr,
+                "wsgi.multithread": True,
+                "wsgi.multiprocess": False,
+                "wsgi.run_once": False,
+            }
+            if spec["authorization"]:
+                environ["HTTP_AUTHORIZATION"] = spec["authorization"]
+            statuses = []
+            start = time.perf_counter()
+            body = handler(environ, lambda status, headers: statuses.append(status))
+            for _ in body:
+                pass
+            body.close()
+            return time.perf_counter() - start, int(statuses[0].split()[0])
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(send, range(requests)))
+        return self.summarize(samples, time.perf_counter() - start)
+
+    def run_asgi(self, handler, spec, requests, concurrency):
+        async def send(slots):
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": spec["url"],
+                "raw_path": spec["url"].encode(),
+                "query_string": spec["query"].encode(),
+                "root_path": "",
+                "headers": [(b"host", HOST.encode())],
+                "server": (HOST, 80),
+                "client": ("127.0.0.1", 0),
+            }
+            if spec["authorization"]:
+                scope["headers"].append((b"authorization", spec["authorization"].encode()))
+            received = asyncio.Event()
+            statuses = []
+
+            async def receive():
+                if received.is_set():
+                    # Nothing after the body: wait like a client that stays connected
+                    await asyncio.Future()
+                received.set()
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send_message(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+
+            async with slots:
+                start = time.perf_counter()
+                await handler(scope, receive, send_message)
+                return time.perf_counter() - start, statuses[0]
+
+        async def run():
+            slots = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(*(send(slots) for _ in range(requests)))
+
+        start = time.perf_counter()
+        samples = asyncio.run(run())
+        return self.summarize(samples, time.perf_counter() - start)
+
+    def summarize(self, samples, elapsed):
+        latencies = [latency for latency, _ in samples]
+        return {
+            "requests": len(samples),
+            "errors": sum(1 for _, status in samples if status != 200),
+            "per_second": round(len(samples) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        }
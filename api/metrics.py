@@ -0,0 +1,301 @@
+"""
+Per-endpoint performance metrics in the Prometheus text format.
+
+Each process keeps its own aggregates in memory: request counts, and
+histograms of latency, response size, DB queries and DB time per request, and
+serializer time. With ``METRICS_DIR`` set, every process periodically writes a
+snapshot of its aggregates to ``<METRICS_DIR>/metrics-<pid>.json``, and the
+``/metrics`` endpoint sums the snapshots of all processes, so a scrape that
+lands on any gunicorn worker reports the totals of the whole server.
+"""
+
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# name -> (type, help, buckets)
+METRICS = {
+    "http_requests_total": (
+        "counter",
+        "Requests handled, by route, method and status code.",
+        None,
+    ),
+    "http_request_duration_seconds": (
+        "histogram",
+        "Time spent handling a request.",
+        LATENCY_BUCKETS,
+    ),
+    "http_response_size_bytes": (
+        "histogram",
+        "Response body size.",
+        SIZE_BUCKETS,
+    ),
+    "db_queries_per_request": (
+        "histogram",
+        "Database queries issued while handling a request.",
+        QUERY_COUNT_BUCKETS,
+    ),
+    "db_query_duration_seconds": (
+        "histogram",
+        "Total database time spent while handling a request.",
+        LATENCY_BUCKETS,
+    ),
+    "serializer_duration_seconds": (
+        "histogram",
+        "Time spent building serializer output while handling a request.",
+        LATENCY_BUCKETS,
+    ),
+}
+
+# Measurements of the request being handled, set by MetricsMiddleware. Async
+# ORM calls run in a worker thread with a copy of the context, so queries made
+# by async views are attributed to their request too.
+current_request = ContextVar("current_request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Counters collected while one request is handled."""
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper that counts and times every query."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+def time_query(execute, sql, params, many, context):
+    """Execute wrapper on every connection; feeds the current request's metrics."""
+    request_metrics = current_request.get()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    return request_metrics(execute, sql, params, many, context)
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """``connection_created`` receiver that adds ``time_query`` to the connection."""
+    if time_query not in connection.execute_wrappers:
+        # First, so execute_wrapper() blocks that pop the last wrapper keep working
+        connection.execute_wrappers.insert(0, time_query)
+
+
+class Registry:
+    """In-memory aggregates of one process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.last_flush = 0.0
+        self.loaded = False
+
+    def inc(self, name, labels, amount=1):
+        key = (name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, labels)
+        with self.lock:
+            # Per-bucket counts (the last slot is +Inf), then the sum
+            sample = self.histograms.get(key)
+            if sample is None:
+                sample = self.histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    break
+            else:
+                index = len(buckets)
+            sample[index] += 1
+            sample[-1] += value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "counters": [
+                    [name, list(labels), value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                "histograms": [
+                    [name, list(labels), list(sample)]
+                    for (name, labels), sample in self.histograms.items()
+                ],
+            }
+
+    def load(self, snapshot):
+        """Add a snapshot's values to this registry."""
+        with self.lock:
+            for name, labels, value in snapshot.get("counters", ()):
+                key = (name, tuple(map(tuple, labels)))
+                self.counters[key] = self.counters.get(key, 0) + value
+            for name, labels, sample in snapshot.get("histograms", ()):
+                if name not in METRICS or len(sample) != len(METRICS[name][2]) + 2:
+                    continue  # bucket layout changed since the snapshot was written
+                key = (name, tuple(map(tuple, labels)))
+                current = self.histograms.get(key)
+                if current is None:
+                    self.histograms[key] = list(sample)
+                else:
+                    self.histograms[key] = [a + b for a, b in zip(current, sample)]
+
+
+registry = Registry()
+
+
+def snapshot_path(pid=None):
+    return Path(settings.METRICS_DIR) / f"metrics-{pid or os.getpid()}.json"
+
+
+def resume_from_snapshot():
+    """
+    Pick up the values a previous process with this pid left behind, so the
+    totals summed across processes never go backwards when a worker restarts.
+    """
+    if registry.loaded:
+        return
+    registry.loaded = True
+    if not settings.METRICS_DIR:
+        return
+    try:
+        registry.load(json.loads(snapshot_path().read_text()))
+    except (OSError, ValueError):
+        pass
+
+
+def flush(force=False):
+    """Write this process's snapshot to ``METRICS_DIR`` at most every interval."""
+    if not settings.METRICS_DIR:
+        return
+    now = time.monotonic()
+    if not force and now - registry.last_flush < settings.METRICS_FLUSH_INTERVAL:
+        return
+    registry.last_flush = now
+
+    path = snapshot_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(registry.snapshot()))
+    # Atomic on POSIX, so readers never see a half-written file
+    os.replace(temporary, path)
+
+
+def record(route, method, status_code, duration, size, request_metrics):
+    """Aggregate the measurements of one finished request."""
+    resume_from_snapshot()
+    labels = (("route", route), ("method", method))
+    registry.inc("http_requests_total", labels + (("status", str(status_code)),))
+    registry.observe("http_request_duration_seconds", labels, duration)
+    if size is not None:
+        registry.observe("http_response_size_bytes", labels, size)
+    registry.observe("db_queries_per_request", labels, request_metrics.db_queries)
+    registry.observe("db_query_duration_seconds", labels, request_metrics.db_time)
+    registry.observe(
+        "serializer_duration_seconds", labels, request_metrics.serializer_time
+    )
+    flush()
+
+
+def collect():
+    """Return a registry holding the totals of every process that reported."""
+    resume_from_snapshot()
+    if not settings.METRICS_DIR:
+        return registry
+
+    flush(force=True)
+    combined = Registry()
+    for path in Path(settings.METRICS_DIR).glob("metrics-*.json"):
+        try:
+            combined.load(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return combined
+
+
+def escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(source):
+    """Render a registry in the Prometheus text exposition format."""
+    lines = []
+    counters = sorted(source.counters.items())
+    histograms = sorted(source.histograms.items())
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (sample_name, labels), value in counters:
+                if sample_name == name:
+                    lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+            continue
+
+        for (sample_name, labels), sample in histograms:
+            if sample_name != name:
+                continue
+            cumulative = 0
+            bounds = [format_value(bound) for bound in buckets] + ["+Inf"]
+            for bound, count in zip(bounds, sample[:-1]):
+                cumulative += count
+                bucket_labels = format_labels(labels + (("le", bound),))
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {format_value(sample[-1])}")
+            lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def instrument_serializers():
+    """
+    Time ``serializer.data`` for the request being handled.
+
+    Every DRF serializer builds its output through ``BaseSerializer.data``, so
+    wrapping that one property covers all of them. Nested ``.data`` calls are
+    counted once.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data
+    if getattr(original.fget, "timed", False):
+        return
+
+    def data(self):
+        metrics = current_request.get()
+        if metrics is None or metrics.serializing:
+            return original.fget(self)
+        metrics.serializing = True
+        start = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            metrics.serializing = False
+            metrics.serializer_time += time.perf_counter() - start
+
+    data.timed = True
+    BaseSerializer.data = property(data)
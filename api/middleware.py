@@ -0,0 +1,112 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from . import metrics
+
+
+class MetricsMiddleware:
+    """
+    Record per-route latency, response size, DB queries/time and serializer time.
+
+    Requests are labelled with the resolved URL name (``jobs-list``,
+    ``applications-update-status``, ...); requests that resolve to no route
+    share the ``unmatched`` label so arbitrary paths cannot grow the series.
+    Queries are counted by ``metrics.time_query``, which ApiConfig installs on
+    every database connection.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.measured(request):
+            return self.get_response(request)
+
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.current_request.set(request_metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        self.record(request, response, time.perf_counter() - start, request_metrics)
+        return response
+
+    async def __acall__(self, request):
+        if not self.measured(request):
+            return await self.get_response(request)
+
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.current_request.set(request_metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        self.record(request, response, time.perf_counter() - start, request_metrics)
+        return response
+
+    def measured(self, request):
+        return settings.METRICS_ENABLED and request.path != settings.METRICS_PATH
+
+    def record(self, request, response, duration, request_metrics):
+        match = request.resolver_match
+        route = match.view_name if match and match.view_name else "unmatched"
+        metrics.record(
+            route,
+            request.method,
+            response.status_code,
+            duration,
+            self.response_size(response),
+            request_metrics,
+        )
+
+    def response_size(self, response):
+        if not response.streaming:
+            return len(response.content)
+        length = response.get("Content-Length")
+        return int(length) if length else None
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """
+    WhiteNoise that also runs natively under ASGI.
+
+    A sync-only middleware makes Django run the rest of the chain through
+    sync/async adapters on every request, so the stock class would cost each
+    API request two thread hops just to find out it is not a static file.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
@@ -1,3 +1,20 @@
 from django.db import models
 
-# Create your models here.
+
+class StoredFile(models.Model):
+    """
+    Content-hash index of objects in media storage.
+
+    Uploads whose content is already stored reuse the existing object, and
+    ``ref_count`` tracks how many saved files point at it, so the remote object
+    is only deleted when the last reference goes.
+    """
+
+    content_hash = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} references)"
@@ -0,0 +1,308 @@
+import base64
+import datetime
+import decimal
+import json
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import F, Q
+from django.db.models.expressions import OrderBy
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+Cursor = namedtuple("Cursor", ["values", "reverse"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over the queryset's current ordering.
+
+    The primary key is appended to the ordering as a tie-breaker, so every row
+    has a unique position. Pages are fetched with a WHERE clause on that position
+    instead of OFFSET, and no COUNT(*) is run. NULLs sort after every value.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.page_from_rows(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        rows = [row async for row in self.page_queryset(queryset, request)]
+        return self.page_from_rows(rows)
+
+    def page_queryset(self, queryset, request):
+        """Return the query for the requested page plus one row, to detect more."""
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), "page")
+        self.ordering = self.get_ordering(queryset)
+        self.cursor = cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor.reverse)
+
+        ordering = [(field, descending != reverse) for field, descending in self.ordering]
+        queryset = queryset.order_by(
+            *[
+                F(field).desc(nulls_first=True)
+                if descending
+                else F(field).asc(nulls_last=True)
+                for field, descending in ordering
+            ]
+        )
+        if cursor:
+            values = self.clean_values(queryset, cursor.values)
+            queryset = queryset.filter(self.seek(ordering, values))
+
+        return queryset[: self.page_size + 1]
+
+    def page_from_rows(self, rows):
+        cursor = self.cursor
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if cursor and cursor.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = cursor is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(self.position(self.page[-1]), False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(self.position(self.page[0]), True))
+
+    def get_ordering(self, queryset):
+        """Return the queryset ordering as ``(field, descending)`` pairs plus pk."""
+        ordering = []
+        for item in queryset.query.order_by or queryset.model._meta.ordering:
+            if isinstance(item, OrderBy) and isinstance(item.expression, F):
+                ordering.append((item.expression.name, item.descending))
+            elif isinstance(item, str) and item != "?":
+                ordering.append((item.lstrip("-"), item.startswith("-")))
+            else:
+                raise NotFound("Cursor pagination does not support this ordering.")
+
+        if not any(field in ("pk", "id") for field, _ in ordering):
+            ordering.append(("pk", ordering[0][1] if ordering else True))
+        return ordering
+
+    def clean_values(self, queryset, values):
+        """
+        Convert cursor values to their ordering fields' types. Cursors are not
+        signed, so a tampered value must fail here and not inside the query.
+        """
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        cleaned = []
+        for (field, _), value in zip(self.ordering, values):
+            if value is not None:
+                try:
+                    value = self.ordering_field(queryset, field).to_python(value)
+                except (ValidationError, TypeError, ValueError, FieldDoesNotExist):
+                    raise NotFound(self.invalid_cursor_message)
+            cleaned.append(value)
+        return cleaned
+
+    def ordering_field(self, queryset, name):
+        """The model field or annotation output field that ``name`` orders by."""
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        model = queryset.model
+        *relations, last = name.split("__")
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.pk if last == "pk" else model._meta.get_field(last)
+
+    def seek(self, ordering, values):
+        """
+        Build the filter for rows strictly after ``values`` in ``ordering``.
+
+        The first field also gets a plain range bound, so the database can drive
+        the scan from an index on it.
+        """
+        if len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (field, descending), value in zip(ordering, values):
+            after, same = self.compare(field, descending, value)
+            condition |= equal & after
+            equal &= same
+
+        first_after, first_same = self.compare(ordering[0][0], ordering[0][1], values[0])
+        return (first_after | first_same) & condition
+
+    def compare(self, field, descending, value):
+        """Return ``(after, same)`` conditions for one field of the position."""
+        if value is None:
+            same = Q(**{f"{field}__isnull": True})
+            after = Q(**{f"{field}__isnull": False}) if descending else Q(pk__in=[])
+            return after, same
+
+        same = Q(**{field: value})
+        if descending:
+            after = Q(**{f"{field}__lt": value})
+        else:
+            after = Q(**{f"{field}__gt": value}) | Q(**{f"{field}__isnull": True})
+        return after, same
+
+    def position(self, row):
+        values = []
+        for field, _ in self.ordering:
+            value = row
+            for part in field.split("__"):
+                value = getattr(value, part)
+            values.append(value)
+        return values
+
+    def encode_cursor(self, cursor):
+        # Full-precision values: a truncated timestamp would skip or repeat rows
+        values = [
+            value.isoformat()
+            if isinstance(value, (datetime.date, datetime.time))
+            else str(value)
+            if isinstance(value, decimal.Decimal)
+            else value
+            for value in cursor.values
+        ]
+        payload = json.dumps({"v": values, "r": int(cursor.reverse)})
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            return Cursor(list(payload["v"]), bool(payload["r"]))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    """
+    Page-number pagination by default; keyset pagination when the client asks
+    for it with ``?pagination=cursor`` (or follows a ``cursor`` link).
+    """
+
+    mode_query_param = "pagination"
+    cursor_class = KeysetPagination
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_class()
+            return await self.cursor_paginator.apaginate_queryset(queryset, request, view)
+        return await apaginate_page_number(self, queryset, request)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `cursor` for keyset pagination.",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            },
+            {
+                "name": self.cursor_class.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor from a `next`/`previous` link.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+
+async def apaginate_queryset(paginator, queryset, request, view=None):
+    """
+    Async counterpart of ``paginator.paginate_queryset``: the count and the page
+    rows are fetched with the async ORM. Paginators without an async variant run
+    in a worker thread.
+    """
+    if paginator is None:
+        return None
+    if hasattr(paginator, "apaginate_queryset"):
+        return await paginator.apaginate_queryset(queryset, request, view)
+    if isinstance(paginator, PageNumberPagination):
+        return await apaginate_page_number(paginator, queryset, request)
+    return await sync_to_async(paginator.paginate_queryset)(queryset, request, view)
+
+
+async def apaginate_page_number(paginator, queryset, request):
+    """``PageNumberPagination.paginate_queryset`` with async queries."""
+    page_size = paginator.get_page_size(request)
+    if not page_size:
+        return None
+
+    django_paginator = paginator.django_paginator_class(queryset, page_size)
+    # Paginator.count is a cached property; filling it in skips the sync COUNT
+    django_paginator.count = await queryset.acount()
+    page_number = paginator.get_page_number(request, django_paginator)
+    try:
+        paginator.page = django_paginator.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(
+            paginator.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+        )
+    paginator.page.object_list = [row async for row in paginator.page.object_list]
+
+    if django_paginator.num_pages > 1 and paginator.template is not None:
+        paginator.display_page_controls = True
+    paginator.request = request
+    return list(paginator.page)
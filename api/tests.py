@@ -1,3 +1,429 @@
-from django.test import TestCase
+import io
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from accounts.views import CustomTokenObtainPairSerializer
+from career_connect.storage import CloudinaryMediaStorage, content_hash
+from jobs.models import JobCategory, JobListing, JobApplication, Resume
+from .benchmark import percentile, route_names, summarize
+from .cache import get_cache
+from .models import StoredFile
+
+
+class ContentDeduplicationTests(TestCase):
+    """Identical content is uploaded once and deleted with its last reference."""
+
+    def setUp(self):
+        uploads = iter(range(1, 100))
+        upload = mock.patch(
+            "cloudinary.uploader.upload",
+            side_effect=lambda content, **options: {
+                "public_id": f"{options['folder']}/object-{next(uploads)}"
+            },
+        )
+        destroy = mock.patch(
+            "cloudinary.uploader.destroy", return_value={"result": "ok"}
+        )
+        self.upload = upload.start()
+        self.destroy = destroy.start()
+        self.addCleanup(mock.patch.stopall)
+        self.storage = CloudinaryMediaStorage()
+
+    def test_identical_content_is_uploaded_once(self):
+        first = self.storage.save("resumes/a.pdf", ContentFile(b"same", name="a.pdf"))
+        second = self.storage.save("resumes/b.pdf", ContentFile(b"same", name="b.pdf"))
+        other = self.storage.save("resumes/c.pdf", ContentFile(b"other", name="c.pdf"))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(self.upload.call_count, 2)
+        self.assertEqual(StoredFile.objects.get(name=first).ref_count, 2)
+        self.assertTrue(self.storage.exists(first))
+
+    def test_documents_are_stored_as_raw_files(self):
+        self.upload.side_effect = lambda content, **options: {
+            "public_id": f"{options['folder']}/cv.docx"
+        }
+        name = self.storage.save("resumes/cv.docx", ContentFile(b"doc", name="cv.docx"))
+        self.assertEqual(self.upload.call_args.kwargs["resource_type"], "raw")
+        self.assertIn("/raw/upload/", self.storage.url(name))
+
+        self.storage.delete(name)
+        self.assertEqual(self.destroy.call_args.kwargs["resource_type"], "raw")
+
+        self.storage.save("resumes/cv.pdf", ContentFile(b"pdf", name="cv.pdf"))
+        self.assertEqual(self.upload.call_args.kwargs["resource_type"], "image")
+
+    def test_concurrent_upload_of_the_same_content(self):
+        def upload(content, **options):
+            # Another worker indexes the same content while this upload runs
+            StoredFile.objects.create(
+                content_hash=content_hash(ContentFile(b"same")),
+                name="resumes/winner",
+                size=4,
+            )
+            return {"public_id": "resumes/loser"}
+
+        self.upload.side_effect = upload
+        name = self.storage.save("resumes/a.pdf", ContentFile(b"same", name="a.pdf"))
+
+        self.assertEqual(name, "resumes/winner")
+        self.assertEqual(StoredFile.objects.get(name=name).ref_count, 2)
+        self.destroy.assert_called_once()
+
+    def test_upload_that_reuses_an_indexed_name(self):
+        self.upload.side_effect = lambda content, **options: {
+            "public_id": "resumes/object"
+        }
+        first = self.storage.save("resumes/a.pdf", ContentFile(b"old", name="a.pdf"))
+        second = self.storage.save("resumes/a.pdf", ContentFile(b"new", name="a.pdf"))
+
+        self.assertEqual(first, second)
+        self.destroy.assert_not_called()
+        stored = StoredFile.objects.get(name=first)
+        self.assertEqual(stored.ref_count, 2)
+        self.assertEqual(stored.content_hash, content_hash(ContentFile(b"new")))
+
+    def test_remote_object_is_deleted_with_the_last_reference(self):
+        name = self.storage.save("resumes/a.pdf", ContentFile(b"same", name="a.pdf"))
+        self.storage.save("resumes/b.pdf", ContentFile(b"same", name="b.pdf"))
+
+        self.storage.delete(name)
+        self.destroy.assert_not_called()
+        self.storage.delete(name)
+        self.destroy.assert_called_once()
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+
+    def test_applications_keep_a_referenced_resume_alive(self):
+        employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        seeker = User.objects.create_user(
+            email="seeker@example.com", password="pass", user_type="job_seeker"
+        )
+        job = JobListing.objects.create(
+            employer=employer,
+            title="Developer",
+            description="Description",
+            requirements="Requirements",
+            location="Dhaka",
+        )
+        resume = Resume(user=seeker, title="CV")
+        resume.file.save("cv.pdf", ContentFile(b"resume"), save=False)
+        resume.save()
+        application = JobApplication.objects.create(
+            job=job, applicant=seeker, resume=resume.file.name, source_resume=resume
+        )
+        self.assertEqual(StoredFile.objects.get(name=resume.file.name).ref_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resume.delete()
+        self.destroy.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            application.delete()
+        self.destroy.assert_called_once()
+
+
+class MetricsTests(TestCase):
+    """/metrics needs a token outside DEBUG and renders the Prometheus format."""
+
+    def test_exposition_format(self):
+        from .metrics import Registry, render
+
+        registry = Registry()
+        labels = (("route", "jobs-list"), ("method", "GET"))
+        registry.inc("http_requests_total", labels + (("status", "200"),), 3)
+        registry.observe("http_request_duration_seconds", labels, 0.02)
+        registry.observe("http_request_duration_seconds", labels, 20.0)
+
+        lines = render(registry).splitlines()
+        self.assertIn("# TYPE http_requests_total counter", lines)
+        self.assertIn(
+            'http_requests_total{route="jobs-list",method="GET",status="200"} 3', lines
+        )
+        bucket = (
+            "http_request_duration_seconds_bucket"
+            '{route="jobs-list",method="GET",le="%s"} %d'
+        )
+        self.assertIn(bucket % ("0.01", 0), lines)
+        self.assertIn(bucket % ("0.025", 1), lines)
+        self.assertIn(bucket % ("10.0", 1), lines)
+        self.assertIn(bucket % ("+Inf", 2), lines)
+        self.assertIn(
+            'http_request_duration_seconds_sum{route="jobs-list",method="GET"} 20.02',
+            lines,
+        )
+        self.assertIn(
+            'http_request_duration_seconds_count{route="jobs-list",method="GET"} 2',
+            lines,
+        )
+
+    def test_token_is_required(self):
+        with self.settings(METRICS_TOKEN=""):
+            self.assertEqual(self.client.get("/metrics").status_code, 403)
+            with self.settings(DEBUG=True):
+                self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+        with self.settings(METRICS_TOKEN="secret", METRICS_DIR=""):
+            self.client.get("/api/v1/categories/")
+            self.assertEqual(self.client.get("/metrics").status_code, 403)
+            response = self.client.get(
+                "/metrics", headers={"Authorization": "Bearer wrong"}
+            )
+            self.assertEqual(response.status_code, 403)
+            response = self.client.get(
+                "/metrics", headers={"Authorization": "Bearer secret"}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn(
+            'http_requests_total{route="categories-list",method="GET",status="200"}',
+            response.content.decode(),
+        )
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor pages follow on from each other and reject tampered cursors."""
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        JobListing.objects.bulk_create(
+            JobListing(
+                employer=employer,
+                title=f"Developer {index:02}",
+                description="Description",
+                requirements="Requirements",
+                location="Dhaka",
+            )
+            for index in range(12)
+        )
+
+    def titles(self, response):
+        return [job["title"] for job in response.data["results"]]
+
+    def test_pages_follow_the_cursor(self):
+        response = self.client.get(
+            "/api/v1/jobs/", {"pagination": "cursor", "ordering": "title"}
+        )
+        self.assertEqual(self.titles(response)[0], "Developer 00")
+        self.assertIsNone(response.data["previous"])
+
+        last = self.client.get(response.data["next"])
+        self.assertEqual(self.titles(last), ["Developer 10", "Developer 11"])
+        self.assertIsNone(last.data["next"])
+
+        back = self.client.get(last.data["previous"])
+        self.assertEqual(self.titles(back), self.titles(response))
+
+    def test_tampered_cursors_are_rejected(self):
+        import base64
+        import json
+
+        def cursor(values):
+            payload = json.dumps({"v": values, "r": 0}).encode()
+            return base64.urlsafe_b64encode(payload).decode()
+
+        for token in (
+            cursor(["x", "y"]),
+            cursor(["2024-01-01T00:00:00+00:00", "y"]),
+            cursor([{"a": 1}, 1]),
+            cursor(["2024-01-01T00:00:00+00:00"]),
+            cursor("2024"),
+            "not-a-cursor",
+        ):
+            with self.subTest(token=token):
+                response = self.client.get("/api/v1/jobs/", {"cursor": token})
+                self.assertEqual(response.status_code, 404)
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=300)
+class ResponseCacheTests(TestCase):
+    """Cached reads are retired by the writes they depend on."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        cls.category = JobCategory.objects.create(name="Information Technology")
+        cls.job = JobListing.objects.create(
+            employer=cls.employer,
+            title="Python Developer",
+            description="Description",
+            requirements="Requirements",
+            location="Dhaka",
+            category=cls.category,
+        )
+
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+
+    def get(self, url, expected):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], expected)
+        return response.data
+
+    def test_listing_edit_retires_the_cached_list_and_detail(self):
+        list_url, detail_url = "/api/v1/jobs/", f"/api/v1/jobs/{self.job.pk}/"
+        self.get(list_url, "MISS")
+        self.get(detail_url, "MISS")
+        cached = self.get(list_url, "HIT")
+        self.assertEqual(cached["results"][0]["title"], "Python Developer")
+        self.get(detail_url, "HIT")
+
+        token = CustomTokenObtainPairSerializer.get_token(self.employer).access_token
+        writer = APIClient()
+        writer.credentials(HTTP_AUTHORIZATION=f"JWT {token}")
+        response = writer.patch(
+            detail_url, {"title": "Django Developer"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        fresh = self.get(list_url, "MISS")
+        self.assertEqual(fresh["results"][0]["title"], "Django Developer")
+        self.assertEqual(self.get(detail_url, "MISS")["title"], "Django Developer")
+        self.get(list_url, "HIT")
+
+    def test_new_application_retires_the_cached_count(self):
+        url = f"/api/v1/jobs/{self.job.pk}/"
+        self.assertEqual(self.get(url, "MISS")["application_count"], 0)
+        JobApplication.objects.create(
+            job=self.job,
+            applicant=User.objects.create_user(
+                email="seeker@example.com", password="pass", user_type="job_seeker"
+            ),
+            resume="resumes/cv.pdf",
+        )
+        self.assertEqual(self.get(url, "MISS")["application_count"], 1)
+
+    def test_category_change_retires_the_cached_categories(self):
+        self.get("/api/v1/categories/", "MISS")
+        self.get("/api/v1/categories/", "HIT")
+        self.category.name = "Software"
+        self.category.save()
+        data = self.get("/api/v1/categories/", "MISS")
+        self.assertEqual(
+            [category["name"] for category in data["results"]], ["Software"]
+        )
+
+    def test_bulk_expiry_retires_the_cached_list(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from jobs.expiry import expire_listings
+
+        self.get("/api/v1/jobs/", "MISS")
+        JobListing.objects.filter(pk=self.job.pk).update(
+            deadline=timezone.localdate() - timedelta(days=1)
+        )
+        # QuerySet.update sends no signals; the sweeper bumps the version itself
+        expire_listings()
+        self.assertEqual(self.get("/api/v1/jobs/", "MISS")["count"], 0)
+
+
+class BenchmarkHelperTests(TestCase):
+    def test_percentiles_and_summary(self):
+        samples = list(range(100, 0, -1))
+        self.assertEqual(percentile(samples, 0.5), 50)
+        self.assertEqual(percentile(samples, 0.95), 95)
+        self.assertEqual(percentile(samples, 0.99), 99)
+        self.assertEqual(percentile(samples, 0.07), 7)
+        self.assertEqual(percentile(samples, 1.0), 100)
+        self.assertEqual(percentile([3], 0.5), 3)
+        summary = summarize([0.2, 0.1, 0.3, 0.4])
+        self.assertEqual(summary["requests"], 4)
+        self.assertEqual(summary["per_second"], 4.0)
+        self.assertEqual(summary["p50_ms"], 200.0)
+        self.assertEqual(summary["p99_ms"], 400.0)
+
+    def test_route_names(self):
+        names = route_names()
+        self.assertIn("jobs-list", names)
+        self.assertIn("dashboard", names)
+        self.assertEqual(names, sorted(names))
+
+
+class DataAndBenchmarkCommandTests(TransactionTestCase):
+    """generate_data builds a consistent dataset the benchmarks can run against."""
+
+    # Keep the gazetteer places loaded by migration 0013 between tests
+    serialized_rollback = True
+
+    def call(self, *args):
+        stdout = io.StringIO()
+        call_command(*args, stdout=stdout)
+        return stdout.getvalue()
+
+    def generate(self, *args):
+        return self.call("generate_data", "--scale", "0.01", "--batch-size", "7", *args)
+
+    def test_generate_data(self):
+        self.assertIn("Generated", self.generate())
+        self.assertEqual(User.objects.filter(user_type="employer").count(), 1)
+        self.assertEqual(User.objects.filter(user_type="job_seeker").count(), 10)
+        self.assertEqual(JobListing.objects.count(), 20)
+        self.assertTrue(JobApplication.objects.exists())
+        # application_count is written with the listings, not by signals
+        mismatched = JobListing.objects.annotate(
+            applications_total=Count("applications")
+        ).exclude(application_count=F("applications_total"))
+        self.assertFalse(mismatched.exists())
+
+        with self.assertRaises(CommandError):
+            self.generate()
+        self.assertIn("Deleted", self.generate("--clear"))
+        self.assertEqual(JobListing.objects.count(), 20)
+
+    def test_benchmarks_need_data(self):
+        with self.assertRaises(CommandError):
+            self.call("benchmark_asgi", "--requests", "1")
+
+    def test_benchmark_api_reports_each_route(self):
+        self.generate()
+        before = JobApplication.objects.count()
+        # The test runner has already set up the test environment
+        with mock.patch(
+            "api.management.commands.benchmark_api.setup_test_environment"
+        ), mock.patch("api.management.commands.benchmark_api.teardown_test_environment"):
+            report = json.loads(
+                self.call("benchmark_api", "--requests", "2", "--warmup", "0")
+            )
+        self.assertEqual(report["dataset"]["jobs.JobListing"], 20)
+        names = {route["name"] for route in report["routes"]}
+        self.assertIn("jobs-list", names)
+        self.assertNotIn("jobs-list", report["not_benchmarked"])
+        for route in report["routes"]:
+            self.assertEqual(route["requests"], 2)
+            self.assertIn("p95_ms", route)
+        # Writes made by the run are rolled back
+        self.assertEqual(JobApplication.objects.count(), before)
+
+    def test_benchmark_asgi_compares_both_handlers(self):
+        self.generate()
+        report = json.loads(
+            self.call(
+                "benchmark_asgi",
+                "--requests", "2",
+                "--concurrency", "1",
+                "--warmup", "0",
+                "--route", "jobs-detail",
+            )
+        )
+        [route] = report["routes"]
+        self.assertEqual(route["label"], "jobs-detail")
+        self.assertEqual(route["wsgi"]["requests"], 2)
+        self.assertEqual(route["asgi"]["requests"], 2)
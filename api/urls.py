@@ -1,4 +1,4 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_nested import routers as nested_routers
 from rest_framework_simplejwt.views import TokenRefreshView
@@ -10,8 +10,10 @@ from jobs.views import (
     JobCategoryViewSet,
     EmployerReviewViewSet,
     ResumeViewSet,
+    SavedSearchViewSet,
     DashboardView,
 )
+from jobs import async_views
 
 # Import account-related views
 from accounts.views import (
@@ -31,6 +33,7 @@ router.register("jobs", JobListingViewSet, basename="jobs")
 router.register("categories", JobCategoryViewSet, basename="categories")
 router.register("applications", JobApplicationViewSet, basename="applications")
 router.register("resumes", ResumeViewSet, basename="resumes")
+router.register("saved-searches", SavedSearchViewSet, basename="saved-searches")
 router.register("profiles", UserProfileViewSet, basename="profiles")
 router.register("reviews", EmployerReviewViewSet, basename="reviews")
 
@@ -57,3 +60,18 @@ urlpatterns = [
     path("auth/", include("djoser.urls")),
     path("auth/", include("djoser.urls.jwt")),
 ]
+
+# Native async versions of the hottest read routes, with the same URLs and
+# names as the routes above; career_connect.async_urls mounts them in front
+# for ASGI deployments.
+async_urlpatterns = [
+    re_path(r"^jobs/$", async_views.job_list, name="jobs-list"),
+    re_path(r"^jobs/(?P<pk>[^/.]+)/$", async_views.job_detail, name="jobs-detail"),
+    re_path(r"^categories/$", async_views.category_list, name="categories-list"),
+    re_path(
+        r"^categories/(?P<pk>[^/.]+)/$",
+        async_views.category_detail,
+        name="categories-detail",
+    ),
+    path("dashboard/", async_views.dashboard, name="dashboard"),
+]
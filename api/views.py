@@ -1,3 +1,20 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
 
-# Create your views here.
+from . import metrics
+
+
+def metrics_view(request):
+    """Per-route performance metrics of every worker, in the Prometheus text format."""
+    if not settings.METRICS_TOKEN and not settings.DEBUG:
+        # Route names, query counts and latencies are not for the public
+        return HttpResponseForbidden("Set METRICS_TOKEN to serve metrics.")
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not constant_time_compare(request.headers.get("Authorization", ""), expected):
+            return HttpResponseForbidden()
+    return HttpResponse(
+        metrics.render(metrics.collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
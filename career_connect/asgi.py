@@ -1,7 +1,14 @@
 """
-ASGI config for phi_mart project.
+ASGI config for career_connect project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with any ASGI server, for example::
+
+    gunicorn career_connect.asgi:application -k uvicorn.workers.UvicornWorker
+
+Under ASGI the job list/detail, category and dashboard endpoints are answered
+by native async views (``ASYNC_READ_VIEWS``, on by default here), so a worker
+keeps handling other requests while their queries run.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -12,5 +19,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "career_connect.settings")
+os.environ.setdefault("ASYNC_READ_VIEWS", "True")
 
 application = get_asgi_application()
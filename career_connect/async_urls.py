@@ -0,0 +1,16 @@
+"""
+URLconf for ASGI deployments (``ASYNC_READ_VIEWS``).
+
+The hottest read endpoints are answered by native async views
+(``api.urls.async_urlpatterns``); every other URL falls through to the regular
+URLconf, so URL names and reversing are unchanged.
+"""
+
+from django.urls import include, path
+
+from api.urls import async_urlpatterns
+
+urlpatterns = [
+    path("api/v1/", include(async_urlpatterns)),
+    path("", include("career_connect.urls")),
+]
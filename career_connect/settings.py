@@ -54,18 +54,18 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt.token_blacklist",
     "djoser",
     "corsheaders",
-    "debug_toolbar",
     # Local apps
     "api",
     "accounts",
     "jobs",
+    "notifications",
 ]
 
 MIDDLEWARE = [
+    "api.middleware.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "api.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -74,7 +74,18 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "career_connect.urls"
+# The debug toolbar is a development aid only; production uses /metrics instead
+DEBUG_TOOLBAR = config("DEBUG_TOOLBAR", default=DEBUG, cast=bool)
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(2, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
+# Serve the hottest read endpoints with native async views. career_connect/asgi.py
+# turns this on; under WSGI each async view would need an event loop of its own
+ASYNC_READ_VIEWS = config("ASYNC_READ_VIEWS", default=False, cast=bool)
+ROOT_URLCONF = (
+    "career_connect.async_urls" if ASYNC_READ_VIEWS else "career_connect.urls"
+)
 
 TEMPLATES = [
     {
@@ -139,6 +150,32 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing profile. The preferred hasher comes first; the others stay
+# listed so existing hashes still verify and are re-hashed on the next login.
+# argon2 needs argon2-cffi and bcrypt needs bcrypt installed.
+PASSWORD_HASHER_PROFILES = {
+    "pbkdf2": "accounts.hashers.ConfigurablePBKDF2PasswordHasher",
+    "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "bcrypt": "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+}
+PASSWORD_HASHER = config("PASSWORD_HASHER", default="pbkdf2")
+PBKDF2_ITERATIONS = config("PBKDF2_ITERATIONS", default=0, cast=int)  # 0 = Django default
+# Django's remaining default hashers go last, so hashes made before the
+# profiles (pbkdf2_sha1) still verify. The stock PBKDF2 hasher is not listed:
+# it shares its algorithm name with the configurable one and would replace it.
+LEGACY_PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+PASSWORD_HASHERS = (
+    [PASSWORD_HASHER_PROFILES[PASSWORD_HASHER]]
+    + [
+        hasher
+        for profile, hasher in PASSWORD_HASHER_PROFILES.items()
+        if profile != PASSWORD_HASHER
+    ]
+    + LEGACY_PASSWORD_HASHERS
+)
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -178,10 +215,28 @@ cloudinary.config(
 # This is critical for serverless deployments (Vercel) where filesystem is read-only
 DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
 
+# Hash uploaded files while they are received, so media storage can skip
+# re-uploading content it already holds
+FILE_UPLOAD_HANDLERS = [
+    "career_connect.storage.HashingMemoryFileUploadHandler",
+    "career_connect.storage.HashingTemporaryFileUploadHandler",
+]
+
+# Direct-to-storage uploads: the API signs a short-lived ticket, the client sends
+# the file straight to storage and then confirms it. LocalUploadBackend is a
+# filesystem stand-in for tests and local development.
+DIRECT_UPLOAD_BACKEND = config(
+    "DIRECT_UPLOAD_BACKEND", default="career_connect.uploads.CloudinaryUploadBackend"
+)
+UPLOAD_TICKET_MAX_AGE = config("UPLOAD_TICKET_MAX_AGE", default=900, cast=int)
+
 # Media URL and ROOT
 # Even though we use Cloudinary, we need to set MEDIA_ROOT for compatibility
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+DIRECT_UPLOAD_LOCAL_ROOT = config(
+    "DIRECT_UPLOAD_LOCAL_ROOT", default=str(MEDIA_ROOT / "direct-uploads")
+)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -191,7 +246,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "COERCE_DECIMAL_TO_STRING": False,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -228,6 +283,67 @@ DJOSER = {
     },
 }
 
+# Cache backend: locmem by default; point it at a file-based or shared cache, e.g.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# CACHE_LOCATION=redis://127.0.0.1:6379/1
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="career-connect"),
+    }
+}
+
+# Versioned response cache for public read endpoints (0 disables it). Writes
+# retire cached responses by bumping versions in this cache, which only reach
+# other workers and management commands through a shared backend, so it is off
+# by default with a process-local one.
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = config(
+    "RESPONSE_CACHE_TIMEOUT",
+    default=(
+        0
+        if CACHES["default"]["BACKEND"].endswith(("LocMemCache", "DummyCache"))
+        else 300
+    ),
+    cast=int,
+)
+
+# Bulk job listing import/export
+JOB_IMPORT_BATCH_SIZE = config("JOB_IMPORT_BATCH_SIZE", default=500, cast=int)
+JOB_IMPORT_MAX_ROWS = config("JOB_IMPORT_MAX_ROWS", default=10000, cast=int)
+JOB_EXPORT_CHUNK_SIZE = config("JOB_EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# Applications one bulk status request may change
+BULK_STATUS_MAX_APPLICATIONS = config(
+    "BULK_STATUS_MAX_APPLICATIONS", default=1000, cast=int
+)
+
+# Seconds between checks for a new recommendation index (build_job_index) when
+# the cache is process-local; with a shared cache its version bump is used
+JOB_INDEX_CHECK_INTERVAL = config("JOB_INDEX_CHECK_INTERVAL", default=30, cast=float)
+
+# Past-deadline listings deactivated per transaction by `manage.py expire_listings`
+JOB_EXPIRY_BATCH_SIZE = config("JOB_EXPIRY_BATCH_SIZE", default=500, cast=int)
+
+# Saved job searches; matches are emailed by `python manage.py send_search_digests`
+SAVED_SEARCH_MAX_PER_USER = config("SAVED_SEARCH_MAX_PER_USER", default=20, cast=int)
+SAVED_SEARCH_DIGEST_LIMIT = config("SAVED_SEARCH_DIGEST_LIMIT", default=10, cast=int)
+
+# Per-user dashboard snapshot cache in seconds (0 disables it)
+DASHBOARD_CACHE_TIMEOUT = config("DASHBOARD_CACHE_TIMEOUT", default=0, cast=int)
+
+# Per-route performance metrics, served in the Prometheus text format at
+# METRICS_PATH. Set METRICS_DIR to a directory shared by all gunicorn workers so
+# each scrape reports the combined totals. METRICS_TOKEN requires a bearer token;
+# without one the endpoint only answers when DEBUG is on.
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+METRICS_PATH = "/metrics"
+METRICS_DIR = config("METRICS_DIR", default="")
+METRICS_FLUSH_INTERVAL = config("METRICS_FLUSH_INTERVAL", default=5, cast=float)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
 # Email Configuration
 EMAIL_BACKEND = config("EMAIL_BACKEND", default="django.core.mail.backends.console.EmailBackend")
 EMAIL_HOST = config("EMAIL_HOST", default="smtp.gmail.com")
@@ -238,6 +354,22 @@ EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
 DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="noreply@careerconnect.com")
 FRONTEND_URL = config("FRONTEND_URL", default="http://localhost:3000")
 
+# Email outbox (drained by `python manage.py send_outbox`)
+OUTBOX_BATCH_SIZE = config("OUTBOX_BATCH_SIZE", default=100, cast=int)
+OUTBOX_MAX_ATTEMPTS = config("OUTBOX_MAX_ATTEMPTS", default=5, cast=int)
+OUTBOX_RETRY_BASE_SECONDS = config("OUTBOX_RETRY_BASE_SECONDS", default=60, cast=int)
+OUTBOX_LEASE_SECONDS = config("OUTBOX_LEASE_SECONDS", default=300, cast=int)
+
+# Resume text extraction (run by `python manage.py extract_resumes`)
+RESUME_TEXT_BATCH_SIZE = config("RESUME_TEXT_BATCH_SIZE", default=20, cast=int)
+RESUME_TEXT_WORKERS = config("RESUME_TEXT_WORKERS", default=2, cast=int)
+RESUME_TEXT_FETCH_THREADS = config("RESUME_TEXT_FETCH_THREADS", default=4, cast=int)
+RESUME_TEXT_MAX_ATTEMPTS = config("RESUME_TEXT_MAX_ATTEMPTS", default=3, cast=int)
+RESUME_TEXT_RETRY_BASE_SECONDS = config(
+    "RESUME_TEXT_RETRY_BASE_SECONDS", default=60, cast=int
+)
+RESUME_TEXT_LEASE_SECONDS = config("RESUME_TEXT_LEASE_SECONDS", default=300, cast=int)
+
 # CORS Configuration
 # Allow both local development and production frontends
 CORS_ALLOWED_ORIGINS = config(
@@ -1,12 +1,104 @@
 """
 Custom storage backends for CareerConnect.
 This ensures proper file handling in serverless environments like Vercel.
+
+Media uploads are deduplicated by content: the upload handlers below hash each
+file while Django receives it, and CloudinaryMediaStorage keeps a hash -> object
+index (``api.models.StoredFile``) so identical content is uploaded only once.
 """
 
+import hashlib
+import logging
 import os
 from django.conf import settings
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+from django.db import IntegrityError, transaction
+from django.db.models import F
 from cloudinary_storage.storage import MediaCloudinaryStorage
 
+logger = logging.getLogger(__name__)
+
+# Cloudinary only accepts PDFs among documents as images; the rest are stored as
+# raw files, whose public ids keep their extension
+RAW_EXTENSIONS = (".doc", ".docx", ".odt", ".rtf", ".txt")
+
+
+def resource_type_for(name):
+    """The Cloudinary resource type of a file or public id called ``name``."""
+    return "raw" if name.lower().endswith(RAW_EXTENSIONS) else "image"
+
+
+class HashingUploadHandlerMixin:
+    """Compute a SHA-256 of each uploaded file while its chunks are received."""
+
+    def new_file(self, *args, **kwargs):
+        self.hasher = hashlib.sha256()
+        return super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.content_hash = self.hasher.hexdigest()
+        return uploaded
+
+
+class HashingMemoryFileUploadHandler(HashingUploadHandlerMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(
+    HashingUploadHandlerMixin, TemporaryFileUploadHandler
+):
+    pass
+
+
+def content_hash(content):
+    """SHA-256 of ``content``, reusing the digest taken during the upload."""
+    digest = getattr(content, "content_hash", None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():
+        hasher.update(chunk)
+    content.seek(0)
+    return hasher.hexdigest()
+
+
+def retain(name):
+    """Count one more saved file pointing at the stored object ``name``."""
+    from api.models import StoredFile
+
+    return StoredFile.objects.filter(name=name).update(ref_count=F("ref_count") + 1) > 0
+
+
+def release(name):
+    """
+    Drop one reference to the stored object ``name``.
+
+    Returns True when it was the last reference, so the object itself can be
+    deleted. Objects missing from the index are never reported as unreferenced.
+    """
+    from api.models import StoredFile
+
+    with transaction.atomic():
+        stored = StoredFile.objects.select_for_update().filter(name=name).first()
+        if stored is None:
+            return False
+        if stored.ref_count > 1:
+            StoredFile.objects.filter(pk=stored.pk).update(
+                ref_count=F("ref_count") - 1
+            )
+            return False
+        stored.delete()
+        return True
+
 
 class CloudinaryMediaStorage(MediaCloudinaryStorage):
     """
@@ -19,6 +111,63 @@ class CloudinaryMediaStorage(MediaCloudinaryStorage):
     def __init__(self, *args, **kwargs):
         # Initialize parent class which handles Cloudinary configuration
         super().__init__(*args, **kwargs)
+
+    def _get_resource_type(self, name):
+        return resource_type_for(name)
+
+    def _save(self, name, content):
+        """
+        Upload ``content`` unless identical content is already stored, in which
+        case the existing object gains a reference and its name is returned.
+        """
+        from api.models import StoredFile
+
+        digest = content_hash(content)
+        with transaction.atomic():
+            stored = (
+                StoredFile.objects.select_for_update()
+                .filter(content_hash=digest)
+                .first()
+            )
+            if stored is not None:
+                StoredFile.objects.filter(pk=stored.pk).update(
+                    ref_count=F("ref_count") + 1
+                )
+                return stored.name
+
+        name = super()._save(name, content)
+        try:
+            with transaction.atomic():
+                StoredFile.objects.create(
+                    content_hash=digest, name=name, size=content.size
+                )
+        except IntegrityError:
+            stored = StoredFile.objects.filter(content_hash=digest).first()
+            if stored is not None:
+                # A concurrent upload of the same content won; use its object
+                retain(stored.name)
+                super().delete(name)
+                return stored.name
+            # The backend reused an indexed name, so the object now holds this
+            # content; keep the upload and re-point the index entry at it
+            logger.warning(f"Upload replaced the stored object {name}")
+            StoredFile.objects.filter(name=name).update(
+                content_hash=digest,
+                size=content.size,
+                ref_count=F("ref_count") + 1,
+            )
+        return name
+
+    def delete(self, name):
+        """
+        Drop one reference; the remote object is deleted with the last one.
+        Objects that predate the index are deleted directly.
+        """
+        from api.models import StoredFile
+
+        if release(name) or not StoredFile.objects.filter(name=name).exists():
+            return super().delete(name)
+        return False
     
     def path(self, name):
         """
@@ -35,12 +184,25 @@ class CloudinaryMediaStorage(MediaCloudinaryStorage):
         # Return the name as-is, Cloudinary will handle duplicates
         return name
     
+    def release_reference(self, name):
+        """
+        Drop one saved file's reference to ``name`` once the transaction commits
+        the removal. Unlike ``delete``, objects missing from the index are kept,
+        since other rows may still point at them.
+        """
+        if name and release(name):
+            transaction.on_commit(
+                lambda: super(CloudinaryMediaStorage, self).delete(name)
+            )
+
     def exists(self, name):
         """
-        Override to prevent filesystem checks.
-        Always return False to force upload to Cloudinary.
+        Override to prevent filesystem and remote checks.
+        Only objects recorded in the content index are known to exist.
         """
-        return False
+        from api.models import StoredFile
+
+        return StoredFile.objects.filter(name=name).exists()
     
     def listdir(self, path):
         """
@@ -0,0 +1,174 @@
+"""
+Direct-to-storage uploads.
+
+Instead of streaming a file through a Django worker, the API issues a
+short-lived signed upload ticket, the client sends the file straight to object
+storage using the ticket's upload instructions, and then confirms the upload
+with the receipt the storage service returned. ``DIRECT_UPLOAD_BACKEND``
+selects the storage service; ``LocalUploadBackend`` stands in for it in tests
+and local development.
+"""
+
+import os
+import posixpath
+import time
+import uuid
+from pathlib import Path
+
+import cloudinary
+from cloudinary.utils import (
+    api_sign_request,
+    cloudinary_api_url,
+    verify_api_response_signature,
+)
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from django.utils.module_loading import import_string
+from django.utils.text import get_valid_filename
+
+from .storage import resource_type_for
+
+TICKET_SALT = "career_connect.uploads.ticket"
+LOCAL_UPLOAD_SALT = "career_connect.uploads.local"
+
+
+class UploadError(Exception):
+    """A ticket or storage receipt could not be accepted."""
+
+
+def get_upload_backend():
+    return import_string(settings.DIRECT_UPLOAD_BACKEND)()
+
+
+def issue_ticket(user, field, filename):
+    """
+    Reserve a storage name for ``filename`` in the model file ``field``.
+
+    Returns ``(ticket, upload)`` where ``ticket`` is the opaque token the client
+    sends back on confirmation and ``upload`` tells it where and how to send
+    the file.
+    """
+    stem, extension = os.path.splitext(get_valid_filename(os.path.basename(filename)))
+    # A random suffix keeps tickets from ever pointing at an existing object
+    name = field.generate_filename(None, f"{stem[:80]}-{uuid.uuid4().hex[:12]}{extension}")
+    backend = get_upload_backend()
+    key = backend.key_for(name)
+    ticket = signing.dumps({"user": user.pk, "key": key}, salt=TICKET_SALT)
+    return ticket, backend.instructions(key)
+
+
+def redeem_ticket(user, ticket, receipt):
+    """Check ``ticket`` and the storage ``receipt``; return the stored file name."""
+    try:
+        data = signing.loads(
+            ticket, salt=TICKET_SALT, max_age=settings.UPLOAD_TICKET_MAX_AGE
+        )
+    except signing.SignatureExpired:
+        raise UploadError("Upload ticket has expired.")
+    except signing.BadSignature:
+        raise UploadError("Invalid upload ticket.")
+    if data["user"] != user.pk:
+        raise UploadError("Invalid upload ticket.")
+
+    get_upload_backend().verify(data["key"], receipt or {})
+    return data["key"]
+
+
+class CloudinaryUploadBackend:
+    """Signed direct uploads to Cloudinary, matching MediaCloudinaryStorage's names."""
+
+    def key_for(self, name):
+        from cloudinary_storage import app_settings
+
+        # MediaCloudinaryStorage stores public ids prefixed; images drop their
+        # extension, raw files keep it
+        prefix = app_settings.PREFIX.lstrip("/")
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        if resource_type_for(name) == "raw":
+            return prefix + name
+        return prefix + posixpath.splitext(name)[0]
+
+    def instructions(self, key):
+        from cloudinary_storage import app_settings
+
+        config = cloudinary.config()
+        params = {
+            "public_id": key,
+            "tags": app_settings.MEDIA_TAG,
+            "timestamp": int(time.time()),
+        }
+        return {
+            "method": "POST",
+            "url": cloudinary_api_url("upload", resource_type=resource_type_for(key)),
+            "file_field": "file",
+            "fields": {
+                **params,
+                "api_key": config.api_key,
+                "signature": api_sign_request(params, config.api_secret),
+            },
+        }
+
+    def verify(self, key, receipt):
+        # Cloudinary signs public_id and version in every upload response
+        if receipt.get("public_id") != key or not verify_api_response_signature(
+            key, receipt.get("version"), receipt.get("signature")
+        ):
+            raise UploadError("The storage receipt does not match this upload ticket.")
+
+
+class LocalUploadBackend:
+    """Filesystem stand-in for the storage service, served by ``local_upload_view``."""
+
+    def __init__(self):
+        self.root = Path(settings.DIRECT_UPLOAD_LOCAL_ROOT)
+
+    def key_for(self, name):
+        return name
+
+    def instructions(self, key):
+        return {
+            "method": "POST",
+            "url": reverse("local-upload"),
+            "file_field": "file",
+            "fields": {
+                "key": key,
+                "signature": signing.dumps(key, salt=LOCAL_UPLOAD_SALT),
+            },
+        }
+
+    def receive(self, fields, upload):
+        """Store an uploaded file like the storage service would; return the receipt."""
+        try:
+            key = signing.loads(
+                fields.get("signature", ""),
+                salt=LOCAL_UPLOAD_SALT,
+                max_age=settings.UPLOAD_TICKET_MAX_AGE,
+            )
+        except signing.BadSignature:
+            raise UploadError("Invalid upload signature.")
+        if key != fields.get("key"):
+            raise UploadError("Invalid upload signature.")
+
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as destination:
+            for chunk in upload.chunks():
+                destination.write(chunk)
+        receipt = {"key": key, "size": path.stat().st_size}
+        return {**receipt, "signature": signing.dumps(receipt, salt=LOCAL_UPLOAD_SALT)}
+
+    def verify(self, key, receipt):
+        try:
+            signed = signing.loads(receipt.get("signature", ""), salt=LOCAL_UPLOAD_SALT)
+        except signing.BadSignature:
+            signed = None
+        if not signed or signed.get("key") != key or not self.path(key).exists():
+            raise UploadError("The storage receipt does not match this upload ticket.")
+
+    def path(self, key):
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise UploadError("Invalid upload key.")
+        return path
@@ -5,8 +5,8 @@ from django.conf import settings
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
-from debug_toolbar.toolbar import debug_toolbar_urls
-from .views import api_root_view
+from api.views import metrics_view
+from .views import api_root_view, local_upload_view
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -31,6 +31,13 @@ urlpatterns = [
         name="schema-swagger-ui",
     ),
     path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
-] + debug_toolbar_urls()
+    path(settings.METRICS_PATH.lstrip("/"), metrics_view, name="metrics"),
+    path("uploads/local/", local_upload_view, name="local-upload"),
+]
+
+if settings.DEBUG_TOOLBAR:
+    from debug_toolbar.toolbar import debug_toolbar_urls
+
+    urlpatterns += debug_toolbar_urls()
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,6 +1,28 @@
+from django.http import Http404, JsonResponse
 from django.shortcuts import redirect
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .uploads import LocalUploadBackend, UploadError, get_upload_backend
 
 
 def api_root_view(request):
     """Redirect to the API root endpoint."""
     return redirect("api-root")
+
+
+@csrf_exempt
+@require_POST
+def local_upload_view(request):
+    """Receive a direct upload for LocalUploadBackend, as the storage service would."""
+    backend = get_upload_backend()
+    if not isinstance(backend, LocalUploadBackend):
+        raise Http404
+    upload = request.FILES.get("file")
+    if upload is None:
+        return JsonResponse({"error": "No file was uploaded."}, status=400)
+    try:
+        receipt = backend.receive(request.POST, upload)
+    except UploadError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse(receipt, status=201)
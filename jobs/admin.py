@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import JobCategory, JobListing, JobApplication, Resume, EmployerReview
+from .models import (
+    JobCategory,
+    JobListing,
+    JobApplication,
+    Resume,
+    EmployerReview,
+    EmployerRatingSummary,
+)
 
 
 @admin.register(JobCategory)
@@ -50,3 +57,11 @@ class EmployerReviewAdmin(admin.ModelAdmin):
     list_filter = ("rating", "created_at")
     search_fields = ("employer__email", "employer__company_name", "reviewer__email")
     date_hierarchy = "created_at"
+
+
+@admin.register(EmployerRatingSummary)
+class EmployerRatingSummaryAdmin(admin.ModelAdmin):
+    list_display = ("employer", "review_count", "average")
+    search_fields = ("employer__email", "employer__company_name")
+    # Maintained by jobs.signals
+    readonly_fields = [field.name for field in EmployerRatingSummary._meta.fields]
@@ -0,0 +1,48 @@
+"""
+Async views for the hottest read endpoints, mounted by career_connect.async_urls.
+
+They return the same payloads as the routes they shadow (see api.async_views).
+"""
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.async_views import (
+    LIST_ACTIONS,
+    async_detail_view,
+    async_list_view,
+    async_read_view,
+    cached,
+    list_objects,
+)
+from .dashboard import aget_dashboard
+from .facets import aget_facets, wants_facets
+from .views import DashboardView, JobCategoryViewSet, JobListingViewSet
+
+job_detail = async_detail_view(JobListingViewSet, "jobs")
+category_list = async_list_view(JobCategoryViewSet, "categories")
+category_detail = async_detail_view(JobCategoryViewSet, "categories")
+
+
+async def job_list_handler(view):
+    response = await cached(view, list_objects)
+    if wants_facets(view.request) and response.status_code == status.HTTP_200_OK:
+        response.data["facets"] = await aget_facets(view)
+    return response
+
+
+job_list = async_read_view(
+    JobListingViewSet, job_list_handler, LIST_ACTIONS, basename="jobs", detail=False
+)
+
+
+async def dashboard_handler(view):
+    data = await aget_dashboard(view.request.user)
+    if data is None:
+        return Response(
+            {"error": "Invalid user type."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response(data)
+
+
+dashboard = async_read_view(DashboardView, dashboard_handler)
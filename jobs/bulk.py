@@ -0,0 +1,238 @@
+"""
+Bulk import and streaming export of job listings (CSV or NDJSON), and bulk
+application status changes.
+
+Imports are read row by row from the uploaded file, validated, and written with
+``bulk_create`` in batches. Exports stream rows from a server-side iterator, so
+neither direction holds the whole catalogue in memory. Status changes check
+ownership of the whole set in one query and write one UPDATE per target status.
+"""
+
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from api.cache import bump_version
+from notifications.outbox import queue_emails
+from .dashboard import invalidate_dashboard
+from .geo import place_ids_for
+from .models import JobApplication, JobCategory, JobListing
+from .saved_searches import match_listings
+from .serializers import JobListingImportSerializer
+
+FILE_FORMATS = ("csv", "ndjson")
+
+# Column name -> ORM lookup; columns match JobListingSerializer field names
+EXPORT_COLUMNS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "requirements": "requirements",
+    "location": "location",
+    "category": "category",
+    "category_name": "category__name",
+    "employment_type": "employment_type",
+    "salary_min": "salary_min",
+    "salary_max": "salary_max",
+    "is_active": "is_active",
+    "deadline": "deadline",
+    "created_at": "created_at",
+    "application_count": "application_count",
+}
+
+
+def detect_format(uploaded_file, requested=None):
+    """Pick the file format from the request, else from the file name."""
+    if requested:
+        return requested if requested in FILE_FORMATS else None
+    name = (uploaded_file.name or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+def read_rows(uploaded_file, file_format):
+    """Yield ``(row_number, row)`` pairs; malformed NDJSON lines yield an error string."""
+    text = io.TextIOWrapper(uploaded_file.file, encoding="utf-8-sig", newline="")
+    if file_format == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            yield number, row
+        return
+
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(row, dict):
+            row = "Each line must be a JSON object."
+        yield number, row
+
+
+def import_listings(employer, uploaded_file, file_format):
+    """
+    Validate and insert every row of ``uploaded_file`` as a listing owned by
+    ``employer``. Valid rows are written even when others fail.
+
+    Returns ``(created, errors)`` where errors is a list of
+    ``{"row": n, "errors": ...}`` entries.
+    """
+    batch_size = settings.JOB_IMPORT_BATCH_SIZE
+    max_rows = settings.JOB_IMPORT_MAX_ROWS
+    context = {"categories": JobCategory.objects.in_bulk()}
+    created = 0
+    errors = []
+    batch = []
+
+    def flush():
+        nonlocal created
+        with transaction.atomic():
+            # bulk_create skips the signals that resolve places and match saved searches
+            place_ids = place_ids_for(listing.location for listing in batch)
+            for listing in batch:
+                listing.place_id = place_ids[listing.location]
+            JobListing.objects.bulk_create(batch, batch_size=batch_size)
+            match_listings(batch)
+        created += len(batch)
+        batch.clear()
+
+    for number, row in read_rows(uploaded_file, file_format):
+        if number > max_rows:
+            errors.append(
+                {"row": number, "errors": f"Import is limited to {max_rows} rows."}
+            )
+            break
+        if isinstance(row, str):
+            errors.append({"row": number, "errors": row})
+            continue
+
+        # Blank CSV cells mean "not provided", not an empty value
+        data = {
+            key: value for key, value in row.items() if key and value not in ("", None)
+        }
+        serializer = JobListingImportSerializer(data=data, context=context)
+        if not serializer.is_valid():
+            errors.append({"row": number, "errors": serializer.errors})
+            continue
+
+        batch.append(JobListing(employer=employer, **serializer.validated_data))
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    if created:
+        # bulk_create sends no post_save signals
+        bump_version("jobs.joblisting")
+        invalidate_dashboard(employer.pk)
+    return created, errors
+
+
+class Echo:
+    """File-like object that returns what is written, for streaming csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, file_format):
+    """Yield the encoded rows of ``queryset`` in ``file_format``."""
+    rows = (
+        queryset.order_by("id")
+        .values_list(*EXPORT_COLUMNS.values())
+        .iterator(chunk_size=settings.JOB_EXPORT_CHUNK_SIZE)
+    )
+    if file_format == "csv":
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORT_COLUMNS)
+        for row in rows:
+            yield writer.writerow(row)
+        return
+
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def update_application_statuses(employer, transitions):
+    """
+    Move applications to new statuses; ``transitions`` maps each target status
+    to application ids. Nothing changes unless ``employer`` owns every job.
+
+    Returns ``(summary, missing)``: the ``{"updated": {status: n}, "unchanged": n,
+    "notified": n}`` summary, or None with the sorted ids that are not the
+    employer's to change.
+    """
+    targets = {pk: target for target, pks in transitions.items() for pk in pks}
+    with transaction.atomic():
+        rows = (
+            JobApplication.objects.select_for_update(of=("self",))
+            .filter(pk__in=targets, job__employer=employer)
+            .values_list(
+                "pk",
+                "status",
+                "applicant_id",
+                "applicant__email",
+                "applicant__first_name",
+                "job__title",
+            )
+        )
+        rows = {row[0]: row for row in rows}
+        missing = sorted(set(targets) - set(rows))
+        if missing:
+            return None, missing
+
+        changed = {}
+        for pk, (_, current, *_) in rows.items():
+            if current != targets[pk]:
+                changed.setdefault(targets[pk], []).append(pk)
+
+        now = timezone.now()
+        for target, pks in changed.items():
+            JobApplication.objects.filter(pk__in=pks).update(
+                status=target, updated_at=now
+            )
+
+        # QuerySet.update sends no post_save signals, so notify here in one INSERT
+        labels = dict(JobApplication.STATUS_CHOICES)
+        notified = queue_emails(
+            status_change_email(rows[pk], labels[target])
+            for target, pks in changed.items()
+            for pk in pks
+        )
+
+    if changed:
+        invalidate_dashboard(
+            employer.pk,
+            *{rows[pk][2] for pks in changed.values() for pk in pks},
+        )
+    summary = {
+        "updated": {target: len(pks) for target, pks in changed.items()},
+        "unchanged": len(rows) - sum(len(pks) for pks in changed.values()),
+        "notified": len(notified),
+    }
+    return summary, []
+
+
+def status_change_email(row, label):
+    _, _, _, email, first_name, title = row
+    subject = f"Application Update: {title}"
+    message = f"""
+        Dear {first_name},
+        
+        The status of your application for the position of {title} is now: {label}.
+        
+        Best regards,
+        CareerConnect Team
+        """
+    return subject, message, email
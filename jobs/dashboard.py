@@ -0,0 +1,153 @@
+"""
+Dashboard data for employers and job seekers.
+
+Each user type gets its stats from one query that selects a separate COUNT
+subquery per relation and status, so no relation's rows multiply another's, and
+the recent lists are fetched with everything their serializers touch. The whole
+payload can optionally be cached per user (``DASHBOARD_CACHE_TIMEOUT``); the
+snapshot is dropped by jobs.signals whenever that user's jobs, applications or
+resumes change. ``aget_dashboard`` runs the same queries through the async ORM.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Func, IntegerField, Subquery
+
+from .models import JobListing, JobApplication, Resume
+from .serializers import JobListingSerializer, JobApplicationSerializer, ResumeSerializer
+
+
+def dashboard_cache_key(user_id):
+    return f"dashboard:{user_id}"
+
+
+def invalidate_dashboard(*user_ids):
+    """Drop the cached dashboard snapshot of each given user."""
+    if settings.DASHBOARD_CACHE_TIMEOUT:
+        cache.delete_many([dashboard_cache_key(user_id) for user_id in user_ids])
+
+
+def get_dashboard(user):
+    """Return the dashboard payload for ``user``, or None for unknown user types."""
+    if user.user_type not in DASHBOARD_QUERIES:
+        return None
+
+    timeout = settings.DASHBOARD_CACHE_TIMEOUT
+    if timeout:
+        data = cache.get(dashboard_cache_key(user.pk))
+        if data is not None:
+            return data
+
+    stats_queryset, lists = DASHBOARD_QUERIES[user.user_type](user)
+    data = build_dashboard(
+        user.user_type,
+        stats_queryset.get(),
+        {name: list(queryset) for name, (queryset, _) in lists.items()},
+        lists,
+    )
+    if timeout:
+        cache.set(dashboard_cache_key(user.pk), data, timeout)
+    return data
+
+
+async def aget_dashboard(user):
+    """``get_dashboard`` with async cache and ORM calls."""
+    if user.user_type not in DASHBOARD_QUERIES:
+        return None
+
+    timeout = settings.DASHBOARD_CACHE_TIMEOUT
+    if timeout:
+        data = await cache.aget(dashboard_cache_key(user.pk))
+        if data is not None:
+            return data
+
+    stats_queryset, lists = DASHBOARD_QUERIES[user.user_type](user)
+    rows = {}
+    for name, (queryset, _) in lists.items():
+        rows[name] = [row async for row in queryset]
+    data = build_dashboard(
+        user.user_type, await stats_queryset.aget(), rows, lists
+    )
+    if timeout:
+        await cache.aset(dashboard_cache_key(user.pk), data, timeout)
+    return data
+
+
+def build_dashboard(user_type, stats, rows, lists):
+    data = {"user_type": user_type, "stats": stats}
+    for name, (_, serializer_class) in lists.items():
+        data[name] = serializer_class(rows[name], many=True).data
+    return data
+
+
+def count_of(queryset):
+    """Scalar subquery counting the rows of ``queryset``."""
+    return Subquery(
+        queryset.order_by()
+        .annotate(count=Func(F("pk"), function="COUNT", output_field=IntegerField()))
+        .values("count")
+    )
+
+
+def stats_row(user, **counts):
+    """One-row queryset holding each ``count_of`` subquery as a column."""
+    return type(user).objects.filter(pk=user.pk).values(**counts)
+
+
+def employer_dashboard_queries(user):
+    """Return ``(stats_queryset, {name: (queryset, serializer)})``."""
+    jobs = JobListing.objects.filter(employer=user)
+    applications = JobApplication.objects.filter(job__employer=user)
+    stats = stats_row(
+        user,
+        total_jobs=count_of(jobs),
+        active_jobs=count_of(jobs.filter(is_active=True)),
+        total_applications=count_of(applications),
+        pending_applications=count_of(applications.filter(status="pending")),
+    )
+
+    recent_jobs = (
+        JobListing.objects.filter(employer=user)
+        .select_related("employer", "employer__rating_summary", "category")
+        .order_by("-created_at")[:5]
+    )
+    recent_applications = (
+        JobApplication.objects.filter(job__employer=user)
+        .select_related("job", "job__employer", "applicant")
+        .order_by("-applied_at")[:10]
+    )
+
+    return stats, {
+        "recent_jobs": (recent_jobs, JobListingSerializer),
+        "recent_applications": (recent_applications, JobApplicationSerializer),
+    }
+
+
+def job_seeker_dashboard_queries(user):
+    """Return ``(stats_queryset, {name: (queryset, serializer)})``."""
+    applications = JobApplication.objects.filter(applicant=user)
+    stats = stats_row(
+        user,
+        total_applications=count_of(applications),
+        pending_applications=count_of(applications.filter(status="pending")),
+        accepted_applications=count_of(applications.filter(status="accepted")),
+        total_resumes=count_of(Resume.objects.filter(user=user)),
+    )
+
+    recent_applications = (
+        JobApplication.objects.filter(applicant=user)
+        .select_related("job", "job__employer", "applicant")
+        .order_by("-applied_at")[:10]
+    )
+    resumes = Resume.objects.filter(user=user).order_by("-uploaded_at")[:5]
+
+    return stats, {
+        "recent_applications": (recent_applications, JobApplicationSerializer),
+        "resumes": (resumes, ResumeSerializer),
+    }
+
+
+DASHBOARD_QUERIES = {
+    "employer": employer_dashboard_queries,
+    "job_seeker": job_seeker_dashboard_queries,
+}
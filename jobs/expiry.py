@@ -0,0 +1,75 @@
+"""
+Expiry of job listings whose application deadline has passed.
+
+``manage.py expire_listings`` deactivates past-deadline listings in small
+batches, each in its own short transaction, so a large backlog never holds
+locks on the listing table for long. Public queries do not wait for it: they
+also filter on ``not_expired()``, a plain comparison of ``deadline`` with
+today's date that the partial deadline index can serve. A listing stays open
+through its deadline day.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.cache import bump_version
+from .dashboard import invalidate_dashboard
+from .models import JobListing
+
+logger = logging.getLogger(__name__)
+
+
+def not_expired(prefix="", today=None):
+    """
+    Condition for listings without a deadline or one that has not passed.
+
+    ``prefix`` is the lookup path to the listing, e.g. ``"jobs__"`` from a category.
+    """
+    today = today or timezone.localdate()
+    return Q(**{f"{prefix}deadline__isnull": True}) | Q(
+        **{f"{prefix}deadline__gte": today}
+    )
+
+
+def expire_batch(batch_size, today):
+    """Deactivate up to ``batch_size`` past-deadline listings; returns how many."""
+    with transaction.atomic():
+        rows = list(
+            JobListing.objects.select_for_update(skip_locked=True)
+            .filter(is_active=True, deadline__lt=today)
+            .order_by("deadline", "pk")
+            .values_list("pk", "employer_id")[:batch_size]
+        )
+        if not rows:
+            return 0
+        JobListing.objects.filter(pk__in=[pk for pk, _ in rows]).update(
+            is_active=False, updated_at=timezone.now()
+        )
+    # update() sends no post_save signals
+    bump_version("jobs.joblisting")
+    invalidate_dashboard(*{employer_id for _, employer_id in rows})
+    return len(rows)
+
+
+def expire_listings(batch_size=None, max_batches=None):
+    """
+    Deactivate every listing whose deadline has passed, one batch at a time.
+
+    Stops after ``max_batches`` batches when given. Returns ``(expired, batches)``.
+    """
+    batch_size = batch_size or settings.JOB_EXPIRY_BATCH_SIZE
+    today = timezone.localdate()
+    expired = batches = 0
+    while max_batches is None or batches < max_batches:
+        count = expire_batch(batch_size, today)
+        if not count:
+            break
+        expired += count
+        batches += 1
+    if expired:
+        logger.info(f"Expired {expired} job listing(s) in {batches} batch(es)")
+    return expired, batches
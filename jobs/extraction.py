@@ -0,0 +1,78 @@
+"""
+Plain-text extraction from resume files (PDF, DOCX and plain text).
+
+These functions take the file's bytes and touch neither Django nor the
+database, so the resume text worker can run them in separate processes.
+"""
+
+import io
+import zipfile
+from xml.etree import ElementTree
+
+MAX_CHARS = 100_000
+MAX_PDF_PAGES = 50
+# Uncompressed size cap for the DOCX body, against zip bombs
+MAX_DOCX_XML_BYTES = 20 * 1024 * 1024
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class ExtractionError(Exception):
+    """The file cannot be turned into text; retrying will not help."""
+
+
+def detect_format(name, data):
+    """Pick the format from the file's signature, falling back to its extension."""
+    if data.startswith(b"%PDF-"):
+        return "pdf"
+    if data.startswith(b"PK\x03\x04"):
+        return "docx"
+    if name.lower().endswith((".txt", ".text", ".md")):
+        return "txt"
+    raise ExtractionError("Only PDF, DOCX and plain text resumes can be read.")
+
+
+def pdf_text(data):
+    from pypdf import PdfReader
+    from pypdf.errors import PdfReadError
+
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        pages = reader.pages[:MAX_PDF_PAGES]
+        return "\n".join(page.extract_text() or "" for page in pages)
+    except PdfReadError as exc:
+        raise ExtractionError(f"Unreadable PDF: {exc}")
+
+
+def docx_text(data):
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            info = archive.getinfo("word/document.xml")
+            if info.file_size > MAX_DOCX_XML_BYTES:
+                raise ExtractionError("The document body is too large.")
+            root = ElementTree.fromstring(archive.read(info))
+    except (KeyError, zipfile.BadZipFile, ElementTree.ParseError) as exc:
+        raise ExtractionError(f"Unreadable DOCX: {exc}")
+
+    paragraphs = (
+        "".join(node.text or "" for node in paragraph.iter(f"{WORD_NAMESPACE}t"))
+        for paragraph in root.iter(f"{WORD_NAMESPACE}p")
+    )
+    return "\n".join(paragraphs)
+
+
+def txt_text(data):
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+
+EXTRACTORS = {"pdf": pdf_text, "docx": docx_text, "txt": txt_text}
+
+
+def extract_text(name, data):
+    """Return the normalized plain text of the file ``name`` holding ``data``."""
+    text = EXTRACTORS[detect_format(name, data)](data)
+    # Collapse layout whitespace; PostgreSQL text cannot hold NUL characters
+    lines = (" ".join(line.split()) for line in text.replace("\x00", "").splitlines())
+    return "\n".join(line for line in lines if line)[:MAX_CHARS]
@@ -0,0 +1,173 @@
+"""
+Facet counts for the job search sidebar.
+
+``?facets=true`` on the job list adds the number of matching active listings
+per category, employment type, location and salary band. All four come from
+one GROUP BY over the filtered listings, folded in Python. The result is cached
+under the normalized filter and search state, so paging or re-sorting the same
+search reuses it; the listing and category versions of the response cache
+retire stale counts.
+"""
+
+import hashlib
+from collections import Counter
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Case, CharField, Count, Q, Value, When
+from rest_framework.settings import api_settings
+
+from api.async_views import filter_queryset
+from api.cache import aget_versions, get_cache, get_versions
+from .models import JobListing
+from .search import FullTextSearchFilter
+
+FACETS_PARAM = "facets"
+FACET_CACHE_MODELS = ("jobs.joblisting", "jobs.jobcategory")
+LOCATION_FACET_LIMIT = 20
+
+# (key, lower bound, upper bound) of salary_min; the upper bound is exclusive
+SALARY_BANDS = (
+    ("under_25k", None, 25000),
+    ("25k_50k", 25000, 50000),
+    ("50k_75k", 50000, 75000),
+    ("75k_100k", 75000, 100000),
+    ("100k_plus", 100000, None),
+)
+UNSPECIFIED = "unspecified"
+
+
+def wants_facets(request):
+    return request.query_params.get(FACETS_PARAM, "").lower() in ("1", "true", "yes")
+
+
+def salary_band():
+    """Expression naming the SALARY_BANDS entry of each listing's salary_min."""
+    whens = []
+    for key, low, high in SALARY_BANDS:
+        condition = Q()
+        if low is not None:
+            condition &= Q(salary_min__gte=low)
+        if high is not None:
+            condition &= Q(salary_min__lt=high)
+        whens.append(When(condition, then=Value(key)))
+    return Case(*whens, default=Value(UNSPECIFIED), output_field=CharField())
+
+
+def facet_rows(queryset):
+    """One row per (category, employment type, location, band) with its count."""
+    return (
+        queryset.order_by()
+        .annotate(salary_band=salary_band())
+        .values(
+            "category_id",
+            "category__name",
+            "employment_type",
+            "location",
+            "salary_band",
+        )
+        .annotate(count=Count("id"))
+    )
+
+
+def build_facets(rows):
+    total = 0
+    categories = {}
+    employment_types = Counter()
+    locations = Counter()
+    bands = Counter()
+    for row in rows:
+        count = row["count"]
+        total += count
+        category = categories.setdefault(
+            row["category_id"],
+            {"id": row["category_id"], "name": row["category__name"], "count": 0},
+        )
+        category["count"] += count
+        employment_types[row["employment_type"]] += count
+        locations[row["location"]] += count
+        bands[row["salary_band"]] += count
+
+    top_locations = sorted(locations.items(), key=lambda item: (-item[1], item[0]))
+    return {
+        "total": total,
+        "category": sorted(
+            categories.values(), key=lambda facet: (-facet["count"], facet["name"] or "")
+        ),
+        "employment_type": [
+            {"value": value, "label": label, "count": employment_types[value]}
+            for value, label in JobListing.EMPLOYMENT_TYPE_CHOICES
+        ],
+        "location": [
+            {"value": value, "count": count}
+            for value, count in top_locations[:LOCATION_FACET_LIMIT]
+        ],
+        "salary_band": [
+            {"value": key, "min": low, "max": high, "count": bands[key]}
+            for key, low, high in SALARY_BANDS
+        ]
+        + [{"value": UNSPECIFIED, "min": None, "max": None, "count": bands[UNSPECIFIED]}],
+    }
+
+
+def normalized_filters(view):
+    """
+    The view's filter and search state in canonical form: cleaned filter values
+    (so ``category=03`` and ``category=3`` agree) and case-folded search text.
+    Paging, ordering and unknown parameters are left out.
+    """
+    params = view.request.query_params
+    filterset = view.filterset_class(params, queryset=JobListing.objects.none())
+    # Invalid filters were already rejected by the list itself
+    filterset.is_valid()
+    state = []
+    for name, value in filterset.form.cleaned_data.items():
+        if value in (None, ""):
+            continue
+        if isinstance(value, Decimal):
+            value = format(value.normalize(), "f")
+        elif isinstance(value, str):
+            value = value.strip().lower()
+        state.append(f"{name}={value}")
+    for param in (api_settings.SEARCH_PARAM, FullTextSearchFilter.search_param):
+        text = " ".join(params.get(param, "").lower().split())
+        if text:
+            state.append(f"{param}={text}")
+    return "&".join(sorted(state))
+
+
+def facet_cache_key(view, versions):
+    digest = hashlib.sha1(normalized_filters(view).encode()).hexdigest()
+    return "facets:{}:{}".format(".".join(str(version) for version in versions), digest)
+
+
+def get_facets(view):
+    """Facet counts for the listings the list view would return."""
+    queryset = view.filter_queryset(view.get_queryset())
+    timeout = settings.RESPONSE_CACHE_TIMEOUT
+    if not timeout:
+        return build_facets(facet_rows(queryset))
+
+    cache = get_cache()
+    key = facet_cache_key(view, get_versions(FACET_CACHE_MODELS))
+    facets = cache.get(key)
+    if facets is None:
+        facets = build_facets(facet_rows(queryset))
+        cache.set(key, facets, timeout)
+    return facets
+
+
+async def aget_facets(view):
+    """``get_facets`` with async cache and ORM calls."""
+    queryset = await filter_queryset(view, view.get_queryset())
+    timeout = settings.RESPONSE_CACHE_TIMEOUT
+    if not timeout:
+        return build_facets([row async for row in facet_rows(queryset)])
+
+    cache = get_cache()
+    key = facet_cache_key(view, await aget_versions(FACET_CACHE_MODELS))
+    facets = await cache.aget(key)
+    if facets is None:
+        facets = build_facets([row async for row in facet_rows(queryset)])
+        await cache.aset(key, facets, timeout)
+    return facets
@@ -1,5 +1,39 @@
+from datetime import datetime, time, timedelta
+
+from django import forms
+from django.utils import timezone
 from django_filters import rest_framework as filters
-from .models import JobListing
+from .geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, within_radius
+from .models import JobListing, JobApplication
+
+
+def start_of_day(day):
+    """Midnight at the start of ``day`` in the current time zone."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class PointField(forms.Field):
+    """A ``latitude,longitude`` pair in decimal degrees."""
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            latitude, longitude = (float(part) for part in value.split(","))
+        except ValueError:
+            raise forms.ValidationError(
+                "Enter a point as latitude,longitude.", code="invalid"
+            )
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise forms.ValidationError(
+                "Latitude must be within ±90 and longitude within ±180.",
+                code="invalid",
+            )
+        return latitude, longitude
+
+
+class PointFilter(filters.Filter):
+    field_class = PointField
 
 
 class JobListingFilter(filters.FilterSet):
@@ -9,6 +43,20 @@ class JobListingFilter(filters.FilterSet):
     employment_type = filters.ChoiceFilter(choices=JobListing.EMPLOYMENT_TYPE_CHOICES)
     salary_min = filters.NumberFilter(field_name="salary_min", lookup_expr="gte")
     salary_max = filters.NumberFilter(field_name="salary_max", lookup_expr="lte")
+    near = PointFilter(method="filter_near")
+    # Read by filter_near; on its own it filters nothing
+    radius_km = filters.NumberFilter(
+        method="filter_radius", min_value=0, max_value=MAX_RADIUS_KM
+    )
+
+    def filter_near(self, queryset, name, value):
+        radius_km = self.form.cleaned_data.get("radius_km")
+        if radius_km is None:
+            radius_km = DEFAULT_RADIUS_KM
+        return within_radius(queryset, *value, float(radius_km))
+
+    def filter_radius(self, queryset, name, value):
+        return queryset
 
     class Meta:
         model = JobListing
@@ -19,4 +67,28 @@ class JobListingFilter(filters.FilterSet):
             "employment_type",
             "salary_min",
             "salary_max",
+            "near",
+            "radius_km",
         ]
+
+
+class JobApplicationFilter(filters.FilterSet):
+    """Filters for the applications of one job listing."""
+
+    status = filters.MultipleChoiceFilter(choices=JobApplication.STATUS_CHOICES)
+    # Compared as datetime bounds; a date cast of applied_at could not use the
+    # (job, -applied_at) index
+    applied_after = filters.DateFilter(method="filter_applied_after")
+    applied_before = filters.DateFilter(method="filter_applied_before")
+    ordering = filters.OrderingFilter(fields=("applied_at", "updated_at", "status"))
+
+    def filter_applied_after(self, queryset, name, value):
+        return queryset.filter(applied_at__gte=start_of_day(value))
+
+    def filter_applied_before(self, queryset, name, value):
+        # Through the end of that day
+        return queryset.filter(applied_at__lt=start_of_day(value + timedelta(days=1)))
+
+    class Meta:
+        model = JobApplication
+        fields = ["status", "applied_after", "applied_before"]
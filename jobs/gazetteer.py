@@ -0,0 +1,72 @@
+"""
+Offline gazetteer: resolve free-text job locations to known places.
+
+``data/gazetteer.csv`` ships with the app and lists each place's key, name,
+country, coordinates and aliases. A location such as "Gulshan, Dhaka" or
+"Dhaka, Bangladesh (Hybrid)" is resolved by trying each of its parts against
+the names and aliases, preferring a place whose country the text mentions
+when a name is ambiguous. Like jobs.extraction this touches neither Django
+nor the database, so migrations can use it.
+"""
+
+import csv
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "gazetteer.csv"
+
+Entry = namedtuple("Entry", ["key", "name", "country", "latitude", "longitude"])
+
+
+def normalize(text):
+    """Lowercase ASCII words of ``text``, so "São Paulo" and "sao paulo" agree."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore")
+    return " ".join(re.findall(r"[a-z0-9]+", text.decode().lower()))
+
+
+def read_gazetteer(path=GAZETTEER_PATH):
+    """Yield ``(entry, aliases)`` for every place in the gazetteer file."""
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            entry = Entry(
+                row["key"],
+                row["name"],
+                row["country"],
+                float(row["latitude"]),
+                float(row["longitude"]),
+            )
+            yield entry, [alias for alias in row["aliases"].split("|") if alias]
+
+
+class Gazetteer:
+    """Place entries indexed by their normalized names and aliases."""
+
+    def __init__(self, rows):
+        self.entries = []
+        self.names = defaultdict(list)
+        for entry, aliases in rows:
+            self.entries.append(entry)
+            for name in (entry.name, *aliases):
+                self.names[normalize(name)].append(entry)
+
+    def resolve(self, location):
+        """The entry that ``location`` names, or None."""
+        text = f" {normalize(location)} "
+        parts = [normalize(part) for part in re.split(r"[,;/|()]", location or "")]
+        for part in (*parts, text.strip()):
+            candidates = self.names.get(part)
+            if not candidates:
+                continue
+            for entry in candidates:
+                if f" {normalize(entry.country)} " in text:
+                    return entry
+            return candidates[0]
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer():
+    return Gazetteer(read_gazetteer())
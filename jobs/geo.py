@@ -0,0 +1,172 @@
+"""
+Radius search over job locations.
+
+When a listing is saved its free-text location is resolved against the bundled
+gazetteer (jobs.gazetteer) to a Place with coordinates. ``near=lat,lon`` with
+``radius_km`` first selects the places inside the circle's bounding box through
+the (latitude, longitude) index, then keeps those within the exact haversine
+distance. Listings are matched on those place ids and annotated with
+``distance_km``, which ``ordering=distance_km`` sorts on.
+"""
+
+import math
+
+from django.db import transaction
+from django.db.models import Case, FloatField, Q, Value, When
+from rest_framework.filters import OrderingFilter
+
+from api.cache import bump_version
+from .gazetteer import get_gazetteer
+from .models import JobListing, Place
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 500
+DISTANCE_FIELD = "distance_km"
+
+
+def haversine_km(latitude1, longitude1, latitude2, longitude2):
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    half_dphi = math.radians(latitude2 - latitude1) / 2
+    half_dlambda = math.radians(longitude2 - longitude1) / 2
+    a = (
+        math.sin(half_dphi) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Condition for places inside the smallest latitude/longitude box around the
+    circle, split in two where the box crosses the antimeridian.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    delta_latitude = math.degrees(angle)
+    south, north = latitude - delta_latitude, latitude + delta_latitude
+    condition = Q(latitude__range=(max(south, -90.0), min(north, 90.0)))
+    # Near a pole the circle spans every longitude
+    if south <= -90 or north >= 90 or math.sin(angle) >= math.cos(math.radians(latitude)):
+        return condition
+
+    delta_longitude = math.degrees(
+        math.asin(math.sin(angle) / math.cos(math.radians(latitude)))
+    )
+    west, east = longitude - delta_longitude, longitude + delta_longitude
+    if west < -180:
+        ranges = ((west + 360, 180.0), (-180.0, east))
+    elif east > 180:
+        ranges = ((west, 180.0), (-180.0, east - 360))
+    else:
+        ranges = ((west, east),)
+    longitudes = Q()
+    for low, high in ranges:
+        longitudes |= Q(longitude__range=(low, high))
+    return condition & longitudes
+
+
+def places_within(latitude, longitude, radius_km):
+    """Place id -> distance in km for every place within ``radius_km``."""
+    places = (
+        Place.objects.filter(bounding_box(latitude, longitude, radius_km))
+        .order_by()
+        .values_list("pk", "latitude", "longitude")
+    )
+    distances = {}
+    for pk, place_latitude, place_longitude in places:
+        distance = haversine_km(latitude, longitude, place_latitude, place_longitude)
+        if distance <= radius_km:
+            distances[pk] = round(distance, 3)
+    return distances
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """Listings located within ``radius_km``, annotated with ``distance_km``."""
+    distances = places_within(latitude, longitude, radius_km)
+    distance = Case(
+        *[When(place_id=pk, then=Value(value)) for pk, value in distances.items()],
+        default=Value(None),
+        output_field=FloatField(),
+    )
+    return queryset.filter(place_id__in=distances).annotate(**{DISTANCE_FIELD: distance})
+
+
+class DistanceOrderingFilter(OrderingFilter):
+    """``OrderingFilter`` that ignores ``distance_km`` unless ``near`` was given."""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and DISTANCE_FIELD not in queryset.query.annotations:
+            ordering = [
+                term for term in ordering if term.lstrip("-") != DISTANCE_FIELD
+            ] or self.get_default_ordering(view)
+        return ordering
+
+
+_place_ids = {}
+
+
+def place_id_for(location):
+    """The id of the Place ``location`` resolves to, or None."""
+    return place_ids_for([location])[location]
+
+
+def place_ids_for(locations):
+    """
+    Location -> id of the Place it resolves to (or None) for each of
+    ``locations``, with one query for the places not looked up before.
+    """
+    gazetteer = get_gazetteer()
+    entries = {location: gazetteer.resolve(location) for location in set(locations)}
+    missing = {
+        entry.key
+        for entry in entries.values()
+        if entry is not None and entry.key not in _place_ids
+    }
+    if missing:
+        # Places not loaded yet stay unresolved; see load_gazetteer
+        _place_ids.update(
+            Place.objects.filter(key__in=missing).values_list("key", "pk")
+        )
+    return {
+        location: None if entry is None else _place_ids.get(entry.key)
+        for location, entry in entries.items()
+    }
+
+
+def load_gazetteer():
+    """
+    Bring the Place table in line with the gazetteer file and re-resolve the
+    place of every listing. Returns ``(places, listings_moved)``.
+    """
+    gazetteer = get_gazetteer()
+    moved = 0
+    with transaction.atomic():
+        Place.objects.bulk_create(
+            [
+                Place(
+                    key=entry.key,
+                    name=entry.name,
+                    country=entry.country,
+                    latitude=entry.latitude,
+                    longitude=entry.longitude,
+                )
+                for entry in gazetteer.entries
+            ],
+            update_conflicts=True,
+            unique_fields=["key"],
+            update_fields=["name", "country", "latitude", "longitude"],
+        )
+        _place_ids.clear()
+        # One UPDATE per distinct location string, not per listing
+        locations = JobListing.objects.values_list("location", flat=True).distinct()
+        for location, place_id in place_ids_for(list(locations)).items():
+            moved += (
+                JobListing.objects.filter(location=location)
+                .exclude(place_id=place_id)
+                .update(place_id=place_id)
+            )
+    if moved:
+        bump_version("jobs.joblisting")
+    return len(gazetteer.entries), moved
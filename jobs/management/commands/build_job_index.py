@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.recommendations import index_listings
+
+
+class Command(BaseCommand):
+    help = (
+        "Update the job recommendation index: vectorize active listings that are "
+        "new or changed since they were last indexed and drop inactive ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full", action="store_true", help="Re-index every active listing."
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep watching for changed listings instead of exiting.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60.0,
+            help="Seconds to sleep between passes with --loop.",
+        )
+
+    def handle(self, *args, **options):
+        full = options["full"]
+        while True:
+            indexed, removed = index_listings(full=full)
+            full = False
+            if indexed or removed or not options["loop"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Indexed {indexed} listing(s), removed {removed}."
+                    )
+                )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
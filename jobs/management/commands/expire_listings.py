@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.expiry import expire_listings
+
+
+class Command(BaseCommand):
+    help = "Deactivate job listings whose application deadline has passed, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=None, help="Listings per transaction."
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop each pass after this many batches.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep sweeping for expired listings instead of exiting.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=300.0,
+            help="Seconds to sleep between passes with --loop.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            expired, batches = expire_listings(
+                options["batch_size"], options["max_batches"]
+            )
+            if expired or not options["loop"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Expired {expired} listing(s) in {batches} batch(es)."
+                    )
+                )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
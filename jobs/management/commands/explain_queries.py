@@ -0,0 +1,176 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from jobs.models import JobCategory, JobListing, JobApplication, Resume, EmployerReview
+
+# Tables that are small or read in full by design, so a scan is expected
+SCAN_ALLOWED_TABLES = {"jobs_jobcategory"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run each viewset's representative requests against seeded data, EXPLAIN "
+        "every query they issue and flag sequential scans. All seeded data is "
+        "rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fail-on-scan",
+            action="store_true",
+            help="Exit with an error if any sequential scan is found (for CI).",
+        )
+        parser.add_argument(
+            "--verbose-plans", action="store_true", help="Print every query plan."
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ("postgresql", "sqlite"):
+            raise CommandError(
+                f"EXPLAIN parsing is not supported on {connection.vendor}."
+            )
+
+        setup_test_environment()
+        try:
+            with override_settings(
+                DEBUG=False, RESPONSE_CACHE_TIMEOUT=0, DASHBOARD_CACHE_TIMEOUT=0
+            ):
+                with transaction.atomic():
+                    if connection.vendor == "postgresql":
+                        # Tiny seeded tables make scans cheapest; ask the planner to
+                        # show whether a usable index exists at all.
+                        with connection.cursor() as cursor:
+                            cursor.execute("SET LOCAL enable_seqscan = off")
+                    findings = self.check_routes(self.seed(), options["verbose_plans"])
+                    transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+
+        if findings:
+            self.stdout.write(self.style.WARNING(f"{len(findings)} sequential scan(s):"))
+            for route, table, sql in findings:
+                self.stdout.write(f"  {route}: scan on {table}\n    {sql[:200]}")
+            if options["fail_on_scan"]:
+                raise CommandError("Sequential scans found.")
+        else:
+            self.stdout.write(self.style.SUCCESS("No sequential scans found."))
+
+    def seed(self):
+        employer = User.objects.create_user(
+            email="explain-employer@example.com",
+            password=None,
+            user_type="employer",
+            company_name="Explain Co",
+            is_verified=True,
+        )
+        seeker = User.objects.create_user(
+            email="explain-seeker@example.com",
+            password=None,
+            user_type="job_seeker",
+            is_verified=True,
+        )
+        category = JobCategory.objects.create(name="Explain Category")
+        job = JobListing.objects.create(
+            employer=employer,
+            title="Python Developer",
+            description="Build APIs",
+            requirements="Django",
+            location="Dhaka",
+            category=category,
+            salary_min=1000,
+            salary_max=5000,
+        )
+        JobApplication.objects.create(
+            job=job, applicant=seeker, resume="resumes/explain.pdf"
+        )
+        Resume.objects.create(user=seeker, title="CV", file="resumes/explain.pdf")
+        EmployerReview.objects.create(
+            employer=employer, reviewer=seeker, rating=5, comment="Good"
+        )
+        return {"employer": employer, "seeker": seeker, "category": category, "job": job}
+
+    def routes(self, seed):
+        job, category = seed["job"], seed["category"]
+        anonymous, employer, seeker = None, seed["employer"], seed["seeker"]
+        return [
+            ("jobs-list", anonymous, "/api/v1/jobs/"),
+            ("jobs-list category", anonymous, f"/api/v1/jobs/?category={category.pk}"),
+            ("jobs-list type", anonymous, "/api/v1/jobs/?employment_type=full_time"),
+            (
+                "jobs-list salary",
+                anonymous,
+                "/api/v1/jobs/?salary_min=500&salary_max=6000",
+            ),
+            ("jobs-list cursor", anonymous, "/api/v1/jobs/?pagination=cursor"),
+            ("jobs-list full-text", anonymous, "/api/v1/jobs/?q=python"),
+            ("jobs-detail", anonymous, f"/api/v1/jobs/{job.pk}/"),
+            ("categories-list", anonymous, "/api/v1/categories/"),
+            ("jobs-my-listings", employer, "/api/v1/jobs/my_listings/"),
+            ("jobs-applications", employer, f"/api/v1/jobs/{job.pk}/applications/"),
+            ("applications-list employer", employer, "/api/v1/applications/"),
+            ("applications-list seeker", seeker, "/api/v1/applications/"),
+            ("applications-list status", seeker, "/api/v1/applications/?status=pending"),
+            (
+                "reviews-list employer",
+                anonymous,
+                f"/api/v1/reviews/?employer={employer.pk}",
+            ),
+            ("resumes-list", seeker, "/api/v1/resumes/"),
+            ("dashboard employer", employer, "/api/v1/dashboard/"),
+            ("dashboard seeker", seeker, "/api/v1/dashboard/"),
+        ]
+
+    def check_routes(self, seed, verbose):
+        findings = []
+        for route, user, url in self.routes(seed):
+            client = APIClient()
+            if user is not None:
+                client.force_authenticate(user)
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f"{route}: {url} returned {response.status_code}")
+
+            for query in context.captured_queries:
+                sql = query["sql"]
+                if not sql.lstrip().upper().startswith("SELECT"):
+                    continue
+                plan = self.explain(sql)
+                if verbose:
+                    self.stdout.write(f"{route}: {sql}\n{plan}\n")
+                for table in self.scanned_tables(plan):
+                    if table not in SCAN_ALLOWED_TABLES:
+                        findings.append((route, table, sql))
+        return findings
+
+    def explain(self, sql):
+        prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql)
+            rows = cursor.fetchall()
+        return "\n".join(str(row[-1]) for row in rows)
+
+    def scanned_tables(self, plan):
+        if connection.vendor == "postgresql":
+            return re.findall(r"Seq Scan on (\w+)", plan)
+        # SQLite: "SCAN t" is a full table scan, while "SCAN t USING INDEX i" and
+        # FTS5 "VIRTUAL TABLE INDEX" lookups are not. Scans of materialized
+        # subqueries are not base tables.
+        tables = set(connection.introspection.table_names())
+        return [
+            match.group(1)
+            for match in re.finditer(r"^SCAN (\w+)(.*)$", plan, re.MULTILINE)
+            if match.group(1) in tables
+            and "USING" not in match.group(2)
+            and "VIRTUAL TABLE" not in match.group(2)
+        ]
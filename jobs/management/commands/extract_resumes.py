@@ -0,0 +1,64 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.resume_text import extract_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract the text of queued resume files (PDF, DOCX, TXT) for applicant "
+        "search, parsing them on a pool of worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=None, help="Files leased per batch."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.RESUME_TEXT_WORKERS,
+            help="Parser processes; 0 parses in this process.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for queued files instead of exiting once drained.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep between polls when nothing is queued.",
+        )
+
+    def handle(self, *args, **options):
+        executor = None
+        if options["workers"] > 0:
+            executor = ProcessPoolExecutor(max_workers=options["workers"])
+
+        total_extracted = total_failed = 0
+        try:
+            while True:
+                extracted, failed = extract_batch(executor, options["batch_size"])
+                total_extracted += extracted
+                total_failed += failed
+                if extracted or failed:
+                    self.stdout.write(f"Extracted {extracted} resume(s), {failed} failed.")
+                    continue
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Resume queue drained: {total_extracted} extracted, "
+                f"{total_failed} failed."
+            )
+        )
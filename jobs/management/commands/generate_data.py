@@ -0,0 +1,265 @@
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import User
+from api.cache import bump_version
+from jobs.geo import place_id_for
+from jobs.models import JobCategory, JobListing, JobApplication, Resume, EmployerReview
+from jobs.ratings import rebuild_rating_summaries
+
+# Every generated user can log in with this password
+GENERATED_PASSWORD = "Generated-Passw0rd!"
+
+# Rows per scale factor of 1
+SCALE = {
+    "employers": 100,
+    "listings": 2000,
+    "seekers": 1000,
+    "applications": 10000,
+    "resumes": 1500,
+    "reviews": 1000,
+}
+
+CATEGORY_NAMES = (
+    "Information Technology",
+    "Healthcare",
+    "Finance",
+    "Marketing",
+    "Sales",
+    "Education",
+    "Engineering",
+    "Human Resources",
+    "Customer Service",
+    "Design",
+)
+LOCATIONS = (
+    "Dhaka",
+    "Chittagong",
+    "Sylhet",
+    "Khulna",
+    "Rajshahi",
+    "Remote",
+    "Singapore",
+    "London",
+    "Berlin",
+    "New York",
+)
+SENIORITY = ("Junior", "Mid-level", "Senior", "Lead", "Principal")
+ROLES = (
+    "Python Developer",
+    "Data Analyst",
+    "Accountant",
+    "Nurse",
+    "Sales Executive",
+    "UI/UX Designer",
+    "Civil Engineer",
+    "HR Officer",
+    "Support Specialist",
+    "Marketing Manager",
+)
+SKILLS = (
+    "Django",
+    "PostgreSQL",
+    "Excel",
+    "communication",
+    "negotiation",
+    "Figma",
+    "AutoCAD",
+    "recruitment",
+    "SQL",
+    "REST APIs",
+    "project management",
+    "customer care",
+)
+EMPLOYMENT_TYPES = [choice for choice, _ in JobListing.EMPLOYMENT_TYPE_CHOICES]
+STATUSES = [choice for choice, _ in JobApplication.STATUS_CHOICES]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic dataset of employers, listings, job seekers, "
+        "applications, resumes and reviews, sized by a scale factor."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Scale factor; 1 creates "
+            + ", ".join(f"{count} {name}" for name, count in SCALE.items())
+            + ".",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows per INSERT."
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument(
+            "--prefix",
+            default="gen",
+            help="Prefix of generated email addresses, so several datasets can coexist.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete users (and everything they own) generated with the same prefix first.",
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.counts = {}
+        prefix = options["prefix"]
+        sizes = {
+            name: max(1, round(count * options["scale"])) for name, count in SCALE.items()
+        }
+
+        generated = User.objects.filter(email__startswith=f"{prefix}-")
+        if options["clear"]:
+            deleted, _ = generated.delete()
+            self.stdout.write(f"Deleted {deleted} rows from the previous dataset.")
+        elif generated.exists():
+            raise CommandError(
+                f"Users with the prefix '{prefix}' exist; use --clear or another --prefix."
+            )
+
+        categories = self.create_categories()
+        password = make_password(GENERATED_PASSWORD)
+        employers = self.create_users(prefix, "employer", sizes["employers"], password)
+        seekers = self.create_users(prefix, "job_seeker", sizes["seekers"], password)
+        pairs = self.sample_pairs(sizes["listings"], len(seekers), sizes["applications"])
+        listings = self.create_listings(employers, categories, sizes["listings"], pairs)
+        self.create_applications(listings, seekers, pairs)
+        self.create_resumes(seekers, sizes["resumes"])
+        self.create_reviews(employers, seekers, sizes["reviews"])
+
+        # Bulk inserts send no signals, so retire cached responses explicitly
+        for label in (
+            "jobs.jobcategory",
+            "jobs.joblisting",
+            "jobs.jobapplication",
+            "accounts.user",
+        ):
+            bump_version(label)
+
+        summary = ", ".join(f"{count} {name}" for name, count in self.counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Generated {summary}."))
+
+    def insert(self, model, objects):
+        created = []
+        for start in range(0, len(objects), self.batch_size):
+            with transaction.atomic():
+                created.extend(
+                    model.objects.bulk_create(objects[start : start + self.batch_size])
+                )
+        name = model._meta.verbose_name_plural
+        self.counts[name] = self.counts.get(name, 0) + len(created)
+        return created
+
+    def create_categories(self):
+        JobCategory.objects.bulk_create(
+            [JobCategory(name=name) for name in CATEGORY_NAMES], ignore_conflicts=True
+        )
+        return list(JobCategory.objects.all())
+
+    def create_users(self, prefix, user_type, count, password):
+        users = []
+        for number in range(count):
+            user = User(
+                email=f"{prefix}-{user_type.replace('_', '-')}-{number}@example.com",
+                password=password,
+                user_type=user_type,
+                first_name=user_type.split("_")[-1].title(),
+                last_name=str(number),
+                is_verified=True,
+            )
+            if user_type == "employer":
+                user.company_name = f"Company {number}"
+            users.append(user)
+        return self.insert(User, users)
+
+    def sample_pairs(self, left, right, count):
+        """Up to ``count`` distinct random ``(left index, right index)`` pairs."""
+        return sorted(
+            {(self.random.randrange(left), self.random.randrange(right)) for _ in range(count)}
+        )
+
+    def create_listings(self, employers, categories, count, application_pairs):
+        # Applications are sampled up front so each listing's application_count
+        # can be written with the listing itself
+        totals = [0] * count
+        for listing, _ in application_pairs:
+            totals[listing] += 1
+
+        place_ids = {location: place_id_for(location) for location in LOCATIONS}
+        listings = []
+        for number in range(count):
+            salary_min = self.random.randrange(20, 200) * 500
+            role = self.random.choice(ROLES)
+            skills = ", ".join(self.random.sample(SKILLS, 3))
+            listings.append(
+                JobListing(
+                    employer=self.random.choice(employers),
+                    title=f"{self.random.choice(SENIORITY)} {role}",
+                    description=f"We are hiring a {role.lower()} to join our team. "
+                    f"You will work with {skills}.",
+                    requirements=f"Experience with {skills}.",
+                    location=self.random.choice(LOCATIONS),
+                    category=self.random.choice(categories),
+                    employment_type=self.random.choice(EMPLOYMENT_TYPES),
+                    salary_min=Decimal(salary_min),
+                    salary_max=Decimal(salary_min + self.random.randrange(1, 40) * 500),
+                    is_active=self.random.random() < 0.9,
+                    application_count=totals[number],
+                )
+            )
+            # insert() uses bulk_create, which skips the signal resolving places
+            listings[-1].place_id = place_ids[listings[-1].location]
+        return self.insert(JobListing, listings)
+
+    def create_applications(self, listings, seekers, pairs):
+        applications = [
+            JobApplication(
+                job=listings[listing],
+                applicant=seekers[seeker],
+                resume=f"resumes/generated/{seekers[seeker].pk}.pdf",
+                cover_letter="I am interested in this role.",
+                status=self.random.choice(STATUSES),
+            )
+            for listing, seeker in pairs
+        ]
+        return self.insert(JobApplication, applications)
+
+    def create_resumes(self, seekers, count):
+        resumes = []
+        for number in range(count):
+            # The first resume of each seeker is their primary one
+            seeker = seekers[number % len(seekers)]
+            resumes.append(
+                Resume(
+                    user=seeker,
+                    title=f"Resume {number // len(seekers) + 1}",
+                    file=f"resumes/generated/{seeker.pk}-{number}.pdf",
+                    is_primary=number < len(seekers),
+                )
+            )
+        return self.insert(Resume, resumes)
+
+    def create_reviews(self, employers, seekers, count):
+        pairs = self.sample_pairs(len(employers), len(seekers), count)
+        reviews = [
+            EmployerReview(
+                employer=employers[employer],
+                reviewer=seekers[reviewer],
+                rating=self.random.randint(1, 5),
+                comment="Generated review.",
+            )
+            for employer, reviewer in pairs
+        ]
+        created = self.insert(EmployerReview, reviews)
+        rebuild_rating_summaries([employer.pk for employer in employers])
+        return created
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from jobs.geo import load_gazetteer
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the bundled gazetteer into the Place table and re-resolve the "
+        "place of every job listing."
+    )
+
+    def handle(self, *args, **options):
+        places, moved = load_gazetteer()
+        self.stdout.write(
+            self.style.SUCCESS(f"Loaded {places} place(s); moved {moved} listing(s).")
+        )
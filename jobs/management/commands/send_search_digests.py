@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs.saved_searches import send_digests
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue one digest email per job seeker listing the new listings that "
+        "matched their saved searches since the last digest (run from cron)."
+    )
+
+    def handle(self, *args, **options):
+        queued = send_digests()
+        self.stdout.write(self.style.SUCCESS(f"Queued {queued} digest email(s)."))
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.5 on 2026-01-10 12:00
+
+from django.db import migrations
+
+
+# Title > location > requirements > description, matching jobs.search.FTS_WEIGHTS.
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE jobs_joblisting ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(requirements, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX jobs_joblisting_search_vector_gin ON jobs_joblisting USING gin (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS jobs_joblisting_search_vector_gin",
+    "ALTER TABLE jobs_joblisting DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def add_search_document(apps, schema_editor):
+    # The SQLite FTS5 sidecar is (re)installed after every migrate by
+    # jobs.search.install_sqlite_index, because table rebuilds drop its triggers.
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in POSTGRES_FORWARD:
+            schema_editor.execute(statement)
+
+
+def remove_search_document(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in POSTGRES_REVERSE:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_alter_jobapplication_resume_alter_resume_file'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_document, remove_search_document),
+    ]
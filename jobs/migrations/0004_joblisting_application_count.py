@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-16 22:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_application_count(apps, schema_editor):
+    JobListing = apps.get_model("jobs", "JobListing")
+    JobApplication = apps.get_model("jobs", "JobApplication")
+    counts = (
+        JobApplication.objects.filter(job=OuterRef("pk"))
+        .order_by()
+        .values("job")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    JobListing.objects.update(application_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_joblisting_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_application_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.5 on 2026-10-16 22:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def link_existing_resumes(apps, schema_editor):
+    """Point applications at the applicant's resume row holding the same file."""
+    JobApplication = apps.get_model("jobs", "JobApplication")
+    Resume = apps.get_model("jobs", "Resume")
+    matching = Resume.objects.filter(
+        user=OuterRef("applicant"), file=OuterRef("resume")
+    ).values("pk")[:1]
+    JobApplication.objects.update(source_resume=Subquery(matching))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_listing_application_access_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='source_resume',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applications', to='jobs.resume'),
+        ),
+        migrations.RunPython(link_existing_resumes, migrations.RunPython.noop),
+    ]
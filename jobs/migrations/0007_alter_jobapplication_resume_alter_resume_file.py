@@ -0,0 +1,24 @@
+# Generated by Django 5.1.5 on 2026-10-16 22:53
+
+import career_connect.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_jobapplication_source_resume'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='resume',
+            field=models.FileField(storage=career_connect.storage.CloudinaryMediaStorage(), upload_to='resumes/%Y/%m/'),
+        ),
+        migrations.AlterField(
+            model_name='resume',
+            name='file',
+            field=models.FileField(storage=career_connect.storage.CloudinaryMediaStorage(), upload_to='resumes/%Y/%m/'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_rating_summaries(apps, schema_editor):
+    EmployerReview = apps.get_model("jobs", "EmployerReview")
+    EmployerRatingSummary = apps.get_model("jobs", "EmployerRatingSummary")
+    rows = (
+        EmployerReview.objects.order_by()
+        .values("employer_id")
+        .annotate(
+            review_count=Count("id"),
+            rating_total=Sum("rating", default=0),
+            **{
+                f"rating_{rating}": Count("id", filter=Q(rating=rating))
+                for rating in range(1, 6)
+            },
+        )
+    )
+    EmployerRatingSummary.objects.bulk_create(
+        [EmployerRatingSummary(**row) for row in rows], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('jobs', '0007_alter_jobapplication_resume_alter_resume_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployerRatingSummary',
+            fields=[
+                ('employer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_total', models.PositiveIntegerField(default=0)),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Employer rating summaries',
+            },
+        ),
+        migrations.RunPython(backfill_rating_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_employerratingsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobVector',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='vector', serialize=False, to='jobs.joblisting')),
+                ('terms', models.BinaryField()),
+                ('weights', models.BinaryField()),
+                ('indexed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:17
+
+from django.db import migrations, models
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE jobs_resumetext ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) STORED
+    """,
+    "CREATE INDEX jobs_resumetext_search_vector_gin ON jobs_resumetext USING gin (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS jobs_resumetext_search_vector_gin",
+    "ALTER TABLE jobs_resumetext DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def add_search_document(apps, schema_editor):
+    # SQLite gets an FTS5 sidecar from jobs.search.install_sqlite_index instead
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in POSTGRES_FORWARD:
+            schema_editor.execute(statement)
+
+
+def remove_search_document(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in POSTGRES_REVERSE:
+            schema_editor.execute(statement)
+
+
+def queue_existing_resumes(apps, schema_editor):
+    Resume = apps.get_model("jobs", "Resume")
+    JobApplication = apps.get_model("jobs", "JobApplication")
+    ResumeText = apps.get_model("jobs", "ResumeText")
+    names = set(Resume.objects.exclude(file="").values_list("file", flat=True))
+    names.update(
+        JobApplication.objects.exclude(resume="").values_list("resume", flat=True)
+    )
+    ResumeText.objects.bulk_create(
+        [ResumeText(name=name) for name in names],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_jobvector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('text', models.TextField(blank=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(auto_now_add=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('extracted_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='jobs_resume_status_4bf934_idx')],
+            },
+        ),
+        migrations.RunPython(add_search_document, remove_search_document),
+        migrations.RunPython(queue_existing_resumes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from jobs.gazetteer import get_gazetteer
+
+
+def load_places(apps, schema_editor):
+    Place = apps.get_model("jobs", "Place")
+    JobListing = apps.get_model("jobs", "JobListing")
+    gazetteer = get_gazetteer()
+    places = Place.objects.bulk_create(
+        Place(
+            key=entry.key,
+            name=entry.name,
+            country=entry.country,
+            latitude=entry.latitude,
+            longitude=entry.longitude,
+        )
+        for entry in gazetteer.entries
+    )
+    place_ids = {place.key: place.pk for place in places}
+    if not all(place_ids.values()):
+        place_ids = dict(Place.objects.values_list("key", "pk"))
+
+    locations = JobListing.objects.values_list("location", flat=True).distinct()
+    for location in list(locations):
+        entry = gazetteer.resolve(location)
+        if entry is not None:
+            JobListing.objects.filter(location=location).update(
+                place_id=place_ids[entry.key]
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_joblisting_deadline_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Place',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.SlugField(max_length=100, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('country', models.CharField(max_length=100)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+            ],
+            options={
+                'ordering': ['name'],
+                'indexes': [models.Index(fields=['latitude', 'longitude'], name='jobs_place_latitud_b7fe1b_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='place',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='jobs.place'),
+        ),
+        migrations.RunPython(load_places, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:41
+
+from django.db import migrations, models
+
+from jobs.saved_searches import search_terms
+
+
+def reindex_saved_searches(apps, schema_editor):
+    # Keywords are now stemmed and the title filter has its own terms
+    SavedSearch = apps.get_model("jobs", "SavedSearch")
+    SavedSearchTerm = apps.get_model("jobs", "SavedSearchTerm")
+    for search in SavedSearch.objects.iterator():
+        terms = search_terms(search.filters, search.search)
+        SavedSearchTerm.objects.filter(search=search).delete()
+        SavedSearchTerm.objects.bulk_create(
+            SavedSearchTerm(search=search, kind=kind, value=value)
+            for kind, value in terms
+        )
+        SavedSearch.objects.filter(pk=search.pk).update(term_count=len(terms))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_place'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='savedsearchterm',
+            name='kind',
+            field=models.CharField(choices=[('category', 'Category'), ('employment_type', 'Employment type'), ('title', 'Title word'), ('location', 'Location word'), ('keyword', 'Keyword stem')], max_length=20),
+        ),
+        migrations.RunPython(reindex_saved_searches, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
-from cloudinary_storage.storage import MediaCloudinaryStorage
+from career_connect.storage import CloudinaryMediaStorage
 
 User = get_user_model()
 
@@ -21,6 +21,24 @@ class JobCategory(models.Model):
         ordering = ["name"]
 
 
+class Place(models.Model):
+    """A location from the bundled gazetteer (jobs/data/gazetteer.csv)."""
+
+    key = models.SlugField(max_length=100, unique=True)
+    name = models.CharField(max_length=100)
+    country = models.CharField(max_length=100)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+
+    def __str__(self):
+        return f"{self.name}, {self.country}"
+
+    class Meta:
+        ordering = ["name"]
+        # Bounding-box prefilter of radius searches (see jobs.geo)
+        indexes = [models.Index(fields=["latitude", "longitude"])]
+
+
 class JobListing(models.Model):
     """Job postings created by employers."""
 
@@ -55,16 +73,72 @@ class JobListing(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deadline = models.DateField(null=True, blank=True)
+    # Resolved from location against the gazetteer whenever the listing is saved
+    place = models.ForeignKey(
+        Place,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="jobs",
+    )
+    # Maintained by jobs.signals whenever an application is created or deleted
+    application_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"{self.title} - {self.employer.company_name or self.employer.email}"
 
+    def save(self, *args, **kwargs):
+        # A full save of a loaded listing would write back a stale
+        # application_count over concurrent F() increments; leave it out
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "application_count"
+            ]
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ["-created_at"]
+        # category and employer are already indexed by their foreign keys. Public
+        # queries always filter on is_active=True, so those paths use partial indexes.
         indexes = [
             models.Index(fields=["-created_at"]),
-            models.Index(fields=["category"]),
-            models.Index(fields=["employer"]),
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="jobs_listing_active_recent_idx",
+            ),
+            models.Index(
+                fields=["category", "-created_at"],
+                condition=models.Q(is_active=True),
+                name="jobs_listing_active_cat_idx",
+            ),
+            models.Index(
+                fields=["employment_type", "-created_at"],
+                condition=models.Q(is_active=True),
+                name="jobs_listing_active_type_idx",
+            ),
+            models.Index(
+                fields=["salary_min", "salary_max"],
+                condition=models.Q(is_active=True),
+                name="jobs_listing_active_salary_idx",
+            ),
+            # Serves the expiry sweep and the public past-deadline exclusion
+            models.Index(
+                fields=["deadline"],
+                condition=models.Q(is_active=True),
+                name="jobs_listing_deadline_idx",
+            ),
+            models.Index(
+                fields=["employer", "-created_at"],
+                name="jobs_listing_employer_idx",
+            ),
         ]
 
 
@@ -84,7 +158,16 @@ class JobApplication(models.Model):
     applicant = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="job_applications"
     )
-    resume = models.FileField(upload_to="resumes/%Y/%m/", storage=MediaCloudinaryStorage())
+    resume = models.FileField(upload_to="resumes/%Y/%m/", storage=CloudinaryMediaStorage())
+    # The applicant's stored resume this application points at; ``resume`` then
+    # names the same stored object instead of a fresh upload
+    source_resume = models.ForeignKey(
+        "Resume",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="applications",
+    )
     cover_letter = models.TextField(blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     applied_at = models.DateTimeField(auto_now_add=True)
@@ -93,12 +176,25 @@ class JobApplication(models.Model):
     def __str__(self):
         return f"{self.applicant.email} - {self.job.title}"
 
+    def save(self, *args, **kwargs):
+        # Keep the insert and the job's application_count update in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         ordering = ["-applied_at"]
         unique_together = ["job", "applicant"]
         indexes = [
             models.Index(fields=["-applied_at"]),
             models.Index(fields=["status"]),
+            models.Index(
+                fields=["applicant", "status"], name="jobs_app_applicant_status_idx"
+            ),
+            models.Index(
+                fields=["applicant", "-applied_at"], name="jobs_app_applicant_recent_idx"
+            ),
+            models.Index(fields=["job", "-applied_at"], name="jobs_app_job_recent_idx"),
+            models.Index(fields=["job", "status"], name="jobs_app_job_status_idx"),
         ]
 
 
@@ -107,7 +203,7 @@ class Resume(models.Model):
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="resumes")
     title = models.CharField(max_length=255)
-    file = models.FileField(upload_to="resumes/%Y/%m/", storage=MediaCloudinaryStorage())
+    file = models.FileField(upload_to="resumes/%Y/%m/", storage=CloudinaryMediaStorage())
     is_primary = models.BooleanField(default=False)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -149,3 +245,176 @@ class EmployerReview(models.Model):
     class Meta:
         ordering = ["-created_at"]
         unique_together = ["employer", "reviewer"]
+
+
+class EmployerRatingSummary(models.Model):
+    """An employer's review count, rating total and histogram, kept by jobs.signals."""
+
+    employer = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rating_summary",
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    rating_total = models.PositiveIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Ratings of {self.employer_id}: {self.average} ({self.review_count})"
+
+    @property
+    def average(self):
+        if not self.review_count:
+            return None
+        return round(self.rating_total / self.review_count, 2)
+
+    @property
+    def histogram(self):
+        return {rating: getattr(self, f"rating_{rating}") for rating in range(1, 6)}
+
+    class Meta:
+        verbose_name_plural = "Employer rating summaries"
+
+
+class JobVector(models.Model):
+    """A listing's term frequencies for recommendations, built by build_job_index."""
+
+    job = models.OneToOneField(
+        JobListing, on_delete=models.CASCADE, primary_key=True, related_name="vector"
+    )
+    # Packed arrays (see jobs.recommendations): hashed term ids and their weights
+    terms = models.BinaryField()
+    weights = models.BinaryField()
+    # The listing's updated_at when it was indexed; older listings are re-indexed
+    indexed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Vector of job {self.job_id}"
+
+
+class ResumeText(models.Model):
+    """
+    Plain text of a stored resume file, extracted by the extract_resumes worker.
+
+    Rows are keyed by the storage name that ``Resume.file`` and
+    ``JobApplication.resume`` hold, so a file shared by several rows is read
+    once. On PostgreSQL the text is indexed by a generated ``search_vector``
+    column (migration 0010); on SQLite by an FTS5 sidecar table (jobs.search).
+    """
+
+    STATUS_CHOICES = (
+        ("pending", "Pending"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    )
+
+    name = models.CharField(max_length=255, unique=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    text = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(auto_now_add=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+
+class SavedSearch(models.Model):
+    """
+    A job seeker's stored JobListingFilter parameters and search text.
+
+    New listings are matched against it through SavedSearchTerm (see
+    jobs.saved_searches) and the matches are emailed in periodic digests.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="saved_searches"
+    )
+    name = models.CharField(max_length=100)
+    # Cleaned JobListingFilter values, e.g. {"category": 3, "location": "Dhaka"}
+    filters = models.JSONField(default=dict, blank=True)
+    search = models.CharField(max_length=255, blank=True)
+    # Number of distinct index terms; a listing must hit all of them to match
+    term_count = models.PositiveIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.email} - {self.name}"
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "Saved searches"
+        indexes = [
+            models.Index(
+                fields=["term_count"],
+                condition=models.Q(term_count=0),
+                name="jobs_search_unindexed_idx",
+            ),
+        ]
+
+
+class SavedSearchTerm(models.Model):
+    """Inverted index entry: a saved search requires ``kind`` to equal ``value``."""
+
+    KIND_CHOICES = (
+        ("category", "Category"),
+        ("employment_type", "Employment type"),
+        ("title", "Title word"),
+        ("location", "Location word"),
+        ("keyword", "Keyword stem"),
+    )
+
+    search = models.ForeignKey(
+        SavedSearch, on_delete=models.CASCADE, related_name="terms"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    value = models.CharField(max_length=255)
+
+    def __str__(self):
+        return f"{self.kind}={self.value}"
+
+    class Meta:
+        unique_together = ["search", "kind", "value"]
+        indexes = [
+            models.Index(fields=["kind", "value"]),
+        ]
+
+
+class SavedSearchMatch(models.Model):
+    """A new listing that matched a saved search, until it is sent in a digest."""
+
+    search = models.ForeignKey(
+        SavedSearch, on_delete=models.CASCADE, related_name="matches"
+    )
+    job = models.ForeignKey(
+        JobListing, on_delete=models.CASCADE, related_name="search_matches"
+    )
+    matched_at = models.DateTimeField(auto_now_add=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.search} -> {self.job_id}"
+
+    class Meta:
+        ordering = ["-matched_at"]
+        unique_together = ["search", "job"]
+        indexes = [
+            models.Index(
+                fields=["matched_at"],
+                condition=models.Q(notified_at__isnull=True),
+                name="jobs_match_pending_idx",
+            ),
+        ]
@@ -22,8 +22,10 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        # Check if the user is the owner
-        if hasattr(obj, "employer"):
+        # Check if the user is the owner; a review belongs to its reviewer
+        if hasattr(obj, "reviewer"):
+            return obj.reviewer == request.user
+        elif hasattr(obj, "employer"):
             return obj.employer == request.user
         elif hasattr(obj, "user"):
             return obj.user == request.user
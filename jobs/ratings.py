@@ -0,0 +1,87 @@
+"""
+Per-employer rating aggregates.
+
+Every employer with reviews has an ``EmployerRatingSummary`` row holding the
+review count, the rating total and a 1-5 histogram. jobs.signals adjusts the
+row with one UPDATE per review change instead of re-reading the reviews; the
+row is rebuilt from the reviews only when it does not exist yet.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from api.cache import bump_version
+from .models import EmployerRatingSummary, EmployerReview
+
+RATINGS = range(1, 6)
+
+
+def review_aggregates():
+    """Summary fields as aggregate expressions over reviews."""
+    return {
+        "review_count": Count("id"),
+        "rating_total": Sum("rating", default=0),
+        **{
+            f"rating_{rating}": Count("id", filter=Q(rating=rating))
+            for rating in RATINGS
+        },
+    }
+
+
+def rebuild_rating_summary(employer_id):
+    """Recompute an employer's summary from their reviews."""
+    reviews = EmployerReview.objects.filter(employer_id=employer_id)
+    EmployerRatingSummary.objects.update_or_create(
+        employer_id=employer_id, defaults=reviews.aggregate(**review_aggregates())
+    )
+    bump_version("jobs.employerratingsummary")
+
+
+def rebuild_rating_summaries(employer_ids):
+    """Recompute the summaries of many employers with one grouped query."""
+    rows = (
+        EmployerReview.objects.filter(employer_id__in=employer_ids)
+        .order_by()
+        .values("employer_id")
+        .annotate(**review_aggregates())
+    )
+    with transaction.atomic():
+        EmployerRatingSummary.objects.filter(employer_id__in=employer_ids).delete()
+        EmployerRatingSummary.objects.bulk_create(
+            [EmployerRatingSummary(**row) for row in rows]
+        )
+    bump_version("jobs.employerratingsummary")
+
+
+def adjust_rating_summary(employer_id, rating, delta, rebuild_missing=True):
+    """
+    Add (``delta=1``) or remove (``delta=-1``) one review of ``rating``.
+
+    A missing summary is rebuilt from the reviews, which already include or
+    exclude the changed one, unless ``rebuild_missing`` is false.
+    """
+    summaries = EmployerRatingSummary.objects.filter(employer_id=employer_id)
+    if delta < 0:
+        summaries = summaries.filter(review_count__gt=0, **{f"rating_{rating}__gt": 0})
+    updated = summaries.update(
+        review_count=F("review_count") + delta,
+        rating_total=F("rating_total") + delta * rating,
+        **{f"rating_{rating}": F(f"rating_{rating}") + delta},
+    )
+    if updated:
+        bump_version("jobs.employerratingsummary")
+    elif rebuild_missing:
+        rebuild_rating_summary(employer_id)
+
+
+def rating_data(employer):
+    """The public rating summary of ``employer``; zeros when they have no reviews."""
+    try:
+        summary = employer.rating_summary
+    except EmployerRatingSummary.DoesNotExist:
+        summary = EmployerRatingSummary(employer_id=employer.pk)
+    return {
+        "count": summary.review_count,
+        "average": summary.average,
+        "histogram": {str(rating): count for rating, count in summary.histogram.items()},
+    }
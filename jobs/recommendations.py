@@ -0,0 +1,259 @@
+"""
+TF-IDF job recommendations for job seekers.
+
+``manage.py build_job_index`` tokenizes every active listing whose vector is
+missing or older than the listing and stores its term frequencies in JobVector
+as packed arrays, so an edit only re-indexes that listing. Each process loads
+the vectors into an inverted index, IDF-weighted and normalized, and reloads it
+when the ``jobs.jobvector`` cache version moves. With a process-local cache that
+bump never leaves build_job_index, so workers instead compare the vectors'
+count and latest indexing time, at most every ``JOB_INDEX_CHECK_INTERVAL``
+seconds. A seeker's profile is built from their bio, their recent applications
+and the extracted text of their resumes; scoring only walks the postings of the
+profile's terms.
+"""
+
+import heapq
+import math
+import re
+import threading
+import time
+import zlib
+from array import array
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+
+from api.cache import bump_version, cache_is_shared, get_versions
+from .expiry import not_expired
+from .models import JobApplication, JobListing, JobVector, Resume, ResumeText
+
+INDEX_VERSION = "jobs.jobvector"
+TERM_BUCKETS = 1 << 20
+TITLE_WEIGHT = 3
+PROFILE_APPLICATIONS = 20
+PROFILE_RESUMES = 3
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+STOP_WORDS = frozenset(
+    """
+    a an and are as at be been but by can do for from has have if in into is it
+    its of on or our that the their this to was we were will with you your
+    """.split()
+)
+
+
+def tokenize(text):
+    for token in re.findall(r"[a-z][a-z0-9+#]+", (text or "").lower()):
+        if token not in STOP_WORDS:
+            yield token
+
+
+def term_id(token):
+    # Hashed ids need no vocabulary table; collisions are rare at 2**20 buckets
+    return zlib.crc32(token.encode()) % TERM_BUCKETS
+
+
+def listing_terms(title, description, requirements):
+    """Term id -> frequency for a listing, the title counting TITLE_WEIGHT times."""
+    counts = Counter()
+    for text, weight in ((title, TITLE_WEIGHT), (description, 1), (requirements, 1)):
+        for token in tokenize(text):
+            counts[term_id(token)] += weight
+    return counts
+
+
+def text_terms(text):
+    return Counter(term_id(token) for token in tokenize(text))
+
+
+def pack(counts):
+    terms = sorted(counts)
+    return (
+        array("I", terms).tobytes(),
+        array("f", (1 + math.log(counts[term]) for term in terms)).tobytes(),
+    )
+
+
+def unpack(terms, weights):
+    term_array, weight_array = array("I"), array("f")
+    term_array.frombytes(terms)
+    weight_array.frombytes(weights)
+    return term_array, weight_array
+
+
+def index_listings(full=False, batch_size=500):
+    """
+    Store vectors for active listings that have none or changed since indexing,
+    and drop the vectors of inactive listings. ``full`` re-indexes every listing.
+
+    Returns ``(indexed, removed)``.
+    """
+    listings = JobListing.objects.filter(is_active=True)
+    if not full:
+        listings = listings.filter(
+            Q(vector__isnull=True) | Q(vector__indexed_at__lt=F("updated_at"))
+        )
+    rows = listings.values_list(
+        "pk", "title", "description", "requirements", "updated_at"
+    ).iterator(chunk_size=batch_size)
+
+    indexed = 0
+    batch = []
+
+    def flush():
+        JobVector.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["job"],
+            update_fields=["terms", "weights", "indexed_at"],
+        )
+        batch.clear()
+
+    with transaction.atomic():
+        for pk, title, description, requirements, updated_at in rows:
+            terms, weights = pack(listing_terms(title, description, requirements))
+            batch.append(
+                JobVector(job_id=pk, terms=terms, weights=weights, indexed_at=updated_at)
+            )
+            indexed += 1
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        removed, _ = JobVector.objects.filter(job__is_active=False).delete()
+
+    if indexed or removed:
+        bump_version(INDEX_VERSION)
+    return indexed, removed
+
+
+class JobIndex:
+    """Inverted index of normalized TF-IDF weights: term -> (job ids, weights)."""
+
+    def __init__(self, rows):
+        vectors = [(pk, *unpack(terms, weights)) for pk, terms, weights in rows]
+        document_frequency = Counter()
+        for _, terms, _ in vectors:
+            document_frequency.update(terms)
+        documents = len(vectors)
+        self.idf = {
+            term: math.log((1 + documents) / (1 + count)) + 1
+            for term, count in document_frequency.items()
+        }
+
+        postings = defaultdict(lambda: (array("I"), array("f")))
+        for pk, terms, weights in vectors:
+            weighted = [weight * self.idf[term] for term, weight in zip(terms, weights)]
+            norm = math.sqrt(sum(weight * weight for weight in weighted)) or 1.0
+            for term, weight in zip(terms, weighted):
+                job_ids, job_weights = postings[term]
+                job_ids.append(pk)
+                job_weights.append(weight / norm)
+        self.postings = dict(postings)
+
+    def weigh(self, counts):
+        """Normalized TF-IDF vector of ``counts``, limited to indexed terms."""
+        vector = {
+            term: (1 + math.log(count)) * self.idf[term]
+            for term, count in counts.items()
+            if term in self.idf
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+    def top(self, query, limit, exclude=()):
+        """The ``limit`` best ``(job_id, score)`` pairs for a weighed query."""
+        scores = defaultdict(float)
+        for term, query_weight in query.items():
+            job_ids, job_weights = self.postings[term]
+            for pk, weight in zip(job_ids, job_weights):
+                scores[pk] += query_weight * weight
+        for pk in exclude:
+            scores.pop(pk, None)
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+
+
+_loaded = (None, None)
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def index_stamp():
+    """
+    What identifies the stored vectors: the ``jobs.jobvector`` version when the
+    cache is shared with build_job_index, else their count and latest indexing
+    time read from the database.
+    """
+    if cache_is_shared():
+        return get_versions([INDEX_VERSION])[0]
+    stamp = JobVector.objects.aggregate(count=Count("pk"), latest=Max("indexed_at"))
+    return stamp["count"], stamp["latest"]
+
+
+def get_index():
+    """This process's JobIndex, reloaded when build_job_index changes vectors."""
+    global _loaded, _checked_at
+    if (
+        _loaded[1] is not None
+        and not cache_is_shared()
+        and time.monotonic() - _checked_at < settings.JOB_INDEX_CHECK_INTERVAL
+    ):
+        return _loaded[1]
+    version = index_stamp()
+    _checked_at = time.monotonic()
+    if _loaded[0] != version:
+        with _lock:
+            if _loaded[0] != version:
+                rows = (
+                    JobVector.objects.filter(job__is_active=True)
+                    .values_list("job_id", "terms", "weights")
+                    .iterator(chunk_size=2000)
+                )
+                _loaded = (version, JobIndex(rows))
+    return _loaded[1]
+
+
+def profile_terms(user):
+    """Term frequencies of the seeker's bio, resumes and recent applications."""
+    counts = text_terms(user.bio)
+    resume_texts = ResumeText.objects.filter(
+        status="done", name__in=Resume.objects.filter(user=user).values("file")
+    ).values_list("text", flat=True)
+    for text in resume_texts[:PROFILE_RESUMES]:
+        counts.update(text_terms(text))
+    applications = (
+        JobApplication.objects.filter(applicant=user)
+        .order_by("-applied_at")
+        .values_list("job__title", "job__description", "job__requirements")
+    )
+    for title, description, requirements in applications[:PROFILE_APPLICATIONS]:
+        counts.update(listing_terms(title, description, requirements))
+    return counts
+
+
+def recommend(user, limit):
+    """
+    Return up to ``limit`` ``(listing, score)`` pairs for ``user``, best first,
+    leaving out listings they already applied to.
+    """
+    index = get_index()
+    query = index.weigh(profile_terms(user))
+    if not query:
+        return []
+
+    applied = JobApplication.objects.filter(applicant=user).values_list(
+        "job_id", flat=True
+    )
+    # Deactivated listings stay in the index until the next build
+    ranked = index.top(query, limit * 2, exclude=set(applied))
+    listings = JobListing.objects.filter(
+        not_expired(), pk__in=[pk for pk, _ in ranked], is_active=True
+    ).select_related("employer", "employer__rating_summary", "category")
+    listings = {listing.pk: listing for listing in listings}
+    return [
+        (listings[pk], score) for pk, score in ranked if pk in listings
+    ][:limit]
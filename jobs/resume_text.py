@@ -0,0 +1,115 @@
+"""
+Background text extraction for stored resume files.
+
+Saving a resume or an application queues its storage name as a pending
+ResumeText row. The extract_resumes worker leases pending rows in batches,
+downloads the files on a thread pool and parses them on a process pool
+(jobs.extraction), so requests never wait on either. Files that fail to
+download are retried with backoff; files that cannot be parsed are marked
+``failed`` at once.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .extraction import ExtractionError, extract_text
+from .models import Resume, ResumeText
+
+logger = logging.getLogger(__name__)
+
+
+def queue_resume_text(name):
+    """Queue the stored file ``name`` for extraction unless it already is."""
+    if name:
+        ResumeText.objects.bulk_create([ResumeText(name=name)], ignore_conflicts=True)
+
+
+def claim_batch(batch_size):
+    """Lease up to ``batch_size`` due rows to this worker (see notifications.outbox)."""
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            ResumeText.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=now)
+            .order_by("next_attempt_at")
+            .only("pk", "name", "attempts")[:batch_size]
+        )
+        ResumeText.objects.filter(pk__in=[row.pk for row in batch]).update(
+            next_attempt_at=now + timedelta(seconds=settings.RESUME_TEXT_LEASE_SECONDS)
+        )
+    return batch
+
+
+def read_file(name):
+    # Resume.file and JobApplication.resume share one storage backend
+    with Resume._meta.get_field("file").storage.open(name, "rb") as file:
+        return file.read()
+
+
+def extract_batch(executor=None, batch_size=None):
+    """
+    Extract the text of one leased batch.
+
+    ``executor`` runs the parsing (a process pool in the worker); without one
+    files are parsed in this process. Returns ``(extracted, failed)`` counts.
+    """
+    batch = claim_batch(batch_size or settings.RESUME_TEXT_BATCH_SIZE)
+    if not batch:
+        return 0, 0
+
+    extracted = failed = 0
+    with ThreadPoolExecutor(max_workers=settings.RESUME_TEXT_FETCH_THREADS) as fetcher:
+        downloads = [fetcher.submit(read_file, row.name) for row in batch]
+        parsing = []
+        for row, download in zip(batch, downloads):
+            try:
+                data = download.result()
+            except Exception as exc:
+                failed += 1
+                record_failure(row, exc)
+                continue
+            if executor is None:
+                parsing.append((row, None, data))
+            else:
+                parsing.append((row, executor.submit(extract_text, row.name, data), None))
+
+    for row, future, data in parsing:
+        try:
+            text = extract_text(row.name, data) if future is None else future.result()
+        except ExtractionError as exc:
+            failed += 1
+            record_failure(row, exc, final=True)
+        except Exception as exc:
+            failed += 1
+            record_failure(row, exc)
+        else:
+            extracted += 1
+            ResumeText.objects.filter(pk=row.pk).update(
+                status="done",
+                text=text,
+                attempts=row.attempts + 1,
+                last_error="",
+                extracted_at=timezone.now(),
+            )
+    return extracted, failed
+
+
+def record_failure(row, exc, final=False):
+    attempts = row.attempts + 1
+    if final or attempts >= settings.RESUME_TEXT_MAX_ATTEMPTS:
+        logger.warning(f"Giving up on resume text of {row.name}: {exc}")
+        status = "failed"
+    else:
+        status = "pending"
+    delay = settings.RESUME_TEXT_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    ResumeText.objects.filter(pk=row.pk).update(
+        status=status,
+        attempts=attempts,
+        last_error=str(exc),
+        next_attempt_at=timezone.now() + timedelta(seconds=min(delay, 3600)),
+    )
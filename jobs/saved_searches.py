@@ -0,0 +1,284 @@
+"""
+Saved job searches: incremental matching of new listings and digest emails.
+
+Each saved search is indexed as the set of terms a listing must carry to
+match it: its category, employment type, title and location words, and the
+keywords of its search text. Terms are normalized the way the live filters
+match: keywords are stemmed on both sides, like the English full-text search
+behind ``q``, and a listing carries every prefix of its title and location
+words, so a saved "dev" finds "Developer" as ``icontains`` does. A new or
+reactivated listing looks up the searches whose every term it carries with
+one grouped query over SavedSearchTerm, instead of re-running each search (a
+bulk import does so once per batch, over the terms of all its listings), and
+only those candidates are checked against what the index does not settle (the
+exact title and location substrings, salary bounds, radius). Matches wait in
+SavedSearchMatch until ``send_search_digests`` emails them, one email per user.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, prefetch_related_objects
+from django.utils import timezone
+
+from notifications.outbox import queue_emails
+from .expiry import not_expired
+from .geo import DEFAULT_RADIUS_KM, haversine_km
+from .models import JobListing, SavedSearch, SavedSearchMatch, SavedSearchTerm
+from .recommendations import tokenize
+
+# Inflectional endings, then derivational ones; (suffix, replacement)
+INFLECTIONS = (("ies", "y"), ("ied", "y"), ("ing", ""), ("ed", ""), ("s", ""))
+DERIVATIONS = (
+    ("ization", "ize"),
+    ("ational", "ate"),
+    ("ation", "ate"),
+    ("ments", ""),
+    ("ment", ""),
+    ("ness", ""),
+    ("ers", ""),
+    ("er", ""),
+    ("or", ""),
+)
+MIN_STEM = 3
+MIN_PREFIX = 2
+
+
+def strip_suffix(token, suffixes):
+    for suffix, replacement in suffixes:
+        if token.endswith(suffix):
+            stem = token[: -len(suffix)] + replacement
+            if len(stem) >= MIN_STEM and any(vowel in stem for vowel in "aeiouy"):
+                return stem
+            return token
+    return token
+
+
+def stem(token):
+    """
+    Crude English stem of ``token``: "developers", "developing", "development"
+    and "developer" all become "develop". It only has to agree with itself, as
+    both sides of a match are stemmed; words with digits or symbols ("c++",
+    "python3") are kept as they are.
+    """
+    if not token.isalpha() or len(token) <= MIN_STEM:
+        return token
+    if not token.endswith("ss"):
+        token = strip_suffix(token, INFLECTIONS)
+    token = strip_suffix(token, DERIVATIONS)
+    if len(token) > MIN_STEM and token.endswith("e"):
+        token = token[:-1]
+    if len(token) > MIN_STEM and token[-1] == token[-2]:
+        token = token[:-1]
+    return token
+
+
+def keywords(text):
+    return {stem(token) for token in tokenize(text)}
+
+
+def prefixes(text):
+    """Every prefix of every word of ``text``, for ``icontains``-like matching."""
+    return {
+        token[:length]
+        for token in tokenize(text)
+        for length in range(MIN_PREFIX, len(token) + 1)
+    }
+
+
+def search_terms(filters, search):
+    """The ``(kind, value)`` terms a listing needs to match a saved search."""
+    terms = set()
+    if filters.get("category") is not None:
+        terms.add(("category", str(filters["category"])))
+    if filters.get("employment_type"):
+        terms.add(("employment_type", filters["employment_type"]))
+    for kind in ("title", "location"):
+        terms.update((kind, token) for token in tokenize(filters.get(kind)))
+    terms.update(("keyword", token) for token in keywords(search))
+    return terms
+
+
+def listing_terms(listing):
+    """Every ``(kind, value)`` term a saved search could require of ``listing``."""
+    terms = {
+        ("category", str(listing.category_id)),
+        ("employment_type", listing.employment_type),
+    }
+    terms.update(("title", prefix) for prefix in prefixes(listing.title))
+    terms.update(("location", prefix) for prefix in prefixes(listing.location))
+    text = " ".join(
+        (listing.title, listing.description, listing.requirements, listing.location)
+    )
+    terms.update(("keyword", token) for token in keywords(text))
+    return terms
+
+
+def index_search(search):
+    """Replace the index terms of ``search`` after it was saved."""
+    terms = search_terms(search.filters, search.search)
+    with transaction.atomic():
+        SavedSearchTerm.objects.filter(search=search).delete()
+        SavedSearchTerm.objects.bulk_create(
+            SavedSearchTerm(search=search, kind=kind, value=value)
+            for kind, value in terms
+        )
+        SavedSearch.objects.filter(pk=search.pk).update(term_count=len(terms))
+    search.term_count = len(terms)
+
+
+def matches(search, listing):
+    """Check what the index leaves out (exact substrings, salary, radius)."""
+    filters = search.filters
+    for name in ("title", "location"):
+        value = filters.get(name)
+        if value and value.lower() not in getattr(listing, name).lower():
+            return False
+    salary_min = filters.get("salary_min")
+    if salary_min is not None and (
+        listing.salary_min is None or listing.salary_min < Decimal(salary_min)
+    ):
+        return False
+    salary_max = filters.get("salary_max")
+    if salary_max is not None and (
+        listing.salary_max is None or listing.salary_max > Decimal(salary_max)
+    ):
+        return False
+    near = filters.get("near")
+    if near is not None:
+        place = listing.place
+        radius_km = float(filters.get("radius_km", DEFAULT_RADIUS_KM))
+        if place is None or (
+            haversine_km(*near, place.latitude, place.longitude) > radius_km
+        ):
+            return False
+    return True
+
+
+def match_listing(listing):
+    """Record ``listing`` against every saved search it satisfies."""
+    return match_listings([listing])
+
+
+def match_listings(listings):
+    """
+    Record each of ``listings`` against every saved search it satisfies; a
+    batch shares the index lookups. Returns the number of matches recorded.
+    """
+    listings = [listing for listing in listings if listing.is_active]
+    if not listings:
+        return 0
+
+    carried = [listing_terms(listing) for listing in listings]
+    by_kind = defaultdict(set)
+    for terms in carried:
+        for kind, value in terms:
+            by_kind[kind].add(value)
+    condition = Q()
+    for kind, values in by_kind.items():
+        condition |= Q(kind=kind, value__in=values)
+    # Searches hitting all of their terms, found in one grouped pass
+    fully_matched = (
+        SavedSearchTerm.objects.filter(condition)
+        .values("search_id", "search__term_count")
+        .annotate(hits=Count("id"))
+        .filter(hits=F("search__term_count"))
+        .values("search_id")
+    )
+    candidates = list(
+        SavedSearch.objects.filter(Q(pk__in=fully_matched) | Q(term_count=0))
+        .order_by()
+        .only("pk", "filters")
+    )
+    if not candidates:
+        return 0
+
+    required = defaultdict(set)
+    if len(listings) > 1:
+        # Across a batch a search's terms may be spread over several listings
+        rows = SavedSearchTerm.objects.filter(
+            search__in=[search.pk for search in candidates]
+        ).values_list("search_id", "kind", "value")
+        for search_id, kind, value in rows:
+            required[search_id].add((kind, value))
+    if any("near" in search.filters for search in candidates):
+        prefetch_related_objects(listings, "place")
+
+    found = [
+        SavedSearchMatch(search=search, job=listing)
+        for listing, terms in zip(listings, carried)
+        for search in candidates
+        if required[search.pk] <= terms and matches(search, listing)
+    ]
+    SavedSearchMatch.objects.bulk_create(found, ignore_conflicts=True)
+    return len(found)
+
+
+def send_digests():
+    """
+    Queue one email per user listing their saved searches' new matches, and
+    mark those matches as notified. Returns the number of emails queued.
+    """
+    limit = settings.SAVED_SEARCH_DIGEST_LIMIT
+    pending = (
+        SavedSearchMatch.objects.filter(notified_at__isnull=True)
+        .select_related("search__user", "job")
+        .order_by("search__user_id", "search_id", "-matched_at")
+    )
+    digests = defaultdict(lambda: defaultdict(list))
+    users = {}
+    match_ids = []
+    today = timezone.localdate()
+    for match in pending.iterator(chunk_size=1000):
+        match_ids.append(match.pk)
+        # Closed or expired listings are skipped, not announced
+        job = match.job
+        if not job.is_active or (job.deadline and job.deadline < today):
+            continue
+        users[match.search.user_id] = match.search.user
+        digests[match.search.user_id][match.search].append(job)
+
+    emails = [
+        digest_email(users[user_id], searches, limit)
+        for user_id, searches in digests.items()
+    ]
+    with transaction.atomic():
+        queue_emails(emails)
+        now = timezone.now()
+        for start in range(0, len(match_ids), 1000):
+            SavedSearchMatch.objects.filter(
+                pk__in=match_ids[start : start + 1000]
+            ).update(notified_at=now)
+    return len(emails)
+
+
+def digest_email(user, searches, limit):
+    sections = []
+    for search, jobs in searches.items():
+        lines = [f"{search.name} ({len(jobs)} new):"]
+        lines += [f"- {job.title} ({job.location})" for job in jobs[:limit]]
+        if len(jobs) > limit:
+            lines.append(f"- and {len(jobs) - limit} more")
+        sections.append("\n        ".join(lines))
+    body = "\n\n        ".join(sections)
+    subject = "New jobs matching your saved searches"
+    message = f"""
+        Dear {user.first_name},
+
+        New jobs were posted that match your saved searches:
+
+        {body}
+
+        Best regards,
+        CareerConnect Team
+        """
+    return subject, message, user.email
+
+
+def saved_search_listings(search):
+    """Active listings matched to ``search``, newest match first."""
+    return JobListing.objects.filter(
+        not_expired(), is_active=True, search_matches__search=search
+    ).order_by("-search_matches__matched_at")
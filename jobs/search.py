@@ -0,0 +1,235 @@
+"""
+Ranked full-text search for job listings, and search of applicants' resumes.
+
+On PostgreSQL every listing carries a weighted ``search_vector`` tsvector column
+(generated from its text columns and GIN indexed, see migration 0003), and so
+does every extracted resume text (migration 0010). On SQLite FTS5 sidecar tables
+are kept in sync with those tables through triggers, so local runs get the same
+behaviour.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from .models import JobListing, ResumeText
+
+SEARCH_CONFIG = "english"
+FTS_TABLE = "jobs_joblisting_fts"
+SEARCH_COLUMNS = ("title", "description", "requirements", "location")
+RESUME_FTS_TABLE = "jobs_resumetext_fts"
+
+# Model, FTS5 sidecar table and indexed columns on SQLite
+SQLITE_INDEXES = (
+    (JobListing, FTS_TABLE, SEARCH_COLUMNS),
+    (ResumeText, RESUME_FTS_TABLE, ("text",)),
+)
+
+# bm25() weights, in the same order as SEARCH_COLUMNS. These mirror the
+# A/D/C/B weights used for the PostgreSQL tsvector.
+FTS_WEIGHTS = (10.0, 1.0, 2.5, 5.0)
+
+
+def _fts5_query(text):
+    """Turn free text into an FTS5 query where every word is a quoted term."""
+    return " ".join(f'"{term}"' for term in re.findall(r"\w+", text))
+
+
+def search_listings(queryset, text):
+    """
+    Filter a JobListing queryset down to rows matching ``text`` and annotate
+    each row with ``search_rank`` (higher is more relevant).
+    """
+    table = JobListing._meta.db_table
+    vendor = connections[queryset.db].vendor
+
+    if vendor == "postgresql":
+        tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        return queryset.filter(
+            RawSQL(
+                f"{table}.search_vector @@ {tsquery}",
+                [text],
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank_cd({table}.search_vector, {tsquery})",
+                [text],
+                output_field=FloatField(),
+            )
+        )
+
+    if vendor == "sqlite":
+        query = _fts5_query(text)
+        if not query:
+            return queryset.none()
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query]
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+                [query],
+                output_field=FloatField(),
+            )
+        )
+
+    # Unknown backend: fall back to unranked substring matching.
+    condition = Q()
+    for column in SEARCH_COLUMNS:
+        condition |= Q(**{f"{column}__icontains": text})
+    return queryset.filter(condition).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
+
+
+def search_resumes(queryset, text):
+    """
+    Filter a JobApplication queryset down to applications whose extracted
+    resume text matches ``text``.
+    """
+    matches = ResumeText.objects.filter(status="done")
+    table = ResumeText._meta.db_table
+    vendor = connections[queryset.db].vendor
+
+    if vendor == "postgresql":
+        matches = matches.filter(
+            RawSQL(
+                f"{table}.search_vector @@ websearch_to_tsquery('{SEARCH_CONFIG}', %s)",
+                [text],
+                output_field=BooleanField(),
+            )
+        )
+    elif vendor == "sqlite":
+        query = _fts5_query(text)
+        if not query:
+            return queryset.none()
+        matches = matches.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {RESUME_FTS_TABLE} "
+                f"WHERE {RESUME_FTS_TABLE} MATCH %s",
+                [query],
+            )
+        )
+    else:
+        matches = matches.filter(text__icontains=text)
+    return queryset.filter(resume__in=matches.values("name"))
+
+
+def install_sqlite_index(using="default"):
+    """
+    Create the FTS5 sidecar tables and their sync triggers on SQLite.
+
+    Safe to call repeatedly. SQLite rebuilds a table for many schema changes,
+    which drops its triggers, so this runs after every migrate and re-indexes a
+    table whenever its triggers had to be recreated.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+
+    tables = set(connection.introspection.table_names())
+    for model, fts_table, columns in SQLITE_INDEXES:
+        # Skip tables a partial migrate has not created yet
+        if model._meta.db_table in tables:
+            install_fts_table(connection, model._meta.db_table, fts_table, columns)
+
+
+def install_fts_table(connection, table, fts_table, search_columns):
+    columns = ", ".join(search_columns)
+    new_values = ", ".join(f"new.{column}" for column in search_columns)
+    old_values = ", ".join(f"old.{column}" for column in search_columns)
+    delete_row = (
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_row = (
+        f"INSERT INTO {fts_table}(rowid, {columns}) VALUES (new.id, {new_values});"
+    )
+    triggers = {
+        f"{fts_table}_ai": f"AFTER INSERT ON {table} BEGIN {insert_row} END",
+        f"{fts_table}_ad": f"AFTER DELETE ON {table} BEGIN {delete_row} END",
+        f"{fts_table}_au": (
+            f"AFTER UPDATE OF {columns} ON {table} BEGIN {delete_row} {insert_row} END"
+        ),
+    }
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN (%s)"
+            % ", ".join(["%s"] * len(triggers)),
+            list(triggers),
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if existing == set(triggers):
+            return
+
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+            f"{columns}, content='{table}', content_rowid='id', "
+            f"tokenize='porter unicode61')"
+        )
+        for name, body in triggers.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search driven by the ``q`` query parameter.
+
+    Results are ordered by relevance unless the client asks for an explicit
+    ``ordering``. Must be listed after ``OrderingFilter`` in ``filter_backends``.
+    """
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text:
+            return queryset
+
+        queryset = search_listings(queryset, text)
+        if not request.query_params.get(OrderingFilter.ordering_param):
+            queryset = queryset.order_by("-search_rank", "-created_at")
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search, results ranked by relevance.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+
+class ResumeSearchFilter(BaseFilterBackend):
+    """Filter applications by the text of their resumes (``q`` parameter)."""
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text:
+            return queryset
+        return search_resumes(queryset, text)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search of the applicants' resumes.",
+                "schema": {"type": "string"},
+            },
+        ]
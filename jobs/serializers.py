@@ -1,8 +1,21 @@
 from rest_framework import serializers
-from django.contrib.auth import get_user_model
-from .models import JobCategory, JobListing, JobApplication, Resume, EmployerReview
-from django.core.mail import send_mail
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from .models import (
+    JobCategory,
+    JobListing,
+    JobApplication,
+    Resume,
+    EmployerReview,
+    SavedSearch,
+)
+from django.db import transaction
+from career_connect.storage import retain
+from career_connect.uploads import UploadError, redeem_ticket
+from notifications.outbox import queue_email
+from .filters import JobListingFilter
+from .ratings import rating_data
 
 User = get_user_model()
 
@@ -17,15 +30,23 @@ class JobCategorySerializer(serializers.ModelSerializer):
 
 
 class EmployerBasicSerializer(serializers.ModelSerializer):
+    rating = serializers.SerializerMethodField()
+
     class Meta:
         model = User
-        fields = ("id", "email", "company_name", "first_name", "last_name")
+        fields = ("id", "email", "company_name", "first_name", "last_name", "rating")
+
+    def get_rating(self, obj):
+        # Select employer__rating_summary with the employer to avoid a query per row
+        return rating_data(obj)
 
 
 class JobListingSerializer(serializers.ModelSerializer):
     employer_info = EmployerBasicSerializer(source="employer", read_only=True)
     category_name = serializers.CharField(source="category.name", read_only=True)
-    application_count = serializers.SerializerMethodField()
+    application_count = serializers.IntegerField(read_only=True)
+    # Only present when the list was filtered with near=lat,lon
+    distance_km = serializers.FloatField(read_only=True)
 
     class Meta:
         model = JobListing
@@ -47,12 +68,10 @@ class JobListingSerializer(serializers.ModelSerializer):
             "updated_at",
             "deadline",
             "application_count",
+            "distance_km",
         )
         read_only_fields = ("id", "employer", "created_at", "updated_at")
 
-    def get_application_count(self, obj):
-        return obj.applications.count()
-
     def validate(self, attrs):
         # Ensure only employers can create job listings
         request = self.context.get("request")
@@ -61,10 +80,47 @@ class JobListingSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class JobListingImportSerializer(serializers.ModelSerializer):
+    """Validates one row of a bulk import without per-row queries."""
+
+    # Resolved against the categories preloaded into context["categories"]
+    category = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = JobListing
+        fields = (
+            "title",
+            "description",
+            "requirements",
+            "location",
+            "category",
+            "employment_type",
+            "salary_min",
+            "salary_max",
+            "is_active",
+            "deadline",
+        )
+
+    def validate_category(self, value):
+        if value is None:
+            return None
+        category = self.context["categories"].get(value)
+        if category is None:
+            raise serializers.ValidationError(f"Category {value} does not exist.")
+        return category
+
+
 class JobApplicationSerializer(serializers.ModelSerializer):
     applicant_info = serializers.SerializerMethodField()
     job_title = serializers.CharField(source="job.title", read_only=True)
     job_info = serializers.SerializerMethodField()
+    resume_id = serializers.PrimaryKeyRelatedField(
+        source="source_resume",
+        queryset=Resume.objects.all(),
+        required=False,
+        allow_null=True,
+        help_text="One of your resumes; defaults to your primary resume.",
+    )
 
     class Meta:
         model = JobApplication
@@ -76,12 +132,14 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             "applicant",
             "applicant_info",
             "resume",
+            "resume_id",
             "cover_letter",
             "status",
             "applied_at",
             "updated_at",
         )
         read_only_fields = ("id", "applicant", "applied_at", "updated_at")
+        extra_kwargs = {"resume": {"required": False}}
     
     def get_job_info(self, obj):
         return {
@@ -112,17 +170,70 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             job = attrs.get("job")
             if JobApplication.objects.filter(job=job, applicant=request.user).exists():
                 raise serializers.ValidationError("You have already applied for this job.")
+        else:
+            # An application stays with the listing it was made for; moving it
+            # would leave both listings' application_count wrong
+            attrs.pop("job", None)
 
+        self.attach_resume(attrs)
         return attrs
 
+    def validate_resume_id(self, value):
+        request = self.context.get("request")
+        if value is not None and request and value.user_id != request.user.id:
+            raise serializers.ValidationError("Select one of your resumes.")
+        return value
+
+    def attach_resume(self, attrs):
+        """Point the application at a stored resume unless a file was uploaded."""
+        resume = attrs.get("source_resume")
+        if attrs.get("resume"):
+            if resume is not None:
+                raise serializers.ValidationError(
+                    "Upload a resume file or select a resume_id, not both."
+                )
+            attrs["source_resume"] = None
+            return
+
+        if resume is None:
+            if self.instance:
+                return
+            resume = (
+                Resume.objects.filter(user=self.context["request"].user)
+                .order_by("-is_primary", "-uploaded_at")
+                .first()
+            )
+            if resume is None:
+                raise serializers.ValidationError(
+                    {"resume": "Upload a resume file or add a resume to your profile."}
+                )
+            attrs["source_resume"] = resume
+        # Reuse the stored object; a committed file name is never re-uploaded
+        attrs["resume"] = resume.file.name
+
+    def update(self, instance, validated_data):
+        previous = instance.resume.name
+        with transaction.atomic():
+            application = super().update(instance, validated_data)
+            if application.resume.name != previous:
+                # Uploads are counted by the storage; stored resumes are shared
+                if validated_data.get("source_resume"):
+                    retain(application.resume.name)
+                storage = application.resume.storage
+                if hasattr(storage, "release_reference"):
+                    storage.release_reference(previous)
+        return application
+
     def create(self, validated_data):
-        application = super().create(validated_data)
+        # Queue both emails in the same transaction as the application row
+        with transaction.atomic():
+            application = super().create(validated_data)
 
-        # Send email to job seeker
-        self.send_application_confirmation(application)
+            # Send email to job seeker
+            self.send_application_confirmation(application)
 
-        # Send email to employer
-        self.send_employer_notification(application)
+            # Send email to employer
+            self.send_employer_notification(application)
 
         return application
 
@@ -144,13 +255,7 @@ class JobApplicationSerializer(serializers.ModelSerializer):
         CareerConnect Team
         """
 
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [application.applicant.email],
-            fail_silently=True,
-        )
+        queue_email(subject, message, application.applicant.email)
 
     def send_employer_notification(self, application):
         subject = f"New Application: {application.job.title}"
@@ -170,13 +275,7 @@ class JobApplicationSerializer(serializers.ModelSerializer):
         CareerConnect Team
         """
 
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [application.job.employer.email],
-            fail_silently=True,
-        )
+        queue_email(subject, message, application.job.employer.email)
 
 
 class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
@@ -185,6 +284,38 @@ class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
         fields = ("status",)
 
 
+class ApplicationBulkStatusSerializer(serializers.Serializer):
+    """Target status -> ids of the applications to move to it."""
+
+    transitions = serializers.DictField(
+        child=serializers.ListField(
+            child=serializers.IntegerField(min_value=1), allow_empty=False
+        ),
+        allow_empty=False,
+    )
+
+    def validate_transitions(self, value):
+        statuses = dict(JobApplication.STATUS_CHOICES)
+        unknown = sorted(set(value) - set(statuses))
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown status: {', '.join(unknown)}. "
+                f"Choose from: {', '.join(statuses)}."
+            )
+
+        ids = [pk for pks in value.values() for pk in pks]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError(
+                "An application can only be moved to one status."
+            )
+        limit = settings.BULK_STATUS_MAX_APPLICATIONS
+        if len(ids) > limit:
+            raise serializers.ValidationError(
+                f"At most {limit} applications can be updated at once."
+            )
+        return value
+
+
 class ResumeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Resume
@@ -200,6 +331,45 @@ class ResumeSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "user", "uploaded_at", "updated_at")
 
 
+RESUME_EXTENSIONS = (".pdf", ".doc", ".docx", ".odt", ".rtf", ".txt")
+
+
+class ResumeUploadTicketSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+
+    def validate_filename(self, value):
+        if not value.lower().endswith(RESUME_EXTENSIONS):
+            raise serializers.ValidationError(
+                f"Allowed file types: {', '.join(RESUME_EXTENSIONS)}."
+            )
+        return value
+
+
+class ResumeUploadConfirmSerializer(serializers.Serializer):
+    """Record a resume uploaded straight to storage with an upload ticket."""
+
+    ticket = serializers.CharField()
+    receipt = serializers.DictField(help_text="The storage service's upload response.")
+    title = serializers.CharField(max_length=255)
+    is_primary = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        try:
+            attrs["file"] = redeem_ticket(
+                self.context["request"].user, attrs.pop("ticket"), attrs.pop("receipt")
+            )
+        except UploadError as exc:
+            raise serializers.ValidationError({"ticket": str(exc)})
+        if Resume.objects.filter(file=attrs["file"]).exists():
+            raise serializers.ValidationError(
+                {"ticket": "This upload has already been confirmed."}
+            )
+        return attrs
+
+    def create(self, validated_data):
+        return Resume.objects.create(user=self.context["request"].user, **validated_data)
+
+
 class EmployerReviewSerializer(serializers.ModelSerializer):
     reviewer_info = serializers.SerializerMethodField()
     employer_name = serializers.CharField(
@@ -229,7 +399,8 @@ class EmployerReviewSerializer(serializers.ModelSerializer):
 
     def validate(self, attrs):
         request = self.context.get("request")
-        employer = attrs.get("employer")
+        # Partial updates may leave the employer out
+        employer = attrs.get("employer") or getattr(self.instance, "employer", None)
 
         if request and request.user.user_type != "job_seeker":
             raise serializers.ValidationError("Only job seekers can leave reviews.")
@@ -238,11 +409,60 @@ class EmployerReviewSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Reviews can only be given to employers.")
 
         # Check if already reviewed
-        if EmployerReview.objects.filter(
-            employer=employer, reviewer=request.user
-        ).exists():
+        existing = EmployerReview.objects.filter(employer=employer, reviewer=request.user)
+        if self.instance is not None:
+            existing = existing.exclude(pk=self.instance.pk)
+        if existing.exists():
             raise serializers.ValidationError(
                 "You have already reviewed this employer."
             )
 
         return attrs
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SavedSearch
+        fields = ("id", "name", "filters", "search", "created_at", "updated_at")
+        read_only_fields = ("id", "created_at", "updated_at")
+
+    def validate_filters(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Expected an object of job filters.")
+        unknown = sorted(set(value) - set(JobListingFilter.base_filters))
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown filter: {', '.join(unknown)}. "
+                f"Choose from: {', '.join(JobListingFilter.base_filters)}."
+            )
+        filterset = JobListingFilter(value, queryset=JobListing.objects.none())
+        if not filterset.is_valid():
+            raise serializers.ValidationError(filterset.errors)
+
+        # Store the cleaned values, so matching never re-parses client input
+        cleaned = {}
+        for name, item in filterset.form.cleaned_data.items():
+            if item in (None, ""):
+                continue
+            if name == "category":
+                item = int(item)
+            elif isinstance(item, Decimal):
+                item = str(item)
+            cleaned[name] = item
+        return cleaned
+
+    def validate(self, attrs):
+        filters = attrs.get("filters", getattr(self.instance, "filters", {}))
+        search = attrs.get("search", getattr(self.instance, "search", ""))
+        if not filters and not search.strip():
+            raise serializers.ValidationError(
+                "Add at least one filter or a search term."
+            )
+
+        limit = settings.SAVED_SEARCH_MAX_PER_USER
+        user = self.context["request"].user
+        if self.instance is None and user.saved_searches.count() >= limit:
+            raise serializers.ValidationError(
+                f"You can keep at most {limit} saved searches."
+            )
+        return attrs
@@ -0,0 +1,165 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from api.cache import bump_version
+from career_connect.storage import retain
+from .dashboard import invalidate_dashboard
+from .geo import place_id_for
+from .models import (
+    EmployerReview,
+    JobApplication,
+    JobCategory,
+    JobListing,
+    Resume,
+    SavedSearch,
+)
+from .ratings import adjust_rating_summary
+from .resume_text import queue_resume_text
+from .saved_searches import index_search, match_listing
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=JobApplication)
+def increment_application_count(sender, instance, created, **kwargs):
+    """Count a new application against its job listing."""
+    if created:
+        JobListing.objects.filter(pk=instance.job_id).update(
+            application_count=F("application_count") + 1
+        )
+        bump_version("jobs.jobapplication")
+
+
+@receiver(post_delete, sender=JobApplication)
+def decrement_application_count(sender, instance, **kwargs):
+    """Release a deleted application from its job listing's count."""
+    JobListing.objects.filter(pk=instance.job_id, application_count__gt=0).update(
+        application_count=F("application_count") - 1
+    )
+    bump_version("jobs.jobapplication")
+
+
+@receiver(pre_save, sender=EmployerReview)
+def remember_previous_rating(sender, instance, **kwargs):
+    """Keep the stored employer and rating, so an edit can move the review's vote."""
+    instance._previous_rating = None
+    if instance.pk:
+        instance._previous_rating = (
+            EmployerReview.objects.filter(pk=instance.pk)
+            .values_list("employer_id", "rating")
+            .first()
+        )
+
+
+@receiver(post_save, sender=EmployerReview)
+def count_review_rating(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, "_previous_rating", None)
+    if previous == (instance.employer_id, instance.rating):
+        return
+    if previous:
+        adjust_rating_summary(*previous, -1, rebuild_missing=False)
+    adjust_rating_summary(instance.employer_id, instance.rating, 1)
+
+
+@receiver(post_delete, sender=EmployerReview)
+def discount_review_rating(sender, instance, **kwargs):
+    # Never rebuild here: the employer itself may be being deleted
+    adjust_rating_summary(
+        instance.employer_id, instance.rating, -1, rebuild_missing=False
+    )
+
+
+@receiver(post_save, sender=JobApplication)
+def retain_referenced_resume(sender, instance, created, **kwargs):
+    """An application pointing at a stored resume shares its stored object."""
+    if created and instance.source_resume_id:
+        retain(instance.resume.name)
+
+
+@receiver(post_save, sender=JobApplication)
+@receiver(post_save, sender=Resume)
+def queue_resume_extraction(sender, instance, created, **kwargs):
+    """Have the extract_resumes worker read a newly stored resume file."""
+    if sender is JobApplication:
+        # An application's file never changes after it is submitted
+        if created:
+            queue_resume_text(instance.resume.name)
+    else:
+        queue_resume_text(instance.file.name)
+
+
+@receiver(post_delete, sender=JobApplication)
+@receiver(post_delete, sender=Resume)
+def release_stored_file(sender, instance, **kwargs):
+    """Give up the deleted row's reference to its stored file."""
+    file = instance.resume if sender is JobApplication else instance.file
+    if hasattr(file.storage, "release_reference"):
+        file.storage.release_reference(file.name)
+
+
+@receiver([post_save, post_delete], sender=JobListing)
+@receiver([post_save, post_delete], sender=EmployerReview)
+def invalidate_employer_dashboard(sender, instance, **kwargs):
+    invalidate_dashboard(instance.employer_id)
+
+
+@receiver([post_save, post_delete], sender=JobApplication)
+def invalidate_application_dashboards(sender, instance, **kwargs):
+    # Skip the job lookup entirely when the dashboard cache is off
+    if not settings.DASHBOARD_CACHE_TIMEOUT:
+        return
+    invalidate_dashboard(instance.applicant_id, instance.job.employer_id)
+
+
+@receiver([post_save, post_delete], sender=Resume)
+def invalidate_job_seeker_dashboard(sender, instance, **kwargs):
+    invalidate_dashboard(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=JobListing)
+@receiver([post_save, post_delete], sender=JobCategory)
+def bump_response_cache_version(sender, instance, **kwargs):
+    """Retire cached public responses built from the changed model."""
+    bump_version(sender._meta.label_lower)
+
+
+@receiver([post_save, post_delete], sender=User)
+def bump_employer_cache_version(sender, instance, update_fields=None, **kwargs):
+    # Only employer details appear in public responses; logins touch last_login only
+    if instance.user_type != "employer" or update_fields == frozenset({"last_login"}):
+        return
+    bump_version(sender._meta.label_lower)
+
+
+@receiver(pre_save, sender=JobListing)
+def resolve_listing_place(sender, instance, **kwargs):
+    """Attach the gazetteer place the listing's location names, if any."""
+    instance.place_id = place_id_for(instance.location)
+
+
+@receiver(post_save, sender=SavedSearch)
+def index_saved_search(sender, instance, **kwargs):
+    index_search(instance)
+
+
+@receiver(pre_save, sender=JobListing)
+def remember_previous_activity(sender, instance, update_fields=None, **kwargs):
+    """Keep whether a listing being activated was stored inactive."""
+    instance._reactivated = False
+    if instance._state.adding or not instance.is_active:
+        return
+    if update_fields is not None and "is_active" not in update_fields:
+        return
+    instance._reactivated = JobListing.objects.filter(
+        pk=instance.pk, is_active=False
+    ).exists()
+
+
+@receiver(post_save, sender=JobListing)
+def match_saved_searches(sender, instance, created, **kwargs):
+    """Queue a new or reactivated listing for its saved searches' digests."""
+    if created or getattr(instance, "_reactivated", False):
+        match_listing(instance)
@@ -1,2 +1,1349 @@
-from django.test import TestCase
-# Create your tests here.
\ No newline at end of file
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from accounts.views import CustomTokenObtainPairSerializer
+from api.cache import get_cache
+from .models import (
+    JobCategory,
+    JobListing,
+    JobApplication,
+    Resume,
+    ResumeText,
+    EmployerReview,
+    SavedSearch,
+    SavedSearchMatch,
+)
+
+
+class ApplicationCountTests(TestCase):
+    """application_count is served from the listing row, not a COUNT per row."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(
+            email="employer@example.com",
+            password="pass",
+            user_type="employer",
+            company_name="Acme",
+            is_verified=True,
+        )
+        cls.category = JobCategory.objects.create(name="Information Technology")
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def create_listings(self, count):
+        return [
+            JobListing.objects.create(
+                employer=self.employer,
+                title=f"Job {index}",
+                description="Description",
+                requirements="Requirements",
+                location="Dhaka",
+                category=self.category,
+            )
+            for index in range(count)
+        ]
+
+    def create_application(self, job, index):
+        applicant = User.objects.create_user(
+            email=f"seeker{job.pk}-{index}@example.com",
+            password="pass",
+            user_type="job_seeker",
+        )
+        return JobApplication.objects.create(
+            job=job, applicant=applicant, resume="resumes/cv.pdf"
+        )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_counter_follows_applications(self):
+        job = self.create_listings(1)[0]
+        first = self.create_application(job, 1)
+        self.create_application(job, 2)
+        job.refresh_from_db()
+        self.assertEqual(job.application_count, 2)
+
+        first.delete()
+        job.refresh_from_db()
+        self.assertEqual(job.application_count, 1)
+
+        response = self.client.get(f"/api/v1/jobs/{job.pk}/")
+        self.assertEqual(response.data["application_count"], 1)
+
+    def test_editing_a_listing_keeps_the_counter(self):
+        job = self.create_listings(1)[0]
+        self.create_application(job, 1)
+        # The in-memory listing still holds application_count=0
+        job.title = "Renamed"
+        job.save()
+        job.refresh_from_db()
+        self.assertEqual(job.application_count, 1)
+
+        self.client.force_authenticate(self.employer)
+        self.create_application(job, 2)
+        response = self.client.patch(
+            f"/api/v1/jobs/{job.pk}/", {"title": "Renamed again"}, format="json"
+        )
+        self.assertEqual(response.data["application_count"], 2)
+        job.refresh_from_db()
+        self.assertEqual(job.application_count, 2)
+
+    def test_updating_an_application_keeps_its_job(self):
+        job, other = self.create_listings(2)
+        application = self.create_application(job, 1)
+        self.client.force_authenticate(application.applicant)
+
+        response = self.client.patch(
+            f"/api/v1/applications/{application.pk}/",
+            {"job": other.pk, "cover_letter": "Updated"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        application.refresh_from_db()
+        self.assertEqual(application.job_id, job.pk)
+        self.assertEqual(application.cover_letter, "Updated")
+        job.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((job.application_count, other.application_count), (1, 0))
+
+    def test_job_list_query_count_is_constant(self):
+        listings = self.create_listings(2)
+        self.create_application(listings[0], 1)
+        small = self.count_queries("/api/v1/jobs/")
+
+        for job in self.create_listings(12):
+            self.create_application(job, 1)
+        large = self.count_queries("/api/v1/jobs/")
+
+        self.assertEqual(small, large)
+
+    def test_my_listings_query_count_is_constant(self):
+        self.client.force_authenticate(self.employer)
+        self.create_listings(1)
+        small = self.count_queries("/api/v1/jobs/my_listings/")
+
+        for job in self.create_listings(12):
+            self.create_application(job, 1)
+        large = self.count_queries("/api/v1/jobs/my_listings/")
+
+        self.assertEqual(small, large)
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=300)
+class JobFacetTests(TestCase):
+    """Facet counts come from one grouped query, cached per normalized search."""
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        it = JobCategory.objects.create(name="Information Technology")
+        design = JobCategory.objects.create(name="Design")
+        for title, category, location, employment_type, salary_min in (
+            ("Python Developer", it, "Dhaka", "full_time", 30000),
+            ("Python Intern", it, "Dhaka", "internship", None),
+            ("Django Developer", it, "Chittagong", "contract", 80000),
+            ("Python Designer", design, "Dhaka", "full_time", 120000),
+        ):
+            JobListing.objects.create(
+                employer=employer,
+                title=title,
+                description="Description",
+                requirements="Requirements",
+                location=location,
+                category=category,
+                employment_type=employment_type,
+                salary_min=salary_min,
+            )
+
+    def test_counts_follow_the_search(self):
+        client = APIClient()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get("/api/v1/jobs/", {"facets": "true", "search": "Python"})
+        # The facets add one query to the list's COUNT and page
+        self.assertEqual(len(context.captured_queries), 3)
+        plain = client.get("/api/v1/jobs/", {"search": "Python"})
+        self.assertNotIn("facets", plain.data)
+
+        facets = response.data["facets"]
+        self.assertEqual(facets["total"], 3)
+        self.assertEqual(
+            [(facet["name"], facet["count"]) for facet in facets["category"]],
+            [("Information Technology", 2), ("Design", 1)],
+        )
+        self.assertEqual(
+            {facet["value"]: facet["count"] for facet in facets["employment_type"]},
+            {"full_time": 2, "part_time": 0, "contract": 0, "internship": 1, "freelance": 0},
+        )
+        self.assertEqual(facets["location"], [{"value": "Dhaka", "count": 3}])
+        self.assertEqual(
+            {facet["value"]: facet["count"] for facet in facets["salary_band"]},
+            {
+                "under_25k": 0,
+                "25k_50k": 1,
+                "50k_75k": 0,
+                "75k_100k": 0,
+                "100k_plus": 1,
+                "unspecified": 1,
+            },
+        )
+
+        # Same search, other page size and spelling: the list runs, the facets are cached
+        with CaptureQueriesContext(connection) as context:
+            again = client.get(
+                "/api/v1/jobs/", {"facets": "1", "search": " python ", "page_size": 2}
+            )
+        self.assertEqual(len(context.captured_queries), 2)
+        self.assertEqual(again.data["facets"], facets)
+
+
+class SearchRankingTests(TestCase):
+    """``q`` keeps matching listings only, most relevant first."""
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        for title, description, requirements in (
+            ("Office Manager", "Keeps the office running", "Python scripting a plus"),
+            ("Data Analyst", "Reports built with Python", "SQL"),
+            ("Python Developers", "Python services for our Python platform", "Python"),
+            ("Graphic Designer", "Brand work", "Figma"),
+        ):
+            JobListing.objects.create(
+                employer=employer,
+                title=title,
+                description=description,
+                requirements=requirements,
+                location="Dhaka",
+            )
+
+    def titles(self, **params):
+        response = APIClient().get("/api/v1/jobs/", params)
+        self.assertEqual(response.status_code, 200)
+        return [job["title"] for job in response.data["results"]]
+
+    def test_ranks_by_relevance(self):
+        # Title hits outrank requirements, which outrank description
+        self.assertEqual(
+            self.titles(q="python"),
+            ["Python Developers", "Office Manager", "Data Analyst"],
+        )
+        # Words are stemmed and every one must match
+        self.assertEqual(self.titles(q="python developer"), ["Python Developers"])
+        self.assertEqual(self.titles(q="kotlin"), [])
+
+    def test_ordering_overrides_the_rank(self):
+        self.assertEqual(
+            self.titles(q="python", ordering="title"),
+            ["Data Analyst", "Office Manager", "Python Developers"],
+        )
+
+
+@override_settings(JOB_INDEX_CHECK_INTERVAL=0)
+class RecommendationTests(TestCase):
+    """Recommendations rank indexed listings against the seeker's profile."""
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        category = JobCategory.objects.create(name="Information Technology")
+        cls.listings = {
+            title: JobListing.objects.create(
+                employer=employer,
+                title=title,
+                description=description,
+                requirements="Requirements",
+                location="Dhaka",
+                category=category,
+            )
+            for title, description in (
+                ("Python Developer", "Build Django APIs"),
+                ("Django Engineer", "Python services and REST APIs"),
+                ("Graphic Designer", "Brand and print design"),
+                ("Python Data Analyst", "Reporting with pandas"),
+            )
+        }
+        cls.seeker = User.objects.create_user(
+            email="seeker@example.com",
+            password="pass",
+            user_type="job_seeker",
+            bio="Backend developer working with Python and Django REST APIs",
+        )
+        JobApplication.objects.create(
+            job=cls.listings["Python Developer"],
+            applicant=cls.seeker,
+            resume="resumes/cv.pdf",
+        )
+
+    def test_recommends_similar_unapplied_listings(self):
+        from .recommendations import index_listings
+
+        self.assertEqual(index_listings(), (4, 0))
+        self.assertEqual(index_listings(), (0, 0))
+
+        client = APIClient()
+        client.force_authenticate(self.seeker)
+        response = client.get("/api/v1/jobs/recommended/", {"limit": 2})
+        titles = [job["title"] for job in response.data["results"]]
+        self.assertEqual(titles[0], "Django Engineer")
+        self.assertNotIn("Python Developer", titles)
+        self.assertNotIn("Graphic Designer", titles)
+
+        # Only changed listings are re-indexed; closed ones leave the index
+        designer = self.listings["Graphic Designer"]
+        designer.description = "Python and Django design systems"
+        designer.save()
+        self.listings["Python Data Analyst"].is_active = False
+        self.listings["Python Data Analyst"].save()
+        self.assertEqual(index_listings(), (1, 1))
+
+        response = client.get("/api/v1/jobs/recommended/")
+        self.assertEqual(
+            {job["title"] for job in response.data["results"]},
+            {"Django Engineer", "Graphic Designer"},
+        )
+        response = client.get("/api/v1/jobs/recommended/", {"limit": 0})
+        self.assertEqual(response.status_code, 400)
+
+        client.force_authenticate(User.objects.get(email="employer@example.com"))
+        self.assertEqual(client.get("/api/v1/jobs/recommended/").status_code, 403)
+
+    def test_index_reloads_after_a_build_in_another_process(self):
+        from .recommendations import get_index, index_listings
+
+        # The test cache is process-local, like the default locmem backend
+        index_listings()
+        with self.settings(JOB_INDEX_CHECK_INTERVAL=60):
+            index = get_index()
+            designer = self.listings["Graphic Designer"]
+            designer.description = "Python and Django design systems"
+            designer.save()
+            index_listings()
+            # Not checked again until the interval has passed
+            self.assertIs(get_index(), index)
+        reloaded = get_index()
+        self.assertIsNot(reloaded, index)
+        self.assertIs(get_index(), reloaded)
+
+
+class DashboardStatsTests(TestCase):
+    """Each relation is counted on its own, so none inflates another's count."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        cls.seeker = User.objects.create_user(
+            email="seeker@example.com", password="pass", user_type="job_seeker"
+        )
+        jobs = [
+            JobListing.objects.create(
+                employer=cls.employer,
+                title=f"Job {index}",
+                description="Description",
+                requirements="Requirements",
+                location="Dhaka",
+                is_active=index != 2,
+            )
+            for index in range(3)
+        ]
+        for job, status in zip(jobs, ("pending", "accepted", "pending")):
+            JobApplication.objects.create(
+                job=job, applicant=cls.seeker, resume="resumes/cv.pdf", status=status
+            )
+        for index in range(3):
+            Resume.objects.create(
+                user=cls.seeker, title=f"CV {index}", file=f"resumes/cv{index}.pdf"
+            )
+
+    def stats(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        with self.assertNumQueries(3):
+            response = client.get("/api/v1/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["stats"]
+
+    def test_job_seeker_stats(self):
+        self.assertEqual(
+            self.stats(self.seeker),
+            {
+                "total_applications": 3,
+                "pending_applications": 2,
+                "accepted_applications": 1,
+                "total_resumes": 3,
+            },
+        )
+
+    def test_employer_stats(self):
+        self.assertEqual(
+            self.stats(self.employer),
+            {
+                "total_jobs": 3,
+                "active_jobs": 2,
+                "total_applications": 3,
+                "pending_applications": 2,
+            },
+        )
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=300)
+class AsyncReadViewTests(TestCase):
+    """The async read views answer exactly like the sync routes they shadow."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(
+            email="employer@example.com",
+            password="pass",
+            user_type="employer",
+            company_name="Acme",
+            is_verified=True,
+        )
+        cls.category = JobCategory.objects.create(name="Information Technology")
+        cls.listings = [
+            JobListing.objects.create(
+                employer=cls.employer,
+                title=f"Python Developer {index}",
+                description="Description",
+                requirements="Requirements",
+                location="Dhaka",
+                category=cls.category,
+            )
+            for index in range(3)
+        ]
+        token = CustomTokenObtainPairSerializer.get_token(cls.employer).access_token
+        cls.authorization = f"JWT {token}"
+
+    def setUp(self):
+        self.client = APIClient()
+
+    async def assert_same_response(self, url, **headers):
+        expected = await sync_to_async(self.client.get)(url, headers=headers)
+        # Otherwise the async view would only replay what the sync one cached
+        await get_cache().aclear()
+        with self.settings(ROOT_URLCONF="career_connect.async_urls"):
+            response = await self.async_client.get(url, headers=headers)
+            self.assertTrue(iscoroutinefunction(response.resolver_match.func))
+        if "X-Cache" in expected:
+            self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.json(), expected.json())
+
+    async def test_matches_sync_views(self):
+        job = self.listings[0]
+        for url in (
+            "/api/v1/jobs/",
+            "/api/v1/jobs/?ordering=title&page_size=2",
+            "/api/v1/jobs/?pagination=cursor",
+            "/api/v1/jobs/?page=9",
+            "/api/v1/jobs/?facets=true&search=python",
+            "/api/v1/jobs/?q=python+developer",
+            "/api/v1/jobs/?near=23.8,90.4&ordering=distance_km&facets=true",
+            f"/api/v1/jobs/{job.pk}/",
+            f"/api/v1/jobs/{job.pk}/?near=23.8,90.4",
+            "/api/v1/jobs/0/",
+            "/api/v1/categories/",
+            f"/api/v1/categories/{self.category.pk}/",
+            "/api/v1/dashboard/",
+        ):
+            with self.subTest(url=url):
+                await self.assert_same_response(url)
+
+        await self.assert_same_response(
+            "/api/v1/dashboard/", authorization=self.authorization
+        )
+
+
+class ResumeDirectUploadTests(TestCase):
+    """Resumes are uploaded straight to storage with a ticket, then confirmed."""
+
+    def setUp(self):
+        self.storage_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.storage_root)
+        settings_override = override_settings(
+            DIRECT_UPLOAD_BACKEND="career_connect.uploads.LocalUploadBackend",
+            DIRECT_UPLOAD_LOCAL_ROOT=self.storage_root,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.seeker = User.objects.create_user(
+            email="seeker@example.com", password="pass", user_type="job_seeker"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def upload(self, filename="cv.pdf"):
+        response = self.client.post(
+            "/api/v1/resumes/upload_ticket/", {"filename": filename}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        upload = response.data["upload"]
+        file = SimpleUploadedFile(filename, b"%PDF-1.4")
+        storage_response = APIClient().post(
+            upload["url"], {**upload["fields"], upload["file_field"]: file}
+        )
+        self.assertEqual(storage_response.status_code, 201)
+        return response.data["ticket"], storage_response.json()
+
+    def confirm(self, ticket, receipt):
+        return self.client.post(
+            "/api/v1/resumes/confirm_upload/",
+            {"ticket": ticket, "receipt": receipt, "title": "CV", "is_primary": True},
+            format="json",
+        )
+
+    def test_upload_and_confirm(self):
+        ticket, receipt = self.upload()
+        response = self.confirm(ticket, receipt)
+
+        self.assertEqual(response.status_code, 201)
+        resume = Resume.objects.get(user=self.seeker)
+        self.assertTrue(resume.is_primary)
+        self.assertEqual(resume.file.name, receipt["key"])
+        self.assertTrue(resume.file.name.startswith("resumes/"))
+
+    def test_confirm_rejects_reuse_and_other_users(self):
+        ticket, receipt = self.upload()
+        other = User.objects.create_user(
+            email="other@example.com", password="pass", user_type="job_seeker"
+        )
+        self.client.force_authenticate(other)
+        self.assertEqual(self.confirm(ticket, receipt).status_code, 400)
+
+        self.client.force_authenticate(self.seeker)
+        self.assertEqual(self.confirm(ticket, receipt).status_code, 201)
+        self.assertEqual(self.confirm(ticket, receipt).status_code, 400)
+
+    def test_confirm_requires_the_stored_file(self):
+        ticket, _ = self.upload()
+        _, other_receipt = self.upload()
+        self.assertEqual(self.confirm(ticket, other_receipt).status_code, 400)
+
+    def test_ticket_rejects_unsupported_types(self):
+        response = self.client.post(
+            "/api/v1/resumes/upload_ticket/", {"filename": "cv.exe"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(
+        DIRECT_UPLOAD_BACKEND="career_connect.uploads.CloudinaryUploadBackend"
+    )
+    def test_cloudinary_tickets_send_documents_as_raw_files(self):
+        for filename, resource_type, extension in (
+            ("cv.pdf", "image", ""),
+            ("cv.docx", "raw", ".docx"),
+            ("cv.TXT", "raw", ".TXT"),
+        ):
+            with self.subTest(filename=filename):
+                response = self.client.post(
+                    "/api/v1/resumes/upload_ticket/",
+                    {"filename": filename},
+                    format="json",
+                )
+                upload = response.data["upload"]
+                self.assertIn(f"/{resource_type}/upload", upload["url"])
+                public_id = upload["fields"]["public_id"]
+                self.assertEqual(os.path.splitext(public_id)[1], extension)
+
+
+class ApplicationResumeReferenceTests(TestCase):
+    """Applications point at the applicant's stored resume instead of a new upload."""
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        cls.job = JobListing.objects.create(
+            employer=employer,
+            title="Python Developer",
+            description="Description",
+            requirements="Requirements",
+            location="Dhaka",
+        )
+        cls.seeker = User.objects.create_user(
+            email="seeker@example.com", password="pass", user_type="job_seeker"
+        )
+        cls.primary = Resume.objects.create(
+            user=cls.seeker, title="Primary", file="resumes/primary.pdf", is_primary=True
+        )
+        cls.other = Resume.objects.create(
+            user=cls.seeker, title="Other", file="resumes/other.pdf"
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def apply(self, **data):
+        return self.client.post(
+            "/api/v1/applications/", {"job": self.job.pk, **data}, format="json"
+        )
+
+    def test_defaults_to_primary_resume(self):
+        response = self.apply()
+
+        self.assertEqual(response.status_code, 201)
+        application = JobApplication.objects.get(pk=response.data["id"])
+        self.assertEqual(application.source_resume, self.primary)
+        self.assertEqual(application.resume.name, self.primary.file.name)
+
+    def test_selected_resume(self):
+        response = self.apply(resume_id=self.other.pk)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["resume_id"], self.other.pk)
+        application = JobApplication.objects.get(pk=response.data["id"])
+        self.assertEqual(application.resume.name, self.other.file.name)
+
+    def test_rejects_other_users_resume(self):
+        stranger = User.objects.create_user(
+            email="stranger@example.com", password="pass", user_type="job_seeker"
+        )
+        resume = Resume.objects.create(
+            user=stranger, title="CV", file="resumes/stranger.pdf"
+        )
+        self.assertEqual(self.apply(resume_id=resume.pk).status_code, 400)
+
+    def test_requires_a_resume(self):
+        Resume.objects.filter(user=self.seeker).delete()
+        self.assertEqual(self.apply().status_code, 400)
+
+
+class EmployerRatingTests(TestCase):
+    """Rating summaries follow review changes and appear on employer info."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employers = [
+            User.objects.create_user(
+                email=f"employer{index}@example.com",
+                password="pass",
+                user_type="employer",
+                company_name=f"Company {index}",
+                is_verified=True,
+            )
+            for index in range(2)
+        ]
+        cls.seekers = [
+            User.objects.create_user(
+                email=f"seeker{index}@example.com",
+                password="pass",
+                user_type="job_seeker",
+            )
+            for index in range(3)
+        ]
+        cls.job = JobListing.objects.create(
+            employer=cls.employers[0],
+            title="Python Developer",
+            description="Description",
+            requirements="Requirements",
+            location="Dhaka",
+            category=JobCategory.objects.create(name="Information Technology"),
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def rating(self):
+        return self.client.get(f"/api/v1/jobs/{self.job.pk}/").data["employer_info"]["rating"]
+
+    def test_summary_follows_reviews(self):
+        self.assertEqual(
+            self.rating(),
+            {"count": 0, "average": None, "histogram": dict.fromkeys("12345", 0)},
+        )
+
+        for seeker, rating in zip(self.seekers, (5, 4, 4)):
+            EmployerReview.objects.create(
+                employer=self.employers[0], reviewer=seeker, rating=rating, comment="Ok"
+            )
+        self.client.force_authenticate(self.seekers[0])
+        review = EmployerReview.objects.get(reviewer=self.seekers[0])
+        response = self.client.patch(f"/api/v1/reviews/{review.pk}/", {"rating": 1})
+        self.assertEqual(response.status_code, 200)
+        EmployerReview.objects.get(reviewer=self.seekers[1]).delete()
+
+        self.assertEqual(
+            self.rating(),
+            {
+                "count": 2,
+                "average": 2.5,
+                "histogram": {"1": 1, "2": 0, "3": 0, "4": 1, "5": 0},
+            },
+        )
+
+    def test_nested_reviews_are_scoped_to_the_job_employer(self):
+        for employer, seeker in zip(self.employers, self.seekers):
+            EmployerReview.objects.create(
+                employer=employer, reviewer=seeker, rating=3, comment="Ok"
+            )
+
+        response = self.client.get(f"/api/v1/jobs/{self.job.pk}/reviews/")
+        self.assertEqual(
+            [review["employer"] for review in response.data["results"]],
+            [self.employers[0].pk],
+        )
+        response = self.client.get("/api/v1/jobs/0/reviews/")
+        self.assertEqual(response.status_code, 404)
+
+
+class ApplicantPipelineTests(TestCase):
+    """A job's applications are paged and filtered, with per-status counts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(
+            email="employer@example.com",
+            password="pass",
+            user_type="employer",
+            company_name="Acme",
+            is_verified=True,
+        )
+        cls.job = JobListing.objects.create(
+            employer=cls.employer,
+            title="Python Developer",
+            description="Description",
+            requirements="Requirements",
+            location="Dhaka",
+            category=JobCategory.objects.create(name="Information Technology"),
+        )
+        for index, status in enumerate(["pending"] * 12 + ["accepted"] * 3):
+            JobApplication.objects.create(
+                job=cls.job,
+                applicant=User.objects.create_user(
+                    email=f"seeker{index}@example.com",
+                    password="pass",
+                    user_type="job_seeker",
+                ),
+                resume="resumes/cv.pdf",
+                status=status,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+        self.url = f"/api/v1/jobs/{self.job.pk}/applications/"
+
+    def test_pages_filters_and_counts(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 15)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(
+            response.data["status_counts"],
+            {"total": 15, "pending": 12, "reviewed": 0, "accepted": 3, "rejected": 0},
+        )
+        # Listing, COUNT, page and facets
+        self.assertEqual(len(context.captured_queries), 4)
+
+        response = self.client.get(self.url, {"status": "accepted", "ordering": "applied_at"})
+        self.assertEqual(
+            [application["status"] for application in response.data["results"]],
+            ["accepted"] * 3,
+        )
+        self.assertEqual(response.data["status_counts"]["total"], 15)
+
+        response = self.client.get(self.url, {"status": "hired"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_applied_date_range(self):
+        from datetime import datetime, timezone as dt_timezone
+
+        pks = list(self.job.applications.order_by("pk").values_list("pk", flat=True))
+        for pk, applied_at in zip(
+            pks,
+            (
+                datetime(2026, 3, 1, 23, 59, 59),
+                datetime(2026, 3, 2, 0, 0),
+                datetime(2026, 3, 3, 23, 59, 59),
+                datetime(2026, 3, 4, 0, 0),
+            ),
+        ):
+            JobApplication.objects.filter(pk=pk).update(
+                applied_at=applied_at.replace(tzinfo=dt_timezone.utc)
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                self.url, {"applied_after": "2026-03-02", "applied_before": "2026-03-03"}
+            )
+        self.assertEqual(
+            sorted(application["id"] for application in response.data["results"]),
+            pks[1:3],
+        )
+        # Plain datetime bounds, no per-row date cast
+        self.assertFalse(
+            any("cast_date" in query["sql"] for query in context.captured_queries)
+        )
+
+    def test_other_employers_are_refused(self):
+        other = User.objects.create_user(
+            email="other@example.com", password="pass", user_type="employer"
+        )
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_bulk_status_update(self):
+        from notifications.models import OutboxEmail
+
+        pending = list(
+            self.job.applications.filter(status="pending").values_list("pk", flat=True)
+        )
+        accepted = self.job.applications.filter(status="accepted").first()
+        url = "/api/v1/applications/bulk_update_status/"
+        transitions = {"rejected": pending[:8], "accepted": pending[8:] + [accepted.pk]}
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                url, {"transitions": transitions}, format="json"
+            )
+        self.assertEqual(
+            response.data,
+            {"updated": {"rejected": 8, "accepted": 4}, "unchanged": 1, "notified": 12},
+        )
+        # Ownership check, one UPDATE per status, one outbox INSERT
+        updates = [q for q in context.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(OutboxEmail.objects.count(), 12)
+        self.assertEqual(self.job.applications.filter(status="rejected").count(), 8)
+
+        foreign = JobApplication.objects.create(
+            job=JobListing.objects.create(
+                employer=User.objects.create_user(
+                    email="other@example.com", password="pass", user_type="employer"
+                ),
+                title="Designer",
+                description="Description",
+                requirements="Requirements",
+                location="Dhaka",
+                category=self.job.category,
+            ),
+            applicant=User.objects.get(email="seeker0@example.com"),
+            resume="resumes/cv.pdf",
+        )
+        response = self.client.post(
+            url,
+            {"transitions": {"reviewed": [pending[0], foreign.pk]}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data["applications"], [foreign.pk])
+        self.assertEqual(
+            JobApplication.objects.get(pk=pending[0]).status, "rejected"
+        )
+
+        response = self.client.post(
+            url, {"transitions": {"hired": [pending[0]]}}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_single_status_update(self):
+        from notifications.models import OutboxEmail
+
+        application = self.job.applications.filter(status="pending").first()
+        url = f"/api/v1/applications/{application.pk}/update_status/"
+        response = self.client.patch(url, {"status": "reviewed"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "reviewed")
+        application.refresh_from_db()
+        self.assertEqual(application.status, "reviewed")
+        # Unlike bulk_update_status, the single update sends no email
+        self.assertFalse(OutboxEmail.objects.exists())
+
+
+class BulkImportTests(TestCase):
+    """Imports keep the valid rows, report the others and stop at the row limit."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        cls.category = JobCategory.objects.create(name="Information Technology")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+
+    def upload(self, name, content, **data):
+        return self.client.post(
+            "/api/v1/jobs/bulk_import/",
+            {"file": SimpleUploadedFile(name, content.encode()), **data},
+            format="multipart",
+        )
+
+    def csv(self, *rows):
+        header = "title,description,requirements,location,category,employment_type"
+        return "\n".join((header, *rows)) + "\n"
+
+    def test_csv_rows_are_validated_one_by_one(self):
+        response = self.upload(
+            "jobs.csv",
+            self.csv(
+                f"Python Developer,Build APIs,Python,Dhaka,{self.category.pk},full_time",
+                ",No title,None,Dhaka,,",
+                "Designer,Brand work,Figma,Dhaka,999,",
+                "Intern,Learn,Curiosity,Chittagong,,gig",
+                "Data Analyst,Reports,SQL,Remote,,",
+            ),
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 3)
+        errors = {error["row"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(sorted(errors), [2, 3, 4])
+        self.assertIn("title", errors[2])
+        self.assertEqual(errors[3]["category"], ["Category 999 does not exist."])
+        self.assertIn("employment_type", errors[4])
+
+        listings = JobListing.objects.filter(employer=self.employer).order_by("title")
+        self.assertEqual(
+            [(job.title, job.category_id) for job in listings],
+            [("Data Analyst", None), ("Python Developer", self.category.pk)],
+        )
+        # bulk_create skips the signals, so the import resolves places itself
+        self.assertIsNone(listings[0].place_id)
+        self.assertEqual(listings[1].place.name, "Dhaka")
+
+    def test_ndjson_reports_malformed_lines(self):
+        lines = [
+            '{"title": "Python Developer", "description": "APIs",'
+            ' "requirements": "Python", "location": "Dhaka"}',
+            "{not json",
+            "",
+            '["a", "list"]',
+        ]
+        response = self.upload("jobs.ndjson", "\n".join(lines))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 1)
+        errors = response.data["errors"]
+        self.assertEqual([error["row"] for error in errors], [2, 4])
+        self.assertTrue(errors[0]["errors"].startswith("Invalid JSON"))
+        self.assertEqual(errors[1]["errors"], "Each line must be a JSON object.")
+
+    @override_settings(JOB_IMPORT_MAX_ROWS=2, JOB_IMPORT_BATCH_SIZE=1)
+    def test_stops_at_the_row_limit(self):
+        rows = [f"Job {index},Description,Requirements,Dhaka,," for index in range(4)]
+        response = self.upload("jobs.csv", self.csv(*rows))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(
+            response.data["errors"],
+            [{"row": 3, "errors": "Import is limited to 2 rows."}],
+        )
+        self.assertEqual(JobListing.objects.count(), 2)
+
+    def test_batches_share_place_and_saved_search_lookups(self):
+        seeker = User.objects.create_user(
+            email="seeker@example.com", password="pass", user_type="job_seeker"
+        )
+        python = SavedSearch.objects.create(
+            user=seeker,
+            name="Python in Dhaka",
+            filters={"location": "dhaka"},
+            search="python",
+        )
+        # Its terms are spread over two listings, so neither matches
+        SavedSearch.objects.create(
+            user=seeker,
+            name="Python designers",
+            filters={"title": "designer"},
+            search="python",
+        )
+
+        def import_queries(count):
+            rows = [
+                "Python Developer,Build APIs,Python,Dhaka,,",
+                "Designer,Brand work,Figma,Chittagong,,",
+            ] * count
+            # Start from an empty place cache so each import looks places up
+            with mock.patch.dict("jobs.geo._place_ids", clear=True):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.upload("jobs.csv", self.csv(*rows))
+            self.assertEqual(response.data["created"], len(rows))
+            return len(context.captured_queries)
+
+        small = import_queries(1)
+        self.assertEqual(
+            list(SavedSearchMatch.objects.values_list("search_id", "job__title")),
+            [(python.pk, "Python Developer")],
+        )
+        large = import_queries(5)
+        self.assertEqual(small, large)
+        self.assertEqual(SavedSearchMatch.objects.filter(search=python).count(), 6)
+        self.assertEqual(SavedSearchMatch.objects.count(), 6)
+
+    def test_rejects_unusable_uploads(self):
+        response = self.upload("jobs.csv", self.csv(",,,,,"))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["created"], 0)
+
+        response = self.upload("jobs.txt", self.csv())
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("file_format", response.data["error"])
+
+        response = self.client.post("/api/v1/jobs/bulk_import/", {}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+
+
+class ResumeTextTests(TestCase):
+    """Resume files are read once in the background and searchable by employers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        cls.job = JobListing.objects.create(
+            employer=cls.employer,
+            title="Platform Engineer",
+            description="Description",
+            requirements="Requirements",
+            location="Dhaka",
+            category=JobCategory.objects.create(name="Information Technology"),
+        )
+        cls.applications = {}
+        for name in ("cv.txt", "cv.docx", "broken.pdf"):
+            cls.applications[name] = JobApplication.objects.create(
+                job=cls.job,
+                applicant=User.objects.create_user(
+                    email=f"{name}@example.com", password="pass", user_type="job_seeker"
+                ),
+                resume=f"resumes/{name}",
+            )
+
+    def docx(self, text):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr(
+                "word/document.xml",
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+                'wordprocessingml/2006/main"><w:body><w:p><w:r><w:t>'
+                f"{text}</w:t></w:r></w:p></w:body></w:document>",
+            )
+        return buffer.getvalue()
+
+    def test_extracts_in_the_background_and_searches(self):
+        from .resume_text import extract_batch
+
+        # Saving the applications queued their files; nothing was read yet
+        self.assertEqual(ResumeText.objects.filter(status="pending").count(), 3)
+
+        files = {
+            "resumes/cv.txt": b"Senior engineer:  Kubernetes\n\n and Terraform",
+            "resumes/cv.docx": self.docx("Django developer with PostgreSQL"),
+            "resumes/broken.pdf": b"%PDF-1.4 truncated",
+        }
+        with mock.patch("jobs.resume_text.read_file", side_effect=files.__getitem__):
+            self.assertEqual(extract_batch(), (2, 1))
+        self.assertEqual(
+            ResumeText.objects.get(name="resumes/cv.txt").text,
+            "Senior engineer: Kubernetes\nand Terraform",
+        )
+        broken = ResumeText.objects.get(name="resumes/broken.pdf")
+        self.assertEqual(broken.status, "failed")
+
+        client = APIClient()
+        client.force_authenticate(self.employer)
+        response = client.get(
+            f"/api/v1/jobs/{self.job.pk}/applications/", {"q": "kubernetes"}
+        )
+        self.assertEqual(
+            [application["id"] for application in response.data["results"]],
+            [self.applications["cv.txt"].pk],
+        )
+        self.assertEqual(response.data["status_counts"]["total"], 1)
+
+        response = client.get("/api/v1/applications/", {"q": "postgresql"})
+        self.assertEqual(
+            [application["id"] for application in response.data["results"]],
+            [self.applications["cv.docx"].pk],
+        )
+
+        url = f"/api/v1/applications/{self.applications['cv.docx'].pk}/resume_text/"
+        response = client.get(url)
+        self.assertEqual(response.data["status"], "done")
+        self.assertEqual(response.data["text"], "Django developer with PostgreSQL")
+
+        client.force_authenticate(self.applications["cv.txt"].applicant)
+        self.assertEqual(client.get(url).status_code, 404)
+
+
+class SavedSearchTests(TestCase):
+    """New listings are matched to saved searches and sent in one digest."""
+
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        self.seeker = User.objects.create_user(
+            email="seeker@example.com",
+            password="pass",
+            user_type="job_seeker",
+            first_name="Rahim",
+        )
+        self.it = JobCategory.objects.create(name="Information Technology")
+        self.design = JobCategory.objects.create(name="Design")
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def save_search(self, name, filters, search=""):
+        response = self.client.post(
+            "/api/v1/saved-searches/",
+            {"name": name, "filters": filters, "search": search},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data["id"]
+
+    def post_listing(self, title, category, location, employment_type, salary_min):
+        return JobListing.objects.create(
+            employer=self.employer,
+            title=title,
+            description="Description",
+            requirements="Requirements",
+            location=location,
+            category=category,
+            employment_type=employment_type,
+            salary_min=salary_min,
+        )
+
+    def test_matches_new_listings_and_sends_digests(self):
+        from notifications.models import OutboxEmail
+        from .saved_searches import send_digests
+
+        python = self.save_search(
+            "Python in Dhaka", {"category": self.it.pk, "location": "dhaka"}, "Python"
+        )
+        contract = self.save_search(
+            "Paid contracts", {"employment_type": "contract", "salary_min": "50000"}
+        )
+        designer = self.save_search("Designers", {"title": "designer"})
+
+        self.post_listing(
+            "Python Developer", self.it, "Dhaka, Bangladesh", "full_time", 60000
+        )
+        self.post_listing(
+            "Contract Designer", self.design, "Chittagong", "contract", 70000
+        )
+        self.post_listing("Cheap Designer", self.design, "Dhaka", "contract", 20000)
+
+        def matched(pk):
+            response = self.client.get(f"/api/v1/saved-searches/{pk}/matches/")
+            return [job["title"] for job in response.data["results"]]
+
+        self.assertEqual(matched(python), ["Python Developer"])
+        self.assertEqual(matched(contract), ["Contract Designer"])
+        self.assertEqual(matched(designer), ["Cheap Designer", "Contract Designer"])
+
+        self.assertEqual(send_digests(), 1)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to_email, "seeker@example.com")
+        self.assertIn("Designers (2 new)", email.body)
+        self.assertEqual(send_digests(), 0)
+
+        response = self.client.post(
+            "/api/v1/saved-searches/",
+            {"name": "Bad", "filters": {"employment_type": "gig"}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def matched(self, pk):
+        response = self.client.get(f"/api/v1/saved-searches/{pk}/matches/")
+        return [job["title"] for job in response.data["results"]]
+
+    def test_terms_match_like_the_live_filters(self):
+        filters = {"title": "design", "location": "dhak"}
+        search = self.save_search("Design work", filters, "designing")
+        plural = self.save_search("Developers", {}, "python developers")
+        self.post_listing("Senior Designer", self.design, "Dhaka", "contract", 0)
+        self.post_listing("Python Developer", self.it, "Dhaka", "full_time", 0)
+        self.post_listing("Designer", self.design, "Chittagong", "contract", 0)
+
+        live = self.client.get("/api/v1/jobs/", filters)
+        self.assertEqual([job["title"] for job in live.data["results"]], ["Senior Designer"])
+        self.assertEqual(self.matched(search), ["Senior Designer"])
+        self.assertEqual(self.matched(plural), ["Python Developer"])
+
+    def test_reactivated_listings_are_matched(self):
+        search = self.save_search("Python", {}, "python")
+        listing = JobListing.objects.create(
+            employer=self.employer,
+            title="Python Developer",
+            description="Description",
+            requirements="Requirements",
+            location="Dhaka",
+            is_active=False,
+        )
+        self.assertEqual(self.matched(search), [])
+
+        listing.is_active = True
+        listing.save()
+        self.assertEqual(self.matched(search), ["Python Developer"])
+
+
+class ListingExpiryTests(TestCase):
+    """Past-deadline listings leave the public list at once and are swept in batches."""
+
+    def test_expired_listings_are_hidden_and_deactivated(self):
+        from datetime import timedelta
+
+        from django.core.management import call_command
+        from django.utils import timezone
+
+        employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        category = JobCategory.objects.create(name="Information Technology")
+        today = timezone.localdate()
+        for title, deadline in (
+            ("Open Ended", None),
+            ("Closes Today", today),
+            ("Closed Yesterday", today - timedelta(days=1)),
+            ("Closed Last Week", today - timedelta(days=7)),
+            ("Closed Last Month", today - timedelta(days=30)),
+        ):
+            JobListing.objects.create(
+                employer=employer,
+                title=title,
+                description="Description",
+                requirements="Requirements",
+                location="Dhaka",
+                category=category,
+                deadline=deadline,
+            )
+
+        client = APIClient()
+        response = client.get("/api/v1/jobs/", {"ordering": "title"})
+        open_titles = ["Closes Today", "Open Ended"]
+        self.assertEqual([job["title"] for job in response.data["results"]], open_titles)
+        response = client.get(f"/api/v1/categories/{category.pk}/")
+        self.assertEqual(response.data["job_count"], 2)
+
+        out = io.StringIO()
+        call_command("expire_listings", batch_size=2, stdout=out)
+        self.assertIn("Expired 3 listing(s) in 2 batch(es).", out.getvalue())
+        self.assertEqual(
+            sorted(JobListing.objects.filter(is_active=True).values_list("title", flat=True)),
+            open_titles,
+        )
+        out = io.StringIO()
+        call_command("expire_listings", stdout=out)
+        self.assertIn("Expired 0 listing(s)", out.getvalue())
+
+    def test_owner_can_edit_and_delete_an_expired_listing(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        owner = User.objects.create_user(
+            email="owner@example.com", password="pass", user_type="employer"
+        )
+        other = User.objects.create_user(
+            email="other@example.com", password="pass", user_type="employer"
+        )
+        today = timezone.localdate()
+        listing = JobListing.objects.create(
+            employer=owner,
+            title="Closed Yesterday",
+            description="Description",
+            requirements="Requirements",
+            location="Dhaka",
+            deadline=today - timedelta(days=1),
+            is_active=False,
+        )
+        url = f"/api/v1/jobs/{listing.pk}/"
+        client = APIClient()
+        self.assertEqual(client.get(url).status_code, 404)
+
+        client.force_authenticate(other)
+        response = client.patch(url, {"deadline": today.isoformat()}, format="json")
+        self.assertEqual(response.status_code, 404)
+
+        client.force_authenticate(owner)
+        response = client.patch(
+            url,
+            {"deadline": (today + timedelta(days=7)).isoformat(), "is_active": True},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(APIClient().get(url).status_code, 200)
+        self.assertEqual(client.delete(url).status_code, 204)
+
+
+class RadiusSearchTests(TestCase):
+    """Listings resolve to gazetteer places and can be searched by distance."""
+
+    def test_near_filter_and_distance_ordering(self):
+        from .gazetteer import get_gazetteer
+
+        self.assertEqual(get_gazetteer().resolve("Hyderabad, Pakistan").key, "hyderabad-pk")
+        self.assertEqual(get_gazetteer().resolve("Sao Paulo").key, "sao-paulo-br")
+
+        employer = User.objects.create_user(
+            email="employer@example.com", password="pass", user_type="employer"
+        )
+        category = JobCategory.objects.create(name="Information Technology")
+        for title, location in (
+            ("Savar Role", "Savar"),
+            ("Gulshan Role", "Gulshan 2, Dhaka"),
+            ("Chittagong Role", "Chittagong, Bangladesh"),
+            ("Remote Role", "Remote"),
+        ):
+            JobListing.objects.create(
+                employer=employer,
+                title=title,
+                description="Description",
+                requirements="Requirements",
+                location=location,
+                category=category,
+            )
+        self.assertEqual(JobListing.objects.get(title="Gulshan Role").place.key, "dhaka-bd")
+        self.assertIsNone(JobListing.objects.get(title="Remote Role").place)
+
+        client = APIClient()
+        response = client.get(
+            "/api/v1/jobs/",
+            {"near": "23.8103,90.4125", "radius_km": "30", "ordering": "-distance_km"},
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertEqual([job["title"] for job in results], ["Savar Role", "Gulshan Role"])
+        self.assertAlmostEqual(results[0]["distance_km"], 15.9, delta=0.5)
+        self.assertEqual(results[1]["distance_km"], 0.0)
+
+        response = client.get("/api/v1/jobs/", {"near": "22.3,91.8", "radius_km": "300"})
+        self.assertEqual(response.data["count"], 3)
+        # distance_km ordering without near falls back to the default ordering
+        response = client.get("/api/v1/jobs/", {"ordering": "distance_km"})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("distance_km", response.data["results"][0])
+
+        response = client.get("/api/v1/jobs/", {"near": "91,90"})
+        self.assertEqual(response.status_code, 400)
@@ -1,54 +1,130 @@
 from rest_framework import viewsets, generics, status, permissions
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db.models import Count, Q
-from .models import JobCategory, JobListing, JobApplication, Resume, EmployerReview
+from api.cache import CachedResponseMixin
+from api.pagination import OptionalCursorPagination
+from career_connect.uploads import issue_ticket
+from .models import (
+    JobCategory,
+    JobListing,
+    JobApplication,
+    Resume,
+    ResumeText,
+    EmployerReview,
+    SavedSearch,
+)
 from .serializers import (
     JobCategorySerializer,
     JobListingSerializer,
     JobApplicationSerializer,
     ApplicationStatusUpdateSerializer,
+    ApplicationBulkStatusSerializer,
     ResumeSerializer,
+    ResumeUploadTicketSerializer,
+    ResumeUploadConfirmSerializer,
     EmployerReviewSerializer,
+    SavedSearchSerializer,
 )
 from .permissions import IsEmployer, IsJobSeeker, IsOwnerOrReadOnly
-from .filters import JobListingFilter
+from .filters import JobListingFilter, JobApplicationFilter
+from .dashboard import get_dashboard
+from .bulk import (
+    FILE_FORMATS,
+    detect_format,
+    export_rows,
+    import_listings,
+    update_application_statuses,
+)
+from .expiry import not_expired
+from .facets import get_facets, wants_facets
+from .geo import DISTANCE_FIELD, DistanceOrderingFilter
+from .recommendations import DEFAULT_LIMIT, MAX_LIMIT, recommend
+from .saved_searches import saved_search_listings
+from .search import FullTextSearchFilter, ResumeSearchFilter
 
 
-class JobCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class JobCategoryViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for job categories."""
 
-    queryset = JobCategory.objects.annotate(
-        job_count=Count("jobs", filter=Q(jobs__is_active=True))
-    )
+    cache_models = ("jobs.jobcategory", "jobs.joblisting")
+    queryset = JobCategory.objects.all()
     serializer_class = JobCategorySerializer
     permission_classes = [permissions.AllowAny]
 
+    def get_queryset(self):
+        return self.queryset.annotate(
+            job_count=Count(
+                "jobs", filter=Q(jobs__is_active=True) & not_expired("jobs__")
+            )
+        )
+
 
-class JobListingViewSet(viewsets.ModelViewSet):
+class JobListingViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """ViewSet for job listings."""
 
+    # application_count makes responses depend on application inserts/deletes
+    cache_models = (
+        "jobs.joblisting",
+        "jobs.jobcategory",
+        "accounts.user",
+        "jobs.jobapplication",
+        "jobs.employerratingsummary",
+    )
     queryset = JobListing.objects.filter(is_active=True).select_related(
-        "employer", "category"
+        "employer", "employer__rating_summary", "category"
     )
     serializer_class = JobListingSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = OptionalCursorPagination
+    filter_backends = [
+        DjangoFilterBackend,
+        SearchFilter,
+        DistanceOrderingFilter,
+        FullTextSearchFilter,
+    ]
     filterset_class = JobListingFilter
     search_fields = ["title", "description", "requirements", "location"]
-    ordering_fields = ["created_at", "title", "salary_min"]
+    ordering_fields = ["created_at", "title", "salary_min", DISTANCE_FIELD]
+    # The radius filter looks up places while it builds the query
+    sync_filter_params = ("near",)
     ordering = ["-created_at"]
 
+    def get_queryset(self):
+        if self.action in ["update", "partial_update", "destroy"]:
+            # Owners can still extend, reactivate or delete expired listings
+            return JobListing.objects.filter(
+                employer_id=self.request.user.pk
+            ).select_related("employer", "employer__rating_summary", "category")
+        queryset = super().get_queryset()
+        if self.action in ["list", "retrieve"]:
+            # Past-deadline listings drop out before expire_listings deactivates them
+            queryset = queryset.filter(not_expired())
+        return queryset
+
     def get_permissions(self):
         if self.action in ["create", "update", "partial_update", "destroy"]:
             permission_classes = [IsEmployer, IsOwnerOrReadOnly]
-        elif self.action in ["my_listings"]:
+        elif self.action in ["my_listings", "bulk_import", "export"]:
             permission_classes = [IsEmployer]
+        elif self.action == "recommended":
+            permission_classes = [IsJobSeeker]
         else:
             permission_classes = [permissions.AllowAny]
         return [permission() for permission in permission_classes]
 
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        # Facets have their own cache, shared by every page of the same search
+        if wants_facets(request) and response.status_code == status.HTTP_200_OK:
+            response.data["facets"] = get_facets(self)
+        return response
+
     def perform_create(self, serializer):
         serializer.save(employer=self.request.user)
 
@@ -56,7 +132,7 @@ class JobListingViewSet(viewsets.ModelViewSet):
     def my_listings(self, request):
         """Get all job listings created by the current employer."""
         listings = JobListing.objects.filter(employer=request.user).select_related(
-            "category"
+            "employer", "employer__rating_summary", "category"
         )
         page = self.paginate_queryset(listings)
         if page is not None:
@@ -65,19 +141,118 @@ class JobListingViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(listings, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"], permission_classes=[IsJobSeeker])
+    def recommended(self, request):
+        """Active listings that best match the job seeker's bio and applications."""
+        try:
+            limit = int(request.query_params.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_LIMIT:
+            return Response(
+                {"error": f"limit must be between 1 and {MAX_LIMIT}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = []
+        for listing, score in recommend(request.user, limit):
+            data = self.get_serializer(listing).data
+            data["score"] = round(score, 4)
+            results.append(data)
+        return Response({"results": results})
+
+    @action(detail=False, methods=["post"], permission_classes=[IsEmployer])
+    def bulk_import(self, request):
+        """Create many job listings from an uploaded CSV or NDJSON file."""
+        uploaded_file = request.FILES.get("file")
+        if uploaded_file is None:
+            return Response(
+                {"error": "Upload a CSV or NDJSON file in the 'file' field."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        file_format = detect_format(uploaded_file, request.data.get("file_format"))
+        if file_format is None:
+            return Response(
+                {"error": f"file_format must be one of: {', '.join(FILE_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        created, errors = import_listings(request.user, uploaded_file, file_format)
+        return Response(
+            {"created": created, "failed": len(errors), "errors": errors},
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @action(detail=False, methods=["get"], permission_classes=[IsEmployer])
+    def export(self, request):
+        """Stream the current employer's job listings as CSV or NDJSON."""
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in FILE_FORMATS:
+            return Response(
+                {"error": f"file_format must be one of: {', '.join(FILE_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        listings = JobListingFilter(
+            request.query_params,
+            queryset=JobListing.objects.filter(employer=request.user),
+        ).qs
+        content_type = "text/csv" if file_format == "csv" else "application/x-ndjson"
+        response = StreamingHttpResponse(
+            export_rows(listings, file_format), content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="job-listings.{file_format}"'
+        )
+        return response
+
     @action(detail=True, methods=["get"], permission_classes=[IsEmployer])
     def applications(self, request, pk=None):
-        """Get all applications for a specific job listing."""
-        job = self.get_object()
-        if job.employer != request.user:
+        """
+        Page through the applications for one of the employer's job listings.
+
+        Filter with ``status`` (repeatable), ``applied_after`` and
+        ``applied_before``, search resume text with ``q``, sort with
+        ``ordering``. ``status_counts`` holds the number of applications per
+        status under the date filters and search, for the pipeline tabs.
+        """
+        # Closed listings keep their applicants, so look past the active filter
+        job = get_object_or_404(JobListing.objects.only("employer"), pk=pk)
+        if job.employer_id != request.user.pk:
             return Response(
                 {"error": "You do not have permission to view these applications."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        applications = job.applications.all().select_related("applicant")
-        serializer = JobApplicationSerializer(applications, many=True)
-        return Response(serializer.data)
+        applications = JobApplication.objects.filter(job=job).select_related(
+            "applicant", "job__employer"
+        )
+        applications = ResumeSearchFilter().filter_queryset(request, applications, self)
+        filterset = JobApplicationFilter(request.query_params, queryset=applications)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+
+        # The tabs count every status, so leave the status filter out of them
+        params = request.query_params.copy()
+        params.pop("status", None)
+        facets = JobApplicationFilter(params, queryset=applications).qs.order_by()
+        status_counts = facets.aggregate(
+            total=Count("id"),
+            **{
+                choice: Count("id", filter=Q(status=choice))
+                for choice, _ in JobApplication.STATUS_CHOICES
+            },
+        )
+
+        queryset = filterset.qs
+        if not queryset.query.order_by:
+            queryset = queryset.order_by("-applied_at")
+        page = self.paginate_queryset(queryset)
+        serializer = JobApplicationSerializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        response.data["status_counts"] = status_counts
+        return response
 
 
 class JobApplicationViewSet(viewsets.ModelViewSet):
@@ -86,7 +261,8 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
     queryset = JobApplication.objects.all().select_related("job", "applicant")
     serializer_class = JobApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    pagination_class = OptionalCursorPagination
+    filter_backends = [DjangoFilterBackend, OrderingFilter, ResumeSearchFilter]
     filterset_fields = ["status"]
     ordering_fields = ["applied_at"]
     ordering = ["-applied_at"]
@@ -128,6 +304,38 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
 
         return Response(JobApplicationSerializer(application).data)
 
+    @action(detail=True, methods=["get"])
+    def resume_text(self, request, pk=None):
+        """The extracted text of the application's resume, once it is ready."""
+        application = self.get_object()
+        row = (
+            ResumeText.objects.filter(name=application.resume.name)
+            .values("status", "text", "extracted_at")
+            .first()
+        )
+        if row is None:
+            row = {"status": "pending", "text": "", "extracted_at": None}
+        return Response(row)
+
+    @action(detail=False, methods=["post"], permission_classes=[IsEmployer])
+    def bulk_update_status(self, request):
+        """Move many applications to new statuses in one request."""
+        serializer = ApplicationBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        summary, missing = update_application_statuses(
+            request.user, serializer.validated_data["transitions"]
+        )
+        if missing:
+            return Response(
+                {
+                    "error": "You do not have permission to update these applications.",
+                    "applications": missing,
+                },
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return Response(summary)
+
     @action(detail=False, methods=["get"], permission_classes=[IsJobSeeker])
     def my_applications(self, request):
         """Get all applications submitted by the current job seeker."""
@@ -166,6 +374,59 @@ class ResumeViewSet(viewsets.ModelViewSet):
         resume.save()
         return Response({"message": "Resume set as primary."})
 
+    @action(detail=False, methods=["post"])
+    def upload_ticket(self, request):
+        """Issue a short-lived ticket for uploading a resume straight to storage."""
+        serializer = ResumeUploadTicketSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ticket, upload = issue_ticket(
+            request.user,
+            Resume._meta.get_field("file"),
+            serializer.validated_data["filename"],
+        )
+        return Response(
+            {
+                "ticket": ticket,
+                "upload": upload,
+                "expires_in": settings.UPLOAD_TICKET_MAX_AGE,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=["post"])
+    def confirm_upload(self, request):
+        """Record a resume once the client has uploaded it with its ticket."""
+        serializer = ResumeUploadConfirmSerializer(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        resume = serializer.save()
+        return Response(ResumeSerializer(resume).data, status=status.HTTP_201_CREATED)
+
+
+class SavedSearchViewSet(viewsets.ModelViewSet):
+    """ViewSet for a job seeker's saved searches."""
+
+    queryset = SavedSearch.objects.all()
+    serializer_class = SavedSearchSerializer
+    permission_classes = [IsJobSeeker]
+
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    @action(detail=True, methods=["get"])
+    def matches(self, request, pk=None):
+        """Active listings posted since the search was saved that match it."""
+        listings = saved_search_listings(self.get_object()).select_related(
+            "employer", "employer__rating_summary", "category"
+        )
+        page = self.paginate_queryset(listings)
+        serializer = JobListingSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
 
 class EmployerReviewViewSet(viewsets.ModelViewSet):
     """ViewSet for employer reviews."""
@@ -173,6 +434,7 @@ class EmployerReviewViewSet(viewsets.ModelViewSet):
     queryset = EmployerReview.objects.all().select_related("employer", "reviewer")
     serializer_class = EmployerReviewSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalCursorPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ["employer", "rating"]
     ordering_fields = ["created_at", "rating"]
@@ -187,6 +449,16 @@ class EmployerReviewViewSet(viewsets.ModelViewSet):
             permission_classes = [permissions.AllowAny]
         return [permission() for permission in permission_classes]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if "job_pk" in self.kwargs:
+            # Nested under /jobs/{job_pk}/: the reviews of that job's employer
+            job = get_object_or_404(
+                JobListing.objects.only("employer"), pk=self.kwargs["job_pk"]
+            )
+            queryset = queryset.filter(employer_id=job.employer_id)
+        return queryset
+
     def perform_create(self, serializer):
         serializer.save(reviewer=self.request.user)
 
@@ -197,72 +469,8 @@ class DashboardView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-
-        if user.user_type == "employer":
-            # Employer dashboard data
-            total_jobs = JobListing.objects.filter(employer=user).count()
-            active_jobs = JobListing.objects.filter(
-                employer=user, is_active=True
-            ).count()
-            total_applications = JobApplication.objects.filter(
-                job__employer=user
-            ).count()
-            pending_applications = JobApplication.objects.filter(
-                job__employer=user, status="pending"
-            ).count()
-
-            recent_jobs = JobListing.objects.filter(employer=user).order_by(
-                "-created_at"
-            )[:5]
-            recent_applications = JobApplication.objects.filter(
-                job__employer=user
-            ).order_by("-applied_at")[:10]
-
-            data = {
-                "user_type": "employer",
-                "stats": {
-                    "total_jobs": total_jobs,
-                    "active_jobs": active_jobs,
-                    "total_applications": total_applications,
-                    "pending_applications": pending_applications,
-                },
-                "recent_jobs": JobListingSerializer(recent_jobs, many=True).data,
-                "recent_applications": JobApplicationSerializer(
-                    recent_applications, many=True
-                ).data,
-            }
-
-        elif user.user_type == "job_seeker":
-            # Job seeker dashboard data
-            total_applications = JobApplication.objects.filter(applicant=user).count()
-            pending_applications = JobApplication.objects.filter(
-                applicant=user, status="pending"
-            ).count()
-            accepted_applications = JobApplication.objects.filter(
-                applicant=user, status="accepted"
-            ).count()
-            total_resumes = Resume.objects.filter(user=user).count()
-
-            recent_applications = JobApplication.objects.filter(
-                applicant=user
-            ).order_by("-applied_at")[:10]
-            resumes = Resume.objects.filter(user=user).order_by("-uploaded_at")[:5]
-
-            data = {
-                "user_type": "job_seeker",
-                "stats": {
-                    "total_applications": total_applications,
-                    "pending_applications": pending_applications,
-                    "accepted_applications": accepted_applications,
-                    "total_resumes": total_resumes,
-                },
-                "recent_applications": JobApplicationSerializer(
-                    recent_applications, many=True
-                ).data,
-                "resumes": ResumeSerializer(resumes, many=True).data,
-            }
-        else:
+        data = get_dashboard(request.user)
+        if data is None:
             return Response(
                 {"error": "Invalid user type."}, status=status.HTTP_400_BAD_REQUEST
             )
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "to_email", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("subject", "to_email")
+    date_hierarchy = "created_at"
+    actions = ("retry_emails",)
+
+    @admin.action(description="Retry selected emails")
+    def retry_emails(self, request, queryset):
+        queryset.exclude(status="sent").update(
+            status="pending", attempts=0, next_attempt_at=timezone.now()
+        )
@@ -0,0 +1,134 @@
+"""
+Transactional email outbox.
+
+Request handlers call ``queue_email`` inside their own transaction, so an email
+is recorded if and only if the row it is about is committed. The ``send_outbox``
+management command drains the queue in batches over one SMTP connection.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def queue_email(subject, message, recipient, from_email=None):
+    """Record an email for delivery by the outbox worker."""
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to_email=recipient,
+    )
+
+
+def queue_emails(emails, from_email=None):
+    """Record many ``(subject, message, recipient)`` emails with one INSERT."""
+    return OutboxEmail.objects.bulk_create(
+        [
+            OutboxEmail(
+                subject=subject,
+                body=message,
+                from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+                to_email=recipient,
+            )
+            for subject, message, recipient in emails
+        ],
+        batch_size=500,
+    )
+
+
+def claim_batch(batch_size):
+    """
+    Lease up to ``batch_size`` due emails to this worker.
+
+    Rows are locked with SKIP LOCKED (where supported) while their next attempt
+    is pushed out by the lease, so concurrent workers never pick the same email.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+            next_attempt_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+        )
+    return batch
+
+
+def retry_delay(attempts):
+    """Exponential backoff between delivery attempts, capped at one hour."""
+    seconds = settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, 3600))
+
+
+def send_batch(batch_size=None):
+    """
+    Deliver one batch of due emails over a single reused connection.
+
+    Returns ``(sent, failed)`` counts. Emails that fail
+    ``OUTBOX_MAX_ATTEMPTS`` times are dead-lettered with status ``failed``.
+    """
+    batch = claim_batch(batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not batch:
+        return 0, 0
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        # Could not connect at all: the whole batch is retried later
+        logger.error(f"Outbox connection failed: {exc}")
+        for email in batch:
+            record_failure(email, exc)
+        return 0, len(batch)
+
+    sent = failed = 0
+    try:
+        for email in batch:
+            message = EmailMessage(
+                email.subject,
+                email.body,
+                email.from_email,
+                [email.to_email],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as exc:
+                failed += 1
+                record_failure(email, exc)
+            else:
+                sent += 1
+                OutboxEmail.objects.filter(pk=email.pk).update(
+                    status="sent", attempts=email.attempts + 1, sent_at=timezone.now()
+                )
+    finally:
+        connection.close()
+
+    return sent, failed
+
+
+def record_failure(email, exc):
+    attempts = email.attempts + 1
+    if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        logger.error(f"Dead-lettering outbox email {email.pk}: {exc}")
+        status = "failed"
+    else:
+        logger.warning(f"Outbox email {email.pk} failed (attempt {attempts}): {exc}")
+        status = "pending"
+    OutboxEmail.objects.filter(pk=email.pk).update(
+        status=status,
+        attempts=attempts,
+        last_error=str(exc),
+        next_attempt_at=timezone.now() + retry_delay(attempts),
+    )
@@ -0,0 +1,124 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.db import connection, transaction
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+    skipUnlessDBFeature,
+)
+from django.utils import timezone
+
+from .models import OutboxEmail
+from .outbox import claim_batch, queue_emails, send_batch
+
+
+def queue(*recipients):
+    return queue_emails(("Subject", "Body", recipient) for recipient in recipients)
+
+
+@override_settings(
+    OUTBOX_BATCH_SIZE=10,
+    OUTBOX_MAX_ATTEMPTS=3,
+    OUTBOX_RETRY_BASE_SECONDS=60,
+    OUTBOX_LEASE_SECONDS=300,
+)
+class OutboxTests(TestCase):
+    """The outbox delivers due emails, backs off on failure and dead-letters."""
+
+    def make_due(self):
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+
+    def test_sends_due_emails(self):
+        queue("a@example.com", "b@example.com")
+        self.assertEqual(send_batch(), (2, 0))
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ["a@example.com", "b@example.com"],
+        )
+        self.assertFalse(OutboxEmail.objects.exclude(status="sent").exists())
+        self.assertEqual(send_batch(), (0, 0))
+
+    def test_failures_back_off_then_dead_letter(self):
+        queue("bad@example.com", "good@example.com")
+        original_send = mail.EmailMessage.send
+
+        def send(message, *args, **kwargs):
+            if message.to == ["bad@example.com"]:
+                raise OSError("mailbox unavailable")
+            return original_send(message, *args, **kwargs)
+
+        with mock.patch.object(mail.EmailMessage, "send", send):
+            before = timezone.now()
+            self.assertEqual(send_batch(), (1, 1))
+            bad = OutboxEmail.objects.get(to_email="bad@example.com")
+            self.assertEqual((bad.status, bad.attempts), ("pending", 1))
+            self.assertEqual(bad.last_error, "mailbox unavailable")
+            self.assertGreaterEqual(bad.next_attempt_at, before + timedelta(seconds=60))
+
+            # Not due again until the backoff has passed
+            self.assertEqual(send_batch(), (0, 0))
+
+            self.make_due()
+            before = timezone.now()
+            self.assertEqual(send_batch(), (0, 1))
+            bad.refresh_from_db()
+            # The delay doubles with every attempt
+            self.assertGreaterEqual(bad.next_attempt_at, before + timedelta(seconds=120))
+
+            self.make_due()
+            self.assertEqual(send_batch(), (0, 1))
+            bad.refresh_from_db()
+            self.assertEqual((bad.status, bad.attempts), ("failed", 3))
+
+            self.make_due()
+            self.assertEqual(send_batch(), (0, 0))
+
+    def test_connection_failure_retries_the_whole_batch(self):
+        queue("a@example.com", "b@example.com")
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.open",
+            side_effect=OSError("connection refused"),
+        ):
+            self.assertEqual(send_batch(), (0, 2))
+        self.assertEqual(
+            list(OutboxEmail.objects.values_list("status", "attempts")),
+            [("pending", 1), ("pending", 1)],
+        )
+        self.assertEqual(mail.outbox, [])
+
+    def test_claimed_emails_are_leased(self):
+        queue("a@example.com", "b@example.com", "c@example.com")
+        first = claim_batch(2)
+        self.assertEqual(len(first), 2)
+        # A second worker only finds what the first did not lease
+        second = claim_batch(10)
+        self.assertEqual([email.to_email for email in second], ["c@example.com"])
+        self.assertEqual(claim_batch(10), [])
+
+
+@skipUnlessDBFeature("has_select_for_update_skip_locked")
+class OutboxClaimTests(TransactionTestCase):
+    """Workers claiming at once skip the rows another worker has locked."""
+
+    def test_skips_locked_rows(self):
+        queue("a@example.com", "b@example.com")
+        locked, free = OutboxEmail.objects.order_by("pk")
+        claimed = []
+
+        def claim():
+            try:
+                claimed.extend(claim_batch(10))
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            OutboxEmail.objects.select_for_update().get(pk=locked.pk)
+            worker = threading.Thread(target=claim)
+            worker.start()
+            worker.join()
+
+        self.assertEqual([email.pk for email in claimed], [free.pk])